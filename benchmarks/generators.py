@@ -0,0 +1,51 @@
+"""Generators of synthetic data for the benchmarks"""
+import numpy as np
+import pandas as pd
+
+
+def get_skewed_codes(
+    rng: np.random.Generator, n_rows: int, n_values: int, skew: float
+) -> np.ndarray:
+    """Draws codes from 0 to n_values, where the probability of a code is
+    proportional to 1 / (code + 1) ** skew, so a skew of 0 is uniform"""
+    probabilities = 1 / np.arange(1, n_values + 1) ** skew
+    return rng.choice(n_values, n_rows, p=probabilities / probabilities.sum())
+
+
+def get_data(
+    n_rows: int,
+    n_groups: int,
+    n_subgroups: int,
+    na_fraction: float = 0,
+    skew: float = 1,
+    categorical: bool = False,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Generates a DataFrame with a 'group' column with n_groups values and a
+    'value' column with n_subgroups values, both with string values
+
+    Args:
+        n_rows (int): the amount of rows
+        n_groups (int): the amount of distinct groups
+        n_subgroups (int): the amount of distinct values
+        na_fraction (float, optional): the fraction of NA values in each
+        column. Defaults to 0.
+        skew (float, optional): the skew of the distribution of the values
+        and groups, 0 being uniform. Defaults to 1.
+        categorical (bool, optional): if true, the columns are categoricals
+        instead of strings. Defaults to False.
+        seed (int, optional): the seed of the random generator. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: the data
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, n_values in (("group", n_groups), ("value", n_subgroups)):
+        codes = get_skewed_codes(rng, n_rows, n_values, skew)
+        codes[rng.random(n_rows) < na_fraction] = -1
+        values = pd.Categorical.from_codes(
+            codes, [f"{name}_{i}" for i in range(n_values)]
+        )
+        columns[name] = values if categorical else values.astype(object)
+    return pd.DataFrame(columns)
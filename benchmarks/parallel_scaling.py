@@ -0,0 +1,67 @@
+"""Benchmarks the scaling of counting with n_jobs processes, of a numeric
+column grouped by a categorical column and of a string column grouped by a
+string column. The strings are factorized before the processes start, so
+their scaling is bounded by that.
+
+Usage:
+    python benchmarks/parallel_scaling.py --rows 50000000 --max-jobs 64
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from advanced_value_counts.parallel import get_raw_counts_parallel
+
+
+def get_data(n_rows: int, n_groups: int, n_values: int) -> pd.DataFrame:
+    """Generates a DataFrame with a categorical groupby column and a numeric
+    column with skewed values, and both as strings"""
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, n_groups, n_rows)
+    values = rng.zipf(1.3, n_rows) % n_values
+    group_names = np.array([f"group_{i}" for i in range(n_groups)], object)
+    value_names = np.array([f"value_{i}" for i in range(n_values)], object)
+    return pd.DataFrame(
+        {
+            "group": pd.Categorical.from_codes(groups, group_names),
+            "value": values,
+            "group_str": group_names[groups],
+            "value_str": value_names[values],
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--groups", type=int, default=1_000)
+    parser.add_argument("--values", type=int, default=10_000)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = get_data(args.rows, args.groups, args.values)
+    n_jobs_list = sorted(
+        {1, *(2**i for i in range(args.max_jobs.bit_length())), args.max_jobs}
+    )
+
+    cases = [("value", "group"), ("value_str", "group_str")]
+    for column, groupby_col in cases:
+        print(f"\n{column} by {groupby_col}")
+        print(f"{'n_jobs':>6} {'seconds':>10} {'speedup':>8}")
+        baseline = None
+        for n_jobs in n_jobs_list:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                get_raw_counts_parallel(df, column, groupby_col, n_jobs=n_jobs)
+                timings.append(time.perf_counter() - start)
+            seconds = min(timings)
+            baseline = baseline or seconds
+            print(f"{n_jobs:>6} {seconds:>10.3f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
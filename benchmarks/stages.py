@@ -0,0 +1,181 @@
+"""Benchmarks the wall time and peak memory of the stages of get_avc_df on
+synthetic data, for every combination of the given parameters.
+
+The results can be saved as JSON and compared with the results of an earlier
+run, which fails if a stage became slower than the tolerance allows.
+
+Usage:
+    python benchmarks/stages.py --rows 100000 1000000 --groups 10 1000
+    python benchmarks/stages.py --save baseline.json
+    python benchmarks/stages.py --compare baseline.json --tolerance 1.5
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+from advanced_value_counts.df_mutations import (
+    add_subgroup_diff_vs_total,
+    add_summary_statistics,
+    get_avc_df,
+    get_raw_counts,
+    group_uncommon_subgroups,
+)
+from generators import get_data
+
+COLUMN = "value"
+GROUPBY_COL = "group"
+THRESHOLDS = {
+    "max_groups": 20,
+    "max_subgroups": 10,
+    "min_subgroup_ratio": 0.01,
+}
+
+
+def measure(
+    function: Callable[[Any], Any],
+    setup: Callable[[], Any],
+    repeat: int = 3,
+) -> Dict[str, float]:
+    """Measures the fastest wall time of a function and the peak memory it
+    allocates. The function is called with the result of setup, which is
+    not measured."""
+    seconds = []
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        function(argument)
+        seconds.append(time.perf_counter() - start)
+
+    argument = setup()
+    tracemalloc.start()
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(seconds), "peak_mb": peak / 2**20}
+
+
+def no_setup():
+    """The setup of stages that don't need one"""
+
+
+def get_stages(df: pd.DataFrame) -> Dict[str, tuple]:
+    """Gets per stage the function to measure and its setup"""
+    summary = add_summary_statistics(df, COLUMN, GROUPBY_COL)
+    avc_df = get_avc_df(df, COLUMN, GROUPBY_COL, **THRESHOLDS)
+    return {
+        "get_raw_counts": (
+            lambda _: get_raw_counts(df, COLUMN, GROUPBY_COL),
+            no_setup,
+        ),
+        "get_avc_df": (
+            lambda _: get_avc_df(df, COLUMN, GROUPBY_COL, **THRESHOLDS),
+            no_setup,
+        ),
+        "get_avc_df ungrouped": (
+            lambda _: get_avc_df(df, COLUMN, max_groups=20),
+            no_setup,
+        ),
+        "add_summary_statistics": (
+            lambda _: add_summary_statistics(df, COLUMN, GROUPBY_COL),
+            no_setup,
+        ),
+        # group_uncommon_subgroups changes its input, so it gets a copy
+        "group_uncommon_subgroups": (
+            lambda summary_copy: group_uncommon_subgroups(
+                summary_copy,
+                COLUMN,
+                max_subgroups=THRESHOLDS["max_subgroups"],
+                min_subgroup_ratio=THRESHOLDS["min_subgroup_ratio"],
+            ),
+            summary.copy,
+        ),
+        "add_subgroup_diff_vs_total": (
+            lambda _: add_subgroup_diff_vs_total(
+                avc_df, "subgroup_ratio", "subgr_r_diff_subgr_all"
+            ),
+            no_setup,
+        ),
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance
+) -> List[str]:
+    """Gets the descriptions of the results which are more than tolerance
+    times slower than the same benchmark of the baseline"""
+    parameters = ["rows", "groups", "subgroups", "na", "skew", "stage"]
+    baseline = {
+        tuple(result[key] for key in parameters): result for result in baseline
+    }
+    regressions = []
+    for result in results:
+        key = tuple(result[key] for key in parameters)
+        if key not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[key]["seconds"]
+        if ratio > tolerance:
+            regressions.append(f"{key}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--groups", type=int, nargs="+", default=[10, 1_000])
+    parser.add_argument("--subgroups", type=int, nargs="+", default=[100])
+    parser.add_argument("--na", type=float, nargs="+", default=[0.05])
+    parser.add_argument("--skew", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--categorical", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="save the results as JSON")
+    parser.add_argument("--compare", help="compare with saved results")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10} {'groups':>7} {'subgr':>6} {'na':>5} {'skew':>5} "
+        f"{'stage':<27} {'seconds':>9} {'peak MB':>9}"
+    )
+    results = []
+    for rows, groups, subgroups, na, skew in itertools.product(
+        args.rows, args.groups, args.subgroups, args.na, args.skew
+    ):
+        df = get_data(rows, groups, subgroups, na, skew, args.categorical)
+        for stage, (function, setup) in get_stages(df).items():
+            result = {
+                "rows": rows,
+                "groups": groups,
+                "subgroups": subgroups,
+                "na": na,
+                "skew": skew,
+                "stage": stage,
+                **measure(function, setup, args.repeat),
+            }
+            results.append(result)
+            print(
+                f"{rows:>10} {groups:>7} {subgroups:>6} {na:>5} {skew:>5} "
+                f"{stage:<27} {result['seconds']:>9.4f} "
+                f"{result['peak_mb']:>9.1f}"
+            )
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressions:", *regressions, sep="\n")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterable, Awaitable, Callable, Optional, TypeVar
+
+import pandas as pd
+
+from .df_mutations import GroupbyCol, get_raw_counts, merge_raw_counts
+from .sketch import SpaceSaving
+
+State = TypeVar("State")
+
+
+async def aget_raw_counts_from_chunks(
+    chunks: AsyncIterable[pd.DataFrame],
+    column: str,
+    groupby_col: GroupbyCol = None,
+    weight_col: str = None,
+    capacity: int = None,
+    executor: Executor = None,
+    max_pending: int = 2,
+) -> pd.Series:
+    """Counts the values of DataFrames that arrive asynchronously, like
+    get_raw_counts_from_chunks. Each chunk is counted in the executor while
+    the next chunks are awaited, so the event loop isn't blocked by pandas
+    and the I/O overlaps with the counting. The counts of the chunks are
+    added up in the executor as well, in the order of the chunks.
+
+    Args:
+        chunks (AsyncIterable[pd.DataFrame]): the chunks of the data
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, to group the values by. Defaults to None.
+
+        weight_col (str, optional): the name of the column with the weight
+        of each row. Defaults to None.
+
+        capacity (int, optional): the maximum amount of values to count with
+        a SpaceSaving sketch. Defaults to None, which counts all values
+        exactly.
+
+        executor (Executor, optional): the thread or process pool to count
+        in. Defaults to None, the default executor of the event loop.
+
+        max_pending (int, optional): the maximum amount of chunks that are
+        received but not yet added up, which bounds the memory of the
+        chunks. Defaults to 2.
+
+    Raises:
+        ValueError: if max_pending is not a positive number or there are no
+        chunks. The errors of counting a chunk and of the chunks themselves
+        are raised as well, after the pending chunks are cancelled.
+
+    Returns:
+        pd.Series: the counts of all chunks, like get_raw_counts
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be a positive number")
+    loop = asyncio.get_running_loop()
+    if capacity is None:
+        add, state = add_raw_counts, None
+    else:
+        add = add_sketch_counts
+        state = SpaceSaving(capacity, column, groupby_col, weight_col)
+
+    # each chunk is added to the state of the previous chunk as soon as both
+    # are counted, so the counts are added up while new chunks are counted
+    added = loop.create_future()
+    added.set_result(state)
+    pending = deque()
+    try:
+        async for chunk in chunks:
+            counted = loop.run_in_executor(
+                executor,
+                get_raw_counts,
+                chunk,
+                column,
+                groupby_col,
+                weight_col,
+            )
+            added = asyncio.ensure_future(
+                add_when_counted(executor, add, added, counted)
+            )
+            pending.append((counted, added))
+            if len(pending) > max_pending:
+                await pending.popleft()[1]
+        state = await added
+    except BaseException:
+        # cancel the chunks that are still counted or added, and retrieve
+        # their exceptions, before the error is raised
+        futures = [future for pair in pending for future in pair]
+        for future in futures:
+            future.cancel()
+        await asyncio.gather(*futures, return_exceptions=True)
+        raise
+
+    if capacity is not None:
+        return state.get_counts()
+    if state is None:
+        raise ValueError("No chunks to count the values of")
+    return state
+
+
+async def add_when_counted(
+    executor: Optional[Executor],
+    add: Callable[[State, pd.Series], State],
+    state: Awaitable[State],
+    counts: Awaitable[pd.Series],
+) -> State:
+    """Adds the counts of a chunk to the state in the executor, once both
+    the counts and the state of the previous chunks are ready
+
+    Args:
+        executor (Optional[Executor]): the executor to add the counts in
+        add (Callable[[State, pd.Series], State]): the function that returns
+        the state with the counts added
+        state (Awaitable[State]): the state of the previous chunks
+        counts (Awaitable[pd.Series]): the counts of the chunk
+
+    Returns:
+        State: the state with the counts of the chunk added
+    """
+    state, counts = await state, await counts
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, add, state, counts
+    )
+
+
+def add_raw_counts(
+    counts: Optional[pd.Series], chunk_counts: pd.Series
+) -> pd.Series:
+    """Adds up the exact counts of the previous chunks and a chunk
+
+    Args:
+        counts (Optional[pd.Series]): the counts of the previous chunks, or
+        None before the first chunk
+        chunk_counts (pd.Series): the counts of the chunk
+
+    Returns:
+        pd.Series: the counts of all chunks
+    """
+    if counts is None:
+        return chunk_counts
+    return merge_raw_counts([counts, chunk_counts])
+
+
+def add_sketch_counts(
+    sketch: SpaceSaving, chunk_counts: pd.Series
+) -> SpaceSaving:
+    """Adds the counts of a chunk to a sketch, which is returned so it also
+    comes back from a process pool
+
+    Args:
+        sketch (SpaceSaving): the sketch of the previous chunks
+        chunk_counts (pd.Series): the counts of the chunk
+
+    Returns:
+        SpaceSaving: the sketch of all chunks
+    """
+    return sketch.update_counts(chunk_counts)
@@ -1,38 +1,99 @@
+import asyncio
+from collections import namedtuple
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Iterable,
+    Iterator,
+    Union,
+)
 from warnings import warn
 
 import pandas as pd
-import seaborn as sns
 
-from .df_mutations import get_avc_df
+from .async_chunks import aget_raw_counts_from_chunks
+from .df_mutations import (
+    GroupbyCol,
+    drop_empty_counts,
+    get_avc_df_from_counts,
+    get_groupby_cols,
+    get_raw_counts,
+    get_raw_counts_from_chunks,
+    get_raw_counts_from_counts,
+    merge_raw_counts,
+    round_empty_counts,
+)
+from .disk_cache import CountCache
+from .files import get_raw_counts_from_files
+from .parallel import get_raw_counts_parallel
+from .profiling import Stage, StageProfiler, profile_stage
+from .sketch import get_approx_counts, get_approx_counts_from_chunks
 from .value_checks import (
     new_attribute_warning,
-    positive_number_dec,
     positive_number_or_none_dec,
     ratio_dec,
+    setting_dec,
 )
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses"])
+
+
+def import_seaborn():
+    """Imports seaborn only when a plot is made, so importing this package
+    doesn't load seaborn, matplotlib and scipy
+
+    Raises:
+        ImportError: if seaborn is not installed
 
-@positive_number_dec("min_group_count", "min_subgroup_count")
-@positive_number_or_none_dec("max_groups", "max_subgroups", "round_ratio")
+    Returns:
+        module: seaborn
+    """
+    try:
+        import seaborn as sns
+    except ImportError as e:
+        raise ImportError(
+            "Plotting requires seaborn, install it with "
+            "pip install advanced-value-counts[plot]"
+        ) from e
+    return sns
+
+
+@positive_number_or_none_dec(
+    "max_groups",
+    "max_subgroups",
+    "round_ratio",
+    "min_group_count",
+    "min_subgroup_count",
+    "capacity",
+)
 @ratio_dec(
     "min_group_ratio", "min_subgroup_ratio", "min_subgroup_ratio_vs_total"
 )
+@setting_dec("df", "column", "groupby_col", "dropna", "weight_col")
 @new_attribute_warning  # genereates warning if new attribute is set
 class AdvancedValueCounts:
     def __init__(
         self,
         df: pd.DataFrame,
         column: str,
-        groupby_col: str = None,
+        groupby_col: GroupbyCol = None,
         dropna: bool = False,
         max_groups: int = None,
         min_group_ratio: float = 0,
-        min_group_count: int = 1,
+        min_group_count: int = None,
         max_subgroups: int = None,
         min_subgroup_ratio: float = 0,
-        min_subgroup_count: int = 1,
+        min_subgroup_count: int = None,
         min_subgroup_ratio_vs_total: float = 0,
         round_ratio: int = None,
+        copy: bool = True,
+        n_jobs: int = None,
+        weight_col: str = None,
+        count_cache: CountCache = None,
+        capacity: int = None,
     ):
         """
         Creates an AdvancedValueCounts class of a DataFrame based on different
@@ -40,12 +101,16 @@ class AdvancedValueCounts:
 
          Args:
             df (pd.DataFrame): the DataFrame to apply AdvancedValueCounts to.
+            Can also be a pyarrow.Table or polars.DataFrame, which is counted
+            by its own library without converting it to pandas. Is None when
+            created through one of the from_ class methods.
 
             column (str): the name of the column where the values to count are
             in.
 
-            groupby_col (str, optional): the name of the column to apply
-            the pd.DataFrame.groupby method to. Defaults to None.
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
 
             dropna (bool, optional): if true, won't add counts for NA values.
             Defaults to False.
@@ -60,7 +125,8 @@ class AdvancedValueCounts:
 
             min_group_count (int, optional): the minimum count a group of the
             groupby_col must have. Groups below the threshold will be grouped
-            into one group called '_other'. Defaults to 1.
+            into one group called '_other'. Defaults to None, which only
+            groups groups with a count of 0.
 
             max_subgroups (int, optional): the maximum amount of subgroups
             (based on column) per group (based on groupby_col). Remaining
@@ -73,7 +139,8 @@ class AdvancedValueCounts:
 
             min_subgroup_count (int, optional): the minimum count of a
             subgroup per group. Subgroups below the threshold will be grouped
-            into one subgroup called '_other'. Defaults to 0.
+            into one subgroup called '_other'. Defaults to None, which only
+            groups subgroups with a count of 0.
 
             min_subgroup_vs_total_ratio (float, optional): the minium ratio of
             a subgroup compared to the total count. Subgroups below the
@@ -83,11 +150,47 @@ class AdvancedValueCounts:
             round_ratio (int, optional): the amount of decimals to round a
             ratio to. Defaults to None.
 
+            copy (bool, optional): if false, the DataFrame is referenced
+            instead of copied and only column and groupby_col are read, which
+            saves memory for large DataFrames. The DataFrame should then not
+            be changed inplace afterwards. A pyarrow.Table or
+            polars.DataFrame is never copied. Defaults to True.
+
+            n_jobs (int, optional): the amount of processes to count the
+            data with, -1 meaning all CPUs. The columns are shared with the
+            processes through shared memory. Only used for a pd.DataFrame.
+            Defaults to None, which counts the data in the current process.
+
+            weight_col (str, optional): the name of a column with the weight
+            of each row, e.g. the amount of events of pre-aggregated rows.
+            The counts, ratios, min_group_count and min_subgroup_count are
+            then of the summed weights instead of the amount of rows. The
+            default min_group_count and min_subgroup_count of None only
+            leave out values of which the weights sum to 0, so fractional
+            weights are kept. Defaults to None.
+
+            count_cache (CountCache, optional): a cache of counts on disk,
+            so the counts are read from the cache instead of counted if the
+            same data was counted before, by any process.
+            Defaults to None.
+
+            capacity (int, optional): the maximum amount of values to count
+            approximately with a Space-Saving sketch, like in from_chunks,
+            for columns with very many distinct values. The df is then
+            counted in slices of 100_000 rows, so the memory of the counts
+            is bounded by that and capacity, and n_jobs isn't used. Defaults
+            to None, which counts all values exactly.
+
         Returns:
             pd.DataFrame: a DataFrame with relative and absolute counts, plus
             extra summary statistics.
         """
-        self.df = df.copy()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._profiler = None
+        self._last_profiler = None
+        self._approximate = False
+        self.df = df.copy() if copy and isinstance(df, pd.DataFrame) else df
         self.column = column
         self.groupby_col = groupby_col
         self.dropna = dropna
@@ -99,18 +202,553 @@ class AdvancedValueCounts:
         self.min_subgroup_count = min_subgroup_count
         self.min_subgroup_ratio_vs_total = min_subgroup_ratio_vs_total
         self.round_ratio = round_ratio
+        self.n_jobs = n_jobs
+        self.weight_col = weight_col
+        self.count_cache = count_cache
+        self.capacity = capacity
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        column: str,
+        groupby_col: GroupbyCol = None,
+        capacity: int = None,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of data that is read in chunks,
+        for data that doesn't fit in memory. Only the counts of column and
+        groupby_col are kept.
+
+        For columns with very many distinct values the memory of the counts
+        can be bounded by setting capacity. Only the capacity most common
+        values (or combinations of groups and values) are then counted with
+        a Space-Saving sketch, and the other rows are counted under the value
+        '_other' of their group. The counts of the counted values are at most
+        the amount of rows divided by capacity too high, and each value that
+        occurs more often than that is counted. Each chunk is counted exactly
+        before it is added to the sketch, so the memory is only bounded if
+        the chunks are.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): the chunks of the data
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            capacity (int, optional): the maximum amount of values to count
+            approximately, should be well above max_groups or max_subgroups.
+            Defaults to None, which counts all values exactly.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        weight_col = kwargs.get("weight_col")
+        if capacity is not None:
+            counts = get_approx_counts_from_chunks(
+                chunks, column, groupby_col, capacity, weight_col
+            )
+        else:
+            counts = get_raw_counts_from_chunks(
+                chunks, column, groupby_col, weight_col
+            )
+        return cls._from_raw_counts(
+            counts,
+            column,
+            groupby_col,
+            capacity is not None,
+            capacity=capacity,
+            **kwargs,
+        )
+
+    @classmethod
+    async def afrom_chunks(
+        cls,
+        chunks: AsyncIterable[pd.DataFrame],
+        column: str,
+        groupby_col: GroupbyCol = None,
+        capacity: int = None,
+        executor: Executor = None,
+        max_pending: int = 2,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of DataFrames that arrive
+        asynchronously, e.g. pages of object storage, without blocking the
+        event loop. Each chunk is counted in the executor while the next
+        chunks are awaited, and the avc_df is calculated in a thread, so
+        getting it afterwards only returns a copy.
+
+        Args:
+            chunks (AsyncIterable[pd.DataFrame]): the chunks of the data
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            capacity (int, optional): the maximum amount of values to count
+            approximately, like in from_chunks. Defaults to None, which
+            counts all values exactly.
+
+            executor (Executor, optional): the thread or process pool to
+            count the chunks in. Defaults to None, the default executor of
+            the event loop.
+
+            max_pending (int, optional): the maximum amount of chunks that
+            are received but not yet added up. Defaults to 2.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        counts = await aget_raw_counts_from_chunks(
+            chunks,
+            column,
+            groupby_col,
+            kwargs.get("weight_col"),
+            capacity,
+            executor,
+            max_pending,
+        )
+        avc = cls._from_raw_counts(
+            counts,
+            column,
+            groupby_col,
+            capacity is not None,
+            capacity=capacity,
+            **kwargs,
+        )
+        await asyncio.get_running_loop().run_in_executor(
+            None, getattr, avc, "avc_df"
+        )
+        return avc
+
+    @classmethod
+    def from_counts(
+        cls,
+        counts: Union[pd.Series, pd.DataFrame],
+        column: str,
+        groupby_col: GroupbyCol = None,
+        count_col: str = "count",
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of counts that already exist, e.g.
+        of a SQL GROUP BY or a previous run, so the data doesn't have to be
+        counted again. Only the thresholds, uncommon groups, summary
+        statistics and ratios are applied to the counts.
+
+        Args:
+            counts (Union[pd.Series, pd.DataFrame]): a pd.Series of counts
+            indexed by the values of groupby_col and column, either with
+            levels named after them or in that order, e.g. of
+            df.groupby([groupby_col, column], dropna=False).size(). Or a
+            pd.DataFrame with groupby_col, column and count_col as columns.
+
+            column (str): the name of the column where the counted values
+            are in.
+
+            groupby_col (GroupbyCol, optional): the name of the column the
+            values are grouped by, or a list of names if they are grouped by
+            multiple columns. Defaults to None.
+
+            count_col (str, optional): the name of the column of the counts
+            of a pd.DataFrame. Defaults to 'count'.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        counts = get_raw_counts_from_counts(
+            counts, column, groupby_col, count_col
+        )
+        return cls._from_raw_counts(counts, column, groupby_col, **kwargs)
+
+    @classmethod
+    def _from_raw_counts(
+        cls,
+        counts: pd.Series,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        approximate: bool = False,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts without a df from the counts of
+        get_raw_counts, or from the approximate counts of a SpaceSaving
+        sketch if approximate is true"""
+        avc = cls(None, column, groupby_col, **kwargs)
+        avc._counts_cache = counts
+        avc._approximate = approximate
+        return avc
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: str,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        chunksize: int = 1_000_000,
+        read_csv_kwargs: dict = None,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of a csv file, which is read in
+        chunks. Only column, groupby_col and weight_col are read.
+
+        Args:
+            path (str): the path of the csv file
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            chunksize (int, optional): the amount of rows per chunk.
+            Defaults to 1_000_000.
+
+            read_csv_kwargs (dict, optional): extra keyword arguments for
+            pd.read_csv. Defaults to None.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        usecols = [column, *get_groupby_cols(groupby_col)]
+        if kwargs.get("weight_col") is not None:
+            usecols.append(kwargs["weight_col"])
+        chunks = pd.read_csv(
+            path,
+            usecols=usecols,
+            chunksize=chunksize,
+            **(read_csv_kwargs or {}),
+        )
+        return cls.from_chunks(chunks, column, groupby_col, **kwargs)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        path: str,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        batch_size: int = 1_000_000,
+        capacity: int = None,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of a parquet file, or a directory
+        of parquet files, which are memory mapped and counted per row group.
+        Only column, groupby_col and weight_col are read, string columns as
+        dictionary indices. Requires pyarrow.
+
+        Args:
+            path (str): the path of the parquet file or directory
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            batch_size (int, optional): the maximum amount of rows per batch.
+            Defaults to 1_000_000.
+
+            capacity (int, optional): the maximum amount of values to count
+            approximately, see from_chunks. Defaults to None, which counts
+            all values exactly.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        if capacity is None:
+            counts = get_raw_counts_from_files(
+                path,
+                column,
+                groupby_col,
+                "parquet",
+                batch_size,
+                kwargs.get("weight_col"),
+            )
+            return cls._from_raw_counts(counts, column, groupby_col, **kwargs)
+
+        try:
+            import pyarrow.dataset as ds
+        except ImportError as e:
+            raise ImportError(
+                "Reading parquet files requires pyarrow, install it with "
+                "pip install advanced-value-counts[parquet]"
+            ) from e
+
+        # the Space-Saving sketch counts pandas DataFrames, a dataset reads
+        # a file as well as a directory of files
+        columns = [column, *get_groupby_cols(groupby_col)]
+        if kwargs.get("weight_col") is not None:
+            columns.append(kwargs["weight_col"])
+        batches = ds.dataset(path, format="parquet").to_batches(
+            columns=columns, batch_size=batch_size
+        )
+        return cls.from_chunks(
+            (batch.to_pandas() for batch in batches),
+            column,
+            groupby_col,
+            capacity,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_feather(
+        cls,
+        path: str,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        **kwargs,
+    ) -> "AdvancedValueCounts":
+        """Creates an AdvancedValueCounts of a feather file, or a directory
+        of feather files, which are memory mapped and counted per record
+        batch. Only column, groupby_col and weight_col are read. Requires
+        pyarrow.
+
+        Args:
+            path (str): the path of the feather file or directory
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            **kwargs: the other parameters of AdvancedValueCounts
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        counts = get_raw_counts_from_files(
+            path,
+            column,
+            groupby_col,
+            "feather",
+            weight_col=kwargs.get("weight_col"),
+        )
+        return cls._from_raw_counts(counts, column, groupby_col, **kwargs)
 
     @property
     def avc_df(self) -> pd.DataFrame:
         """Calls the function to do the actual calculations to get an
-        AdvancedValueCounts DataFrame
+        AdvancedValueCounts DataFrame. The result is cached until one of the
+        settings is reassigned.
 
         Returns:
             pd.DataFrame: a DataFrame with advanced value count statistics.
         """
+        if self._avc_df_cache is None:
+            self._cache_misses += 1
+            self._avc_df_cache = self._get_avc_df()
+        else:
+            self._cache_hits += 1
+
+        # return a copy so changes to the result won't affect the cache
+        with profile_stage(
+            self._profiler, "copy", len(self._avc_df_cache)
+        ) as stage:
+            avc_df = self._avc_df_cache.copy()
+            stage.rows_out = len(avc_df)
+        return avc_df
+
+    @contextmanager
+    def profile(
+        self, callback: Callable[[Stage], Any] = None, trace_memory=True
+    ) -> Iterator[StageProfiler]:
+        """Records the wall time, the amount of rows in and out, and the
+        change in allocated memory of each stage of getting the avc_df
+        within the with block. A cached avc_df only has the 'copy' stage.
+        Without this context manager nothing is recorded.
+
+        Args:
+            callback (Callable[[Stage], Any], optional): a function that is
+            called with each measured stage. Defaults to None.
 
-        return get_avc_df(
-            self.df,
+            trace_memory (bool, optional): if true, the memory is traced with
+            tracemalloc, which slows the stages down. Defaults to True.
+
+        Yields:
+            Iterator[StageProfiler]: the profiler, of which the report is
+            also available as profile_report afterwards
+        """
+        self._profiler = StageProfiler(callback, trace_memory)
+        try:
+            yield self._profiler
+        finally:
+            self._last_profiler = self._profiler
+            self._profiler = None
+
+    @property
+    def profile_report(self) -> pd.DataFrame:
+        """Gets the measurements of the stages of the last profile, one row
+        per stage, or None if nothing has been profiled
+
+        Returns:
+            pd.DataFrame: the seconds, rows_in, rows_out and memory_delta
+            (in bytes) of each stage
+        """
+        profiler = self._profiler or self._last_profiler
+        return profiler.report if profiler is not None else None
+
+    @property
+    def cache_info(self) -> CacheInfo:
+        """Returns how often avc_df was retrieved from the cache (hits) and
+        how often it had to be calculated (misses)
+
+        Returns:
+            CacheInfo: a namedtuple with the hits and misses of the cache
+        """
+        return CacheInfo(hits=self._cache_hits, misses=self._cache_misses)
+
+    def _reset_cache(self, name: str):
+        """Invalidates the cached avc_df, called when a setting is set. The
+        cached raw counts are only invalidated if the raw data changed.
+
+        Args:
+            name (str): the name of the setting that was set
+        """
+        self._avc_df_cache = None
+        if name in ("df", "column", "groupby_col", "weight_col", "capacity"):
+            self._counts_cache = None
+            self._approximate = False
+
+    def _get_counts(self) -> pd.Series:
+        """Counts the raw data once, so changing a threshold only needs to
+        repeat the cheap stages of getting the avc_df"""
+        if self._counts_cache is None:
+            if self.df is None:
+                raise ValueError(
+                    "The data is not available to count again after changing "
+                    "df, column, groupby_col, weight_col or capacity, create "
+                    "a new AdvancedValueCounts instead"
+                )
+            with profile_stage(self._profiler, "count", len(self.df)) as stage:
+                # the counts may be cached on disk
+                key = None
+                if self.count_cache is not None:
+                    key = self.count_cache.get_key(
+                        self.df,
+                        self.column,
+                        self.groupby_col,
+                        self.weight_col,
+                        self.capacity,
+                    )
+                    self._counts_cache = self.count_cache.get(key)
+                if self._counts_cache is None:
+                    self._counts_cache = self._count()
+                    if key is not None:
+                        self.count_cache.put(key, self._counts_cache)
+                self._approximate = self.capacity is not None
+                stage.rows_out = len(self._counts_cache)
+        return self._counts_cache
+
+    def _count(self) -> pd.Series:
+        """Counts the raw data, approximately if capacity is set or else in
+        parallel if n_jobs is set"""
+        if self.capacity is not None:
+            return get_approx_counts(
+                self.df,
+                self.column,
+                self.groupby_col,
+                self.capacity,
+                self.weight_col,
+            )
+        # other libraries than pandas count in parallel themselves
+        if self.n_jobs is not None and isinstance(self.df, pd.DataFrame):
+            return get_raw_counts_parallel(
+                self.df,
+                self.column,
+                self.groupby_col,
+                self.n_jobs,
+                self.weight_col,
+            )
+        return get_raw_counts(
+            self.df, self.column, self.groupby_col, self.weight_col
+        )
+
+    def update(self, df: pd.DataFrame) -> "AdvancedValueCounts":
+        """Adds the counts of new rows to the counts of the data, without
+        counting the data again. The new rows are not kept, so afterwards
+        column and groupby_col can't be changed anymore.
+
+        Args:
+            df (pd.DataFrame): the new rows
+
+        Returns:
+            AdvancedValueCounts: the AdvancedValueCounts itself
+        """
+        self._set_counts(
+            merge_raw_counts(
+                [
+                    self._get_counts(),
+                    get_raw_counts(
+                        df, self.column, self.groupby_col, self.weight_col
+                    ),
+                ]
+            )
+        )
+        return self
+
+    def retract(self, df: pd.DataFrame) -> "AdvancedValueCounts":
+        """Subtracts the counts of rows from the counts of the data, e.g. to
+        remove the oldest rows of a sliding window. The rows must have been
+        part of the data.
+
+        Args:
+            df (pd.DataFrame): the rows to remove
+
+        Raises:
+            ValueError: if a value would get a negative count, because the
+            rows were not part of the data
+
+        Returns:
+            AdvancedValueCounts: the AdvancedValueCounts itself
+        """
+        counts = merge_raw_counts(
+            [
+                self._get_counts(),
+                -get_raw_counts(
+                    df, self.column, self.groupby_col, self.weight_col
+                ),
+            ]
+        )
+        # summed float weights don't cancel out exactly
+        counts = round_empty_counts(counts)
+        if (counts < 0).any():
+            raise ValueError(
+                "Can't retract rows which are not part of the data"
+            )
+        self._set_counts(drop_empty_counts(counts))
+        return self
+
+    def _set_counts(self, counts: pd.Series):
+        """Replaces the counts of the data. The df doesn't match the counts
+        anymore, so it is removed without resetting the counts."""
+        self._df = None
+        self._counts_cache = counts
+        self._avc_df_cache = None
+
+    def _get_avc_df(self) -> pd.DataFrame:
+        """Calculates the AdvancedValueCounts DataFrame with the current
+        settings, without using the cached avc_df"""
+        return get_avc_df_from_counts(
+            self._get_counts(),
             self.column,
             self.groupby_col,
             self.dropna,
@@ -122,14 +760,17 @@ class AdvancedValueCounts:
             self.min_subgroup_count,
             self.min_subgroup_ratio_vs_total,
             self.round_ratio,
+            self._profiler,
+            self._approximate,
         )
 
     @property
     def unsummerized_df(self) -> pd.DataFrame:
         if self.groupby_col:
-            return self.avc_df.drop("_all", level=self.groupby_col).drop(
-                "_total", level=self.column
-            )
+            dfc = self.avc_df
+            for col in get_groupby_cols(self.groupby_col):
+                dfc = dfc.drop("_all", level=col)
+            return dfc.drop("_total", level=self.column)
         else:
             warn(
                 "No summary statistics are included in a non-groupedby \
@@ -169,7 +810,8 @@ class AdvancedValueCounts:
         if self.groupby_col:
             ax = self._get_grouped_count_plot(normalize)
         else:
-            dfc = self.avc_df.copy()
+            sns = import_seaborn()
+            dfc = self.avc_df
             ax = sns.barplot(
                 data=dfc,
                 x="ratio" if normalize else "count",
@@ -191,11 +833,15 @@ class AdvancedValueCounts:
         Returns:
             matplotlib.axes._subplots.AxesSubplot: the plot
         """
-        dfc = self.avc_df.copy()
-        # if not normalized, remove the _all group, as those will have high
+        sns = import_seaborn()
+        dfc = self.avc_df
+        groupby_cols = get_groupby_cols(self.groupby_col)
+
+        # if not normalized, remove the _all groups, as those will have high
         # scores and zoom the plot too far out
         if not normalize:
-            dfc.drop("_all", level=self.groupby_col, inplace=True)
+            for col in groupby_cols:
+                dfc.drop("_all", level=col, inplace=True)
 
         # drop the _total subgroups, as the ratio of them is always 1, and the
         # count values will be high and zoom the plot out a lot
@@ -213,13 +859,20 @@ class AdvancedValueCounts:
         height = 10
         sns.set(rc={"figure.figsize": (20, height)})
 
-        dfc = dfc.sort_values([self.groupby_col, self.column])
+        dfc = dfc.sort_values([*groupby_cols, self.column])
+
+        # multiple groupby columns are combined into one label per group
+        group_label = " / ".join(groupby_cols)
+        if len(groupby_cols) > 1:
+            dfc[group_label] = (
+                dfc[groupby_cols].astype(str).agg(" / ".join, axis=1)
+            )
 
         # generate and return a countplot using seaborn
         ax = sns.barplot(
             data=dfc,
             x="subgroup_ratio" if normalize else "count",
-            y=self.groupby_col,
+            y=group_label,
             hue=self.column,
             hue_order=sorted(dfc[self.column].unique()),
             ci=None,
@@ -0,0 +1,157 @@
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+# the libraries of which DataFrames can be counted without converting them to
+# pandas, by the name of their top-level module
+NATIVE_BACKENDS = ("pyarrow", "polars")
+
+
+def get_backend(df: Any) -> str:
+    """Gets the name of the library of a DataFrame, without importing the
+    optional libraries
+
+    Args:
+        df (Any): a pd.DataFrame, pyarrow.Table or polars.DataFrame
+
+    Raises:
+        TypeError: if the DataFrame is of another library
+
+    Returns:
+        str: 'pandas', 'pyarrow' or 'polars'
+    """
+    if isinstance(df, pd.DataFrame):
+        return "pandas"
+    backend = type(df).__module__.split(".")[0]
+    if backend not in NATIVE_BACKENDS:
+        raise TypeError(
+            "df must be a pandas DataFrame, a pyarrow Table or a polars "
+            f"DataFrame, not {type(df).__name__}"
+        )
+    return backend
+
+
+def get_native_raw_counts(
+    df: Any, names: List[str], weight_col: str = None
+) -> pd.Series:
+    """Counts each combination of the values of the columns with the library
+    of the DataFrame, so only the counts are converted to pandas
+
+    Args:
+        df (Any): a pyarrow.Table or polars.DataFrame
+        names (List[str]): the names of the groupby columns and the column
+        to count, in that order
+        weight_col (str, optional): the name of the column with the weight
+        of each row, which are summed instead of counting the rows. Defaults
+        to None.
+
+    Returns:
+        pd.Series: the counts, like get_raw_counts
+    """
+    if get_backend(df) == "polars":
+        counts = count_polars(df, names, weight_col)
+    else:
+        counts = count_arrow(df, names, weight_col)
+    return arrow_counts_to_series(counts, names)
+
+
+def count_arrow(
+    table: Any, names: List[str], weight_col: str = None
+) -> Any:
+    """Counts each combination of the values of the columns of a
+    pyarrow.Table with a hash aggregation, nulls included
+
+    Args:
+        table (Any): the pyarrow.Table
+        names (List[str]): the names of the columns
+        weight_col (str, optional): the name of the column with the weights
+        to sum instead of counting the rows. Defaults to None.
+
+    Returns:
+        Any: a pyarrow.Table with the combinations and a column 'count'
+    """
+    import pyarrow.compute as pc
+
+    if weight_col is None:
+        aggregation = (names[-1], "count", pc.CountOptions(mode="all"))
+    else:
+        aggregation = (weight_col, "sum")
+    counts = (
+        table.select([*names, weight_col] if weight_col else names)
+        .group_by(names)
+        .aggregate([aggregation])
+    )
+    counts = counts.rename_columns(
+        [
+            "count" if name == f"{aggregation[0]}_{aggregation[1]}" else name
+            for name in counts.column_names
+        ]
+    )
+
+    # the weights of a combination may sum to 0 or, if they are all null,
+    # to null, which are left out like get_raw_counts does
+    return counts.filter(pc.fill_null(pc.not_equal(counts["count"], 0), False))
+
+
+def count_polars(
+    df: Any, names: List[str], weight_col: str = None
+) -> Any:
+    """Counts each combination of the values of the columns of a
+    polars.DataFrame, nulls included
+
+    Args:
+        df (Any): the polars.DataFrame
+        names (List[str]): the names of the columns
+        weight_col (str, optional): the name of the column with the weights
+        to sum instead of counting the rows. Defaults to None.
+
+    Returns:
+        Any: a pyarrow.Table with the combinations and a column 'count'
+    """
+    import polars as pl
+
+    if weight_col is None:
+        return (
+            df.lazy()
+            .group_by(names)
+            .agg(pl.len().alias("count"))
+            .collect()
+            .to_arrow()
+        )
+    return (
+        df.lazy()
+        .group_by(names)
+        .agg(pl.col(weight_col).sum().alias("count"))
+        .filter(pl.col("count") != 0)
+        .collect()
+        .to_arrow()
+    )
+
+
+def arrow_counts_to_series(counts: Any, names: List[str]) -> pd.Series:
+    """Converts the counts of count_arrow or count_polars to counts like
+    those of get_raw_counts, with NA values as NaN
+
+    Args:
+        counts (Any): a pyarrow.Table with the combinations and their count
+        names (List[str]): the names of the columns of the combinations
+
+    Returns:
+        pd.Series: the counts, indexed by the values of the column or by a
+        MultiIndex of the values of the groupby columns and the column
+    """
+    import pyarrow as pa
+
+    levels = []
+    for name in names:
+        # dictionary encoded columns are converted to their values
+        values = counts.column(name)
+        if pa.types.is_dictionary(values.type):
+            values = values.cast(values.type.value_type)
+        values = values.to_numpy(zero_copy_only=False)
+        if values.dtype == object:
+            values[pd.isna(values)] = np.nan
+        levels.append(pd.Index(values, dtype=values.dtype, name=name))
+    index = pd.MultiIndex.from_arrays(levels) if len(levels) > 1 else levels[0]
+    return pd.Series(counts.column("count").to_numpy(), index=index)
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Hashable, List
+
+import pandas as pd
+
+from .avc import AdvancedValueCounts
+from .df_mutations import (
+    count_codes,
+    factorize_values,
+    get_groupby_cols,
+    get_weights,
+)
+
+
+def get_avc_dfs(
+    df: pd.DataFrame, specs: List[Dict[str, Any]]
+) -> Dict[Hashable, pd.DataFrame]:
+    """Gets the avc_df of many combinations of column and groupby_col of the
+    same DataFrame. Each column is factorized only once, and the counts of
+    the same combination of columns are shared between specs.
+
+    Args:
+        df (pd.DataFrame): the DataFrame to get the avc_dfs of
+
+        specs (List[Dict[str, Any]]): per avc_df a dict with a 'column', and
+        optionally a 'groupby_col', a 'name' and the other parameters of
+        AdvancedValueCounts, e.g. {'column': 'Title', 'groupby_col':
+        'CabinArea', 'max_groups': 3}
+
+    Raises:
+        ValueError: if two specs have the same name
+
+    Returns:
+        Dict[Hashable, pd.DataFrame]: the avc_dfs, with the name of the spec
+        as key, or (column, groupby_col) if the spec has no name, with a list
+        of groupby columns as tuple
+    """
+    factorized = {}
+    counts = {}
+    avc_dfs = {}
+    for spec in specs:
+        spec = dict(spec)
+        column = spec.pop("column")
+        groupby_col = spec.pop("groupby_col", None)
+        groupby_cols = tuple(get_groupby_cols(groupby_col))
+        if isinstance(groupby_col, list):
+            # a list can't be part of a key of a dict
+            groupby_col = groupby_cols
+        name = spec.pop("name", (column, groupby_col))
+        if name in avc_dfs:
+            raise ValueError(f"There are multiple specs named {name}")
+
+        # factorize each column once, and count each combination once
+        for col in (column, *groupby_cols):
+            if col not in factorized:
+                factorized[col] = factorize_values(df[col])
+        weight_col = spec.get("weight_col")
+        key = (column, groupby_cols, weight_col)
+        if key not in counts:
+            counts[key] = count_codes(
+                factorized[column],
+                *(factorized[col] for col in groupby_cols),
+                weights=get_weights(df, weight_col),
+            )
+
+        avc_dfs[name] = AdvancedValueCounts._from_raw_counts(
+            counts[key], column, groupby_col, **spec
+        ).avc_df
+    return avc_dfs
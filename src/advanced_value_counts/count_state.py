@@ -0,0 +1,164 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from .avc import AdvancedValueCounts
+from .df_mutations import (
+    GroupbyCol,
+    get_groupby_cols,
+    get_raw_counts,
+    merge_raw_counts,
+)
+
+
+class CountState:
+    def __init__(
+        self, counts: pd.Series, column: str, groupby_col: GroupbyCol = None
+    ):
+        """
+        Holds the raw counts of (a part of) a DataFrame, which can be merged
+        with the counts of other parts, e.g. of other partitions or processes,
+        before the thresholds of AdvancedValueCounts are applied.
+
+        Args:
+            counts (pd.Series): the counts as returned by
+            df_mutations.get_raw_counts, including the counts of NA values.
+
+            column (str): the name of the column where the values are counted
+            of.
+
+            groupby_col (GroupbyCol, optional): the name of the column, or
+            the names of the columns, the values are grouped by. Defaults to
+            None.
+        """
+        self.counts = counts
+        self.column = column
+        self.groupby_col = groupby_col
+
+    @classmethod
+    def from_df(
+        cls,
+        df: pd.DataFrame,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        weight_col: str = None,
+    ) -> "CountState":
+        """Counts the values of (a part of) a DataFrame
+
+        Args:
+            df (pd.DataFrame): the DataFrame to count the values of
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column, or
+            the names of the columns, to group the values by. Defaults to
+            None.
+
+            weight_col (str, optional): the name of a column with the weight
+            of each row, which are summed instead of counting the rows.
+            Defaults to None.
+
+        Returns:
+            CountState: the counts of the DataFrame
+        """
+        counts = get_raw_counts(df, column, groupby_col, weight_col)
+        return cls(counts, column, groupby_col)
+
+    def merge(self, other: "CountState") -> "CountState":
+        """Adds up the counts of two CountStates of the same columns
+
+        Args:
+            other (CountState): the CountState to merge with
+
+        Raises:
+            ValueError: if the CountStates are of different columns
+
+        Returns:
+            CountState: a new CountState with the summed counts
+        """
+        columns = (self.column, get_groupby_cols(self.groupby_col))
+        if columns != (other.column, get_groupby_cols(other.groupby_col)):
+            raise ValueError(
+                "Can't merge the counts of different columns: "
+                f"{columns} and {(other.column, other.groupby_col)}"
+            )
+        return CountState(
+            merge_raw_counts([self.counts, other.counts]),
+            self.column,
+            self.groupby_col,
+        )
+
+    def __add__(self, other: "CountState") -> "CountState":
+        return self.merge(other)
+
+    def __radd__(self, other: Any) -> "CountState":
+        # makes sum() work, which starts with adding the CountState to 0
+        return self if other == 0 else self.merge(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the CountState to a dict of builtin types, e.g. to
+        serialize it as JSON. NA values are converted to None.
+
+        Returns:
+            Dict[str, Any]: the column, groupby_col and the counts as a list
+            of [group, value, count] or [value, count] lists, with a float
+            count for the summed float weights of weight_col
+        """
+        index = self.counts.index.to_frame(index=False)
+        index = index.astype(object).where(index.notna(), None)
+        return {
+            "column": self.column,
+            "groupby_col": self.groupby_col,
+            "counts": [
+                [*values, count.item()]
+                for values, count in zip(
+                    index.itertuples(index=False, name=None),
+                    self.counts.to_numpy(),
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "CountState":
+        """Creates a CountState from the output of to_dict
+
+        Args:
+            state (Dict[str, Any]): the output of CountState.to_dict
+
+        Returns:
+            CountState: the CountState
+        """
+        column, groupby_col = state["column"], state["groupby_col"]
+        names = [*get_groupby_cols(groupby_col), column]
+        records = pd.DataFrame(state["counts"], columns=[*names, "count"])
+        records[names] = records[names].where(records[names].notna(), np.nan)
+        counts = records.set_index(names)["count"].rename(None)
+        return cls(counts, column, groupby_col)
+
+    def to_avc(self, **kwargs) -> AdvancedValueCounts:
+        """Creates an AdvancedValueCounts of the counts
+
+        Args:
+            **kwargs: the parameters of AdvancedValueCounts, apart from df,
+            column and groupby_col
+
+        Returns:
+            AdvancedValueCounts: an AdvancedValueCounts without a df
+        """
+        return AdvancedValueCounts._from_raw_counts(
+            self.counts, self.column, self.groupby_col, **kwargs
+        )
+
+    def finalize(self, **kwargs) -> pd.DataFrame:
+        """Applies the thresholds of AdvancedValueCounts to the counts
+
+        Args:
+            **kwargs: the parameters of AdvancedValueCounts, apart from df,
+            column and groupby_col
+
+        Returns:
+            pd.DataFrame: the avc_df of the counts
+        """
+        return self.to_avc(**kwargs).avc_df
@@ -1,30 +1,49 @@
+from typing import Iterable, List, Sequence, Tuple, Union
+
 import numpy as np
 import pandas as pd
 
+from .backends import get_native_raw_counts
+from .profiling import StageProfiler, profile_stage
+
+# the name of a column to group by, or the names of multiple columns
+GroupbyCol = Union[str, Sequence[str]]
+
+# float counts of summed weights which are at most this far from 0, e.g.
+# after subtracting the same weights again, are rounding errors of 0
+FLOAT_COUNT_TOLERANCE = 1e-9
+
 
 def get_avc_df(
     df: pd.DataFrame,
     column: str,
-    groupby_col: str = None,
+    groupby_col: GroupbyCol = None,
     dropna: bool = False,
     max_groups: int = None,
     min_group_ratio: float = 0,
-    min_group_count: int = 1,
+    min_group_count: int = None,
     max_subgroups: int = None,
     min_subgroup_ratio: float = 0,
-    min_subgroup_count: int = 1,
+    min_subgroup_count: int = None,
     min_subgroup_ratio_vs_total: float = 0,
     round_ratio: int = None,
+    weight_col: str = None,
+    profiler: StageProfiler = None,
 ) -> pd.DataFrame:
 
     """
         Args:
-        df (pd.DataFrame): the DataFrame to get advanced value counts from
+        df (pd.DataFrame): the DataFrame to get advanced value counts from,
+        or a pyarrow.Table or polars.DataFrame, which is counted by its own
+        library
 
         column (str): the name of the column where the values to count are in
 
-        groupby_col (str, optional): the name of the column to apply the
-        pd.DataFrame.groupby method to. Defaults to None
+        groupby_col (GroupbyCol, optional): the name of the column to apply
+        the pd.DataFrame.groupby method to, or a list of names to group by
+        multiple columns, with summary statistics at each level. The
+        thresholds of the groups are applied per groupby column, within the
+        groups of the previous groupby columns. Defaults to None
 
         dropna (bool, optional): if true, won't add counts for NA values.
         Defaults to False
@@ -39,7 +58,8 @@ def get_avc_df(
 
         min_group_count (int, optional): the minimum count a group of the
         groupby_col must have. Groups below the threshold will be grouped into
-        one group called '_other'. Defaults to 1.
+        one group called '_other'. Defaults to None, which only groups groups
+        with a count of 0.
 
         max_subgroups (int, optional): the maximum amount of subgroups
         (based on column) per group (based on groupby_col). Remaining
@@ -52,7 +72,8 @@ def get_avc_df(
 
         min_subgroup_count (int, optional): the minimum count of a subgroup
         per group. Subgroups below the threshold will be grouped into one
-        subgroup called '_other'. Defaults to 0.
+        subgroup called '_other'. Defaults to None, which only groups
+        subgroups with a count of 0.
 
         min_subgroup_vs_total_ratio (float, optional): the minium ratio of a
         subgroup compared to the total count. Subgroups below the threshold
@@ -61,110 +82,642 @@ def get_avc_df(
         round_ratio (int, optional): the amount of decimals to round a ratio
         to. Defaults to None
 
+        weight_col (str, optional): the name of a column with the weight of
+        each row, e.g. the amount of events of pre-aggregated rows. The
+        counts, ratios and minimum counts are then of the summed weights
+        instead of the amount of rows. Defaults to None.
+
+        profiler (StageProfiler, optional): records the wall time, rows and
+        memory of each stage. Defaults to None, which doesn't profile.
+
     Returns:
         pd.DataFrame: a DataFrame with relative and absolute counts, plus
         extra summary statistics.
     """
 
-    dfc = df.copy()
+    # count the raw data once, the remaining stages only use these counts
+    with profile_stage(profiler, "count", len(df)) as stage:
+        counts = get_raw_counts(df, column, groupby_col, weight_col)
+        stage.rows_out = len(counts)
+
+    return get_avc_df_from_counts(
+        counts,
+        column,
+        groupby_col,
+        dropna,
+        max_groups,
+        min_group_ratio,
+        min_group_count,
+        max_subgroups,
+        min_subgroup_ratio,
+        min_subgroup_count,
+        min_subgroup_ratio_vs_total,
+        round_ratio,
+        profiler,
+    )
 
-    # change the values of the main groups to '_other' if their ratio or
-    # minimal count is too small
-    if groupby_col:
-        dfc[groupby_col] = group_uncommon_values(
-            df=dfc,
-            column=groupby_col,
-            max_groups=max_groups,
-            min_ratio=min_group_ratio,
-            min_count=min_group_count,
-            dropna=dropna,
+
+def get_raw_counts(
+    df: pd.DataFrame,
+    column: str,
+    groupby_col: GroupbyCol = None,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts how often each value of column occurs, per group of the
+    groupby_col if given. NA values are counted as well, so the counts
+    can be used for any value of dropna.
+
+    Args:
+        df (pd.DataFrame): the DataFrame to count the values of. A
+        pyarrow.Table or polars.DataFrame is counted by its own library,
+        so only the counts are converted to pandas.
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column to group
+        the values by, or a list of names to group the values by multiple
+        columns. Defaults to None.
+
+        weight_col (str, optional): the name of a column with the weight of
+        each row, which are summed instead of counting the rows. Values of
+        which the weights sum to 0 are left out. Defaults to None.
+
+    Returns:
+        pd.Series: the counts, indexed by the values of column or by a
+        MultiIndex of the values of the groupby columns and column
+    """
+    if not isinstance(df, pd.DataFrame):
+        return get_native_raw_counts(
+            df, [*get_groupby_cols(groupby_col), column], weight_col
         )
-        dfc[column] = group_uncommon_values(
-            df=dfc,
-            column=column,
-            min_ratio=min_subgroup_ratio_vs_total,
-            min_count=min_subgroup_count,
-            dropna=dropna,
+    return count_codes(
+        factorize_values(df[column]),
+        *(factorize_values(df[col]) for col in get_groupby_cols(groupby_col)),
+        weights=get_weights(df, weight_col),
+    )
+
+
+def get_weights(df: pd.DataFrame, weight_col: str = None) -> np.ndarray:
+    """Gets the weights of the rows, with NA as a weight of 0. Integer and
+    boolean weights, including masked dtypes like Int64, become an int64
+    array and other weights a float64 array.
+
+    Args:
+        df (pd.DataFrame): the DataFrame
+        weight_col (str, optional): the name of the column with the weights.
+        Defaults to None.
+
+    Raises:
+        TypeError: if the weights are not numeric
+
+    Returns:
+        np.ndarray: the weights, or None if there is no weight_col
+    """
+    if weight_col is None:
+        return None
+    weights = df[weight_col]
+    if not pd.api.types.is_numeric_dtype(weights.dtype):
+        raise TypeError(
+            f"The weights in {weight_col} must be numeric, not "
+            f"{weights.dtype}"
         )
-    else:
-        dfc[column] = group_uncommon_values(
-            df=dfc,
-            column=column,
-            max_groups=max_groups,
-            min_ratio=min_group_ratio,
-            min_count=min_group_count,
-            dropna=dropna,
+
+    # masked dtypes like Int64 would otherwise become an array of objects
+    is_integer = pd.api.types.is_integer_dtype(weights.dtype)
+    if is_integer or pd.api.types.is_bool_dtype(weights.dtype):
+        return weights.to_numpy(dtype="int64", na_value=0)
+    return weights.to_numpy(dtype="float64", na_value=0)
+
+
+def get_groupby_cols(groupby_col: GroupbyCol = None) -> List[str]:
+    """Gets the names of the columns to group by as a list
+
+    Args:
+        groupby_col (GroupbyCol, optional): None, the name of a column or a
+        list of names of columns. Defaults to None.
+
+    Returns:
+        List[str]: the names of the columns to group by, empty if there
+        are none
+    """
+    if not groupby_col:
+        return []
+    if isinstance(groupby_col, (list, tuple)):
+        return list(groupby_col)
+    return [groupby_col]
+
+
+def count_codes(
+    factorized_values: Tuple[np.ndarray, pd.Index],
+    *factorized_groups: Tuple[np.ndarray, pd.Index],
+    weights: np.ndarray = None,
+) -> pd.Series:
+    """Counts the codes of factorize_values, per combination of groups if
+    the codes of one or more groupby columns are given
+
+    Args:
+        factorized_values (Tuple[np.ndarray, pd.Index]): the codes and
+        unique values of the column to count, from factorize_values
+
+        *factorized_groups (Tuple[np.ndarray, pd.Index]): the codes and
+        unique values of the groupby columns, from factorize_values
+
+        weights (np.ndarray, optional): the weight of each code, which are
+        summed instead of counted. Defaults to None.
+
+    Returns:
+        pd.Series: the counts, like get_raw_counts
+    """
+    keys = [*factorized_groups, factorized_values]
+    codes, n_codes, steps = combine_codes(
+        [(key_codes, len(key_uniques)) for key_codes, key_uniques in keys]
+    )
+    counts = count_weights(codes, weights, n_codes)
+    counted = np.flatnonzero(counts)
+    key_codes = split_codes(counted, steps)
+
+    levels = [uniques[codes] for (_, uniques), codes in zip(keys, key_codes)]
+    index = pd.MultiIndex.from_arrays(levels) if len(levels) > 1 else levels[0]
+    return pd.Series(counts[counted], index=index)
+
+
+def count_weights(
+    codes: np.ndarray, weights: np.ndarray = None, minlength: int = 0
+) -> np.ndarray:
+    """Counts the codes like np.bincount, or sums their weights. Integer
+    weights are summed to integers.
+
+    Args:
+        codes (np.ndarray): the codes, from 0
+        weights (np.ndarray, optional): the weight of each code. Defaults to
+        None, which counts the codes.
+        minlength (int, optional): the minimum amount of codes. Defaults to
+        0.
+
+    Returns:
+        np.ndarray: the count or summed weight per code
+    """
+    counts = np.bincount(codes, weights, minlength)
+    if weights is not None and weights.dtype.kind in "iub":
+        counts = counts.astype(np.int64)
+    return counts
+
+
+def combine_codes(
+    keys: List[Tuple[np.ndarray, int]]
+) -> Tuple[np.ndarray, int, list]:
+    """Combines the codes of the keys into a single code per combination,
+    one key at a time. The codes of all possible combinations are kept if
+    they fit in an array of about the size of the data, else the
+    combinations that actually occur are given new codes.
+
+    Args:
+        keys (List[Tuple[np.ndarray, int]]): the codes of each key, from 0,
+        and the amount of codes of that key
+
+    Returns:
+        Tuple[np.ndarray, int, list]: the combined codes, the amount of
+        possible combined codes, and the steps to split them with
+        split_codes
+    """
+    codes, n_codes = keys[0]
+    steps = []
+    for key_codes, n_key_codes in keys[1:]:
+        codes = codes * n_key_codes
+        codes += key_codes
+        n_codes *= n_key_codes
+        combinations = None
+        if n_codes > max(len(codes), 2**16):
+            codes, combinations = pd.factorize(codes)
+            n_codes = len(combinations)
+        steps.append((n_key_codes, combinations))
+    return codes, n_codes, steps
+
+
+def split_codes(codes: np.ndarray, steps: list) -> List[np.ndarray]:
+    """Splits the codes of combine_codes into the codes of each key
+
+    Args:
+        codes (np.ndarray): the combined codes
+        steps (list): the steps of combine_codes
+
+    Returns:
+        List[np.ndarray]: the codes of each key
+    """
+    # decode the combinations from the last key to the first
+    key_codes = [codes]
+    for n_key_codes, combinations in reversed(steps):
+        if combinations is not None:
+            key_codes[0] = combinations[key_codes[0]]
+        key_codes[:1] = divmod(key_codes[0], n_key_codes)
+    return key_codes
+
+
+def get_raw_counts_from_chunks(
+    chunks: Iterable[pd.DataFrame],
+    column: str,
+    groupby_col: GroupbyCol = None,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts the values of DataFrames chunk by chunk, so the complete data
+    never has to fit in memory
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): the chunks of the data
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, to group the values by. Defaults to None.
+
+        weight_col (str, optional): the name of the column with the weight
+        of each row. Defaults to None.
+
+    Returns:
+        pd.Series: the counts of all chunks, like get_raw_counts
+    """
+    counts = None
+    for chunk in chunks:
+        chunk_counts = get_raw_counts(chunk, column, groupby_col, weight_col)
+        counts = (
+            chunk_counts
+            if counts is None
+            else merge_raw_counts([counts, chunk_counts])
+        )
+    if counts is None:
+        raise ValueError("No chunks to count the values of")
+    return counts
+
+
+def merge_raw_counts(counts: Iterable[pd.Series]) -> pd.Series:
+    """Adds up the counts of get_raw_counts of different parts of the data
+
+    Args:
+        counts (Iterable[pd.Series]): the counts as returned by
+        get_raw_counts
+
+    Returns:
+        pd.Series: the summed counts
+    """
+    counts = pd.concat(counts)
+    return counts.groupby(
+        level=list(range(counts.index.nlevels)), dropna=False, sort=False
+    ).sum()
+
+
+def drop_empty_counts(counts: pd.Series) -> pd.Series:
+    """Removes the values without a positive count, e.g. after subtracting
+    counts. Float counts of summed weights which are 0 up to a rounding
+    error, i.e. at most FLOAT_COUNT_TOLERANCE away from 0, are removed as
+    well.
+
+    Args:
+        counts (pd.Series): the counts, or summed weights
+
+    Returns:
+        pd.Series: the positive counts
+    """
+    counts = round_empty_counts(counts)
+    return counts[counts > 0]
+
+
+def round_empty_counts(counts: pd.Series) -> pd.Series:
+    """Sets float counts which are 0 up to a rounding error to 0, so they
+    aren't mistaken for positive or negative counts
+
+    Args:
+        counts (pd.Series): the counts, or summed weights
+
+    Returns:
+        pd.Series: the counts with the rounding errors around 0 removed
+    """
+    if counts.dtype.kind != "f":
+        return counts
+    return counts.mask(
+        np.isclose(counts.to_numpy(), 0, atol=FLOAT_COUNT_TOLERANCE), 0.0
+    )
+
+
+def get_raw_counts_from_counts(
+    counts: Union[pd.Series, pd.DataFrame],
+    column: str,
+    groupby_col: GroupbyCol = None,
+    count_col: str = "count",
+) -> pd.Series:
+    """Turns counts that were made elsewhere, e.g. by a SQL GROUP BY, into
+    counts like those of get_raw_counts. Combinations that occur more than
+    once are summed and combinations with a count of 0 are left out.
+
+    Args:
+        counts (Union[pd.Series, pd.DataFrame]): a pd.Series of counts
+        indexed by the values of the groupby columns and column, either with
+        levels named after them or in that order. Or a pd.DataFrame with
+        the groupby columns, column and count_col as columns.
+
+        column (str): the name of the column where the counted values are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, the values are grouped by. Defaults to None.
+
+        count_col (str, optional): the name of the column of the counts of
+        a pd.DataFrame. Defaults to 'count'.
+
+    Raises:
+        TypeError: if counts is not a pd.Series or pd.DataFrame
+        ValueError: if the columns or index levels of counts don't match
+        column and groupby_col
+
+    Returns:
+        pd.Series: the counts, like get_raw_counts
+    """
+    names = [*get_groupby_cols(groupby_col), column]
+    if isinstance(counts, pd.DataFrame):
+        missing = [
+            name for name in [*names, count_col] if name not in counts.columns
+        ]
+        if missing:
+            raise ValueError(f"counts has no columns {missing}")
+        counts = counts.set_index(names)[count_col]
+    elif not isinstance(counts, pd.Series):
+        raise TypeError(
+            "counts must be a pd.Series or a pd.DataFrame, not "
+            f"{type(counts).__name__}"
         )
+    elif counts.index.nlevels != len(names):
+        raise ValueError(
+            f"counts must be indexed by {len(names)} levels, {names}, not "
+            f"{counts.index.nlevels}"
+        )
+    elif set(counts.index.names) == set(names):
+        if len(names) > 1:
+            counts = counts.reorder_levels(names)
+    else:
+        counts = counts.rename_axis(names)
+
+    counts = merge_raw_counts([counts.rename(None)])
+    return counts[counts != 0]
+
+
+def factorize_values(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Encodes values as integer codes, reusing the codes of a categorical.
+    NA values get the code after the last unique value.
+
+    Args:
+        values (pd.Series): the values to encode
+
+    Returns:
+        Tuple[np.ndarray, pd.Index]: the codes, and the unique values that
+        the codes refer to, with NA as last unique value if there is NA
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy().astype(np.intp)
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Index(uniques)
+
+    # give NA the code after the last unique value, so codes can be counted
+    # with np.bincount
+    is_na = codes < 0
+    if is_na.any():
+        codes[is_na] = len(uniques)
+        uniques = uniques.append(pd.Index([np.nan]))
+    return codes, uniques.rename(values.name)
+
+
+def select_counted(counts: np.ndarray, values: pd.Index) -> pd.Series:
+    """Selects the values with a count above zero
+
+    Args:
+        counts (np.ndarray): the counts per code, as from np.bincount
+        values (pd.Index): the values that the codes refer to
+
+    Returns:
+        pd.Series: the counts, indexed by the counted values
+    """
+    counted = np.flatnonzero(counts)
+    return pd.Series(counts[counted], index=values[counted])
+
+
+def get_avc_df_from_counts(
+    counts: pd.Series,
+    column: str,
+    groupby_col: GroupbyCol = None,
+    dropna: bool = False,
+    max_groups: int = None,
+    min_group_ratio: float = 0,
+    min_group_count: int = None,
+    max_subgroups: int = None,
+    min_subgroup_ratio: float = 0,
+    min_subgroup_count: int = None,
+    min_subgroup_ratio_vs_total: float = 0,
+    round_ratio: int = None,
+    profiler: StageProfiler = None,
+    approximate: bool = False,
+) -> pd.DataFrame:
+    """Gets the advanced value counts from the counts of get_raw_counts,
+    without needing the raw data. See get_avc_df for the other arguments.
+
+    Args:
+        counts (pd.Series): the counts as returned by get_raw_counts, or the
+        approximate counts of a SpaceSaving sketch
+
+        profiler (StageProfiler, optional): records the wall time, rows and
+        memory of each stage. Defaults to None, which doesn't profile.
+
+        approximate (bool, optional): if true, the counts are of a
+        SpaceSaving sketch, of which '_other' doesn't take one of the
+        max_groups or max_subgroups. Defaults to False.
+
+    Returns:
+        pd.DataFrame: a DataFrame with relative and absolute counts, plus
+        extra summary statistics.
+    """
 
-    # replace na's with _na as a string
-    if not dropna:
-        dfc.loc[:, column] = dfc[column].fillna("_na")
-        if groupby_col:
-            dfc.loc[:, groupby_col] = dfc[groupby_col].fillna("_na")
+    groupby_cols = get_groupby_cols(groupby_col)
+
+    # change the values of the main groups to '_other' if their ratio or
+    # minimal count is too small, and replace NA's with '_na' as a string
+    with profile_stage(
+        profiler, "group_uncommon_values", len(counts)
+    ) as stage:
+        counts = group_uncommon_counts(
+            counts,
+            column,
+            groupby_cols,
+            dropna,
+            max_groups,
+            min_group_ratio,
+            min_group_count,
+            min_subgroup_count,
+            min_subgroup_ratio_vs_total,
+            approximate,
+        )
+        stage.rows_out = len(counts)
 
     # get summary statistics, which means:
     # add a group '_all' for overall statistics, and
     # add '_total' as subgroup for subgroup statistics
-    value_counts_df = add_summary_statistics(dfc, column, groupby_col)
+    with profile_stage(
+        profiler, "add_summary_statistics", len(counts)
+    ) as stage:
+        value_counts_df = summarize_counts(counts, column, groupby_col)
+        stage.rows_out = len(value_counts_df)
 
-    if groupby_col:
+    if groupby_cols:
         # change the subgroups which are too small to '_other'
-        value_counts_df[column] = group_uncommon_subgroups(
-            value_counts_df=value_counts_df,
-            column=column,
-            max_subgroups=max_subgroups,
-            min_subgroup_ratio=min_subgroup_ratio,
-            min_subgroup_count=min_subgroup_count,
-            min_subgroup_ratio_vs_total=min_subgroup_ratio_vs_total,
-        )
+        with profile_stage(
+            profiler, "group_uncommon_subgroups", len(value_counts_df)
+        ) as stage:
+            summary_index = value_counts_df.index
+            subgroups = group_uncommon_subgroups(
+                value_counts_df=value_counts_df,
+                column=column,
+                max_subgroups=max_subgroups,
+                min_subgroup_ratio=min_subgroup_ratio,
+                min_subgroup_count=min_subgroup_count,
+                min_subgroup_ratio_vs_total=min_subgroup_ratio_vs_total,
+                approximate=approximate,
+            )
+            stage.rows_out = len(value_counts_df)
 
     # if not groupby change the index name to the column for extra readability
     else:
         value_counts_df.index.name = column
 
-    # change the count column to integers
-    value_counts_df["count"] = value_counts_df["count"].astype(int)
-
-    # round the ratio for visability if a number is set for round_ratio
-    if round_ratio:
-        value_counts_df["subgroup_ratio"] = value_counts_df[
-            "subgroup_ratio"
-        ].round(round_ratio)
-        if groupby_col:
-            value_counts_df["r_vs_total"] = value_counts_df[
-                "r_vs_total"
-            ].round(round_ratio)
-
-    # groupby the two columns again to get the final DataFrame
-    if groupby_col:
-        value_counts_df = (
-            value_counts_df.groupby([value_counts_df.index, column])
-            .sum()
-            .sort_index()
-        )
-        # return value_counts_df
+    with profile_stage(profiler, "regroup", len(value_counts_df)) as stage:
+        # sum the counts of the subgroups that were changed to '_other' and
+        # get the ratios of the summed counts
+        if groupby_cols:
+            value_counts_df = collapse_subgroups(
+                summary_index, subgroups, value_counts_df["count"].to_numpy()
+            )
+            ratio_cols = ["subgroup_ratio", "r_vs_total"]
+        else:
+            value_counts_df = value_counts_df.sort_values(
+                "count", ascending=False, kind="mergesort"
+            )
+            ratio_cols = ["ratio"]
+
+        # change the count column to integers, unless the counts are summed
+        # weights which are not whole numbers
+        if counts.dtype.kind != "f":
+            value_counts_df["count"] = value_counts_df["count"].astype(int)
+
+        # round the ratio for visability if a number is set for round_ratio
+        if round_ratio:
+            value_counts_df[ratio_cols] = value_counts_df[ratio_cols].round(
+                round_ratio
+            )
+        stage.rows_out = len(value_counts_df)
+
+    if not groupby_cols:
+        return value_counts_df
+
+    with profile_stage(
+        profiler, "add_subgroup_diff_vs_total", len(value_counts_df)
+    ) as stage:
         value_counts_df = add_subgroup_diff_vs_total(
             value_counts_df,
             col="subgroup_ratio",
             new_col="subgr_r_diff_subgr_all",
         )
+        stage.rows_out = len(value_counts_df)
 
-        return value_counts_df.loc[
-            :,
-            [
-                "count",
-                "subgroup_ratio",
-                "subgr_r_diff_subgr_all",
-                "r_vs_total",
-            ],
-        ]
+    return value_counts_df.loc[
+        :,
+        [
+            "count",
+            "subgroup_ratio",
+            "subgr_r_diff_subgr_all",
+            "r_vs_total",
+        ],
+    ]
+
+
+def group_uncommon_counts(
+    counts: pd.Series,
+    column: str,
+    groupby_cols: List[str],
+    dropna: bool = False,
+    max_groups: int = None,
+    min_group_ratio: float = 0,
+    min_group_count: int = None,
+    min_subgroup_count: int = None,
+    min_subgroup_ratio_vs_total: float = 0,
+    approximate: bool = False,
+) -> pd.Series:
+    """Changes the uncommon groups, and the values that are uncommon in the
+    whole column, of the counts of get_raw_counts to '_other' and NA to
+    '_na' unless dropna is true, and sums the counts with the same labels.
+    See get_avc_df for the other arguments.
+
+    Args:
+        counts (pd.Series): the counts as returned by get_raw_counts
+        groupby_cols (List[str]): the names of the groupby columns
+        approximate (bool, optional): if true, the counts are of a
+        SpaceSaving sketch, see get_avc_df_from_counts. Defaults to False.
 
+    Returns:
+        pd.Series: the counts per label
+    """
+    if groupby_cols:
+        labels = []
+        for col in groupby_cols:
+            groups = counts.index.get_level_values(col)
+            # the groups of the first groupby column are compared with all
+            # groups, the groups of the next columns only with the groups
+            # that have the same parent groups
+            if labels:
+                is_uncommon = get_uncommon_subvalues(
+                    counts=counts,
+                    parents=labels,
+                    values=groups,
+                    max_groups=max_groups,
+                    min_ratio=min_group_ratio,
+                    min_count=min_group_count,
+                    dropna=dropna,
+                )
+            else:
+                is_uncommon = groups.isin(
+                    get_uncommon_values(
+                        value_counts=level_value_counts(counts, col),
+                        max_groups=max_groups,
+                        min_ratio=min_group_ratio,
+                        min_count=min_group_count,
+                        dropna=dropna,
+                    )
+                )
+            labels.append(relabel_uncommon(groups, is_uncommon, dropna))
+
+        values = counts.index.get_level_values(column)
+        uncommon_values = get_uncommon_values(
+            value_counts=level_value_counts(counts, column),
+            min_ratio=min_subgroup_ratio_vs_total,
+            min_count=min_subgroup_count,
+            dropna=dropna,
+        )
+        labels.append(relabel_values(values, uncommon_values, dropna))
     else:
-        return value_counts_df.sort_values("count", ascending=False)
+        uncommon_values = get_uncommon_values(
+            value_counts=level_value_counts(counts, column),
+            max_groups=max_groups,
+            min_ratio=min_group_ratio,
+            min_count=min_group_count,
+            dropna=dropna,
+            approximate=approximate,
+        )
+        labels = relabel_values(counts.index, uncommon_values, dropna)
+
+    # sum the counts of the values that now have the same label
+    return counts.groupby(labels, dropna=False, sort=False).sum()
 
 
 def add_summary_statistics(
-    df: pd.DataFrame, column: str, groupby_col: str
+    df: pd.DataFrame,
+    column: str,
+    groupby_col: GroupbyCol,
+    weight_col: str = None,
 ) -> pd.DataFrame:
     """Adds summary statistic of each subgroup and main group of a
     grouped-by DataFrame
@@ -172,76 +725,171 @@ def add_summary_statistics(
     Args:
         df (pd.DataFrame): DataFrame to add the summary statistics to
         column (str): the column which will be turned into subgroups
-        groupby_col (str): the column by which the DataFrame will be grouped by
+        groupby_col (GroupbyCol): the column (or list of columns) by which the
+        DataFrame will be grouped by
+        weight_col (str, optional): the name of the column with the weight
+        of each row, which are summed instead of counting the rows.
+        Defaults to None.
+
+    Returns:
+        pd.DataFrame: DataFrame with summary statistics added
+    """
+    return summarize_counts(
+        get_raw_counts(df, column, groupby_col, weight_col),
+        column,
+        groupby_col,
+    )
+
+
+def summarize_counts(
+    counts: pd.Series, column: str, groupby_col: GroupbyCol
+) -> pd.DataFrame:
+    """Gets the counts and ratios of each subgroup and main group, plus the
+    summary statistics, from the counts of get_raw_counts. NA values are
+    not included.
+
+    With multiple groupby columns the summary statistics are added at each
+    level of the hierarchy: the group '_all' of a groupby column contains the
+    statistics of its parent group over all groups of that column and the
+    next columns.
+
+    Args:
+        counts (pd.Series): the counts as returned by get_raw_counts
+        column (str): the column which will be turned into subgroups
+        groupby_col (GroupbyCol): the column (or list of columns) by which the
+        counts are grouped by
 
     Returns:
         pd.DataFrame: DataFrame with summary statistics added
     """
 
-    # perform two ungrouped value_counts
-    rel_series = df[column].value_counts(normalize=True)
-    count_series = df[column].value_counts()
+    # get the ungrouped value counts, the ratios are derived from it
+    count_series = level_value_counts(counts, column, dropna=True)
 
-    # perform  a value_counts on a groupby if a groupby column is specified
-    if groupby_col:
-        rel_series_grouped = df.groupby(groupby_col)[column].value_counts(
-            normalize=True
+    groupby_cols = get_groupby_cols(groupby_col)
+    if not groupby_cols:
+        return pd.concat(
+            [count_series / count_series.sum(), count_series],
+            axis=1,
+            keys=("ratio", "count"),  # names of the columns
         )
-        count_series_grouped = df.groupby(groupby_col)[column].value_counts()
 
-        # select the grouped value counts series to be concatenatd to a
-        # single dataframe
-        series_to_concat = [rel_series_grouped, count_series_grouped]
-        keys = ("subgroup_ratio", "count")
-    else:
-        # select the ungrouped value counts series to be conconatenated to a
-        # single dataframe
-        series_to_concat = [rel_series, count_series]
-        keys = ("ratio", "count")
-
-    # concatenate the relative and the absolute series to
-    # get a dataframe with both
-    value_counts_df = pd.concat(
-        series_to_concat, axis=1, keys=keys  # names of the columns
+    names = [*groupby_cols, column]
+    subgroup_summaries = []
+    total_summaries = []
+
+    # select the counts of the subgroups within the groups of all groupby
+    # columns
+    is_selected = counts.index.get_level_values(column).notna()
+    for col in groupby_cols:
+        is_selected &= counts.index.get_level_values(col).notna()
+    leaf_counts = counts[is_selected]
+
+    # summarize from the deepest level, the groups of all groupby columns,
+    # up to the whole column
+    for depth in range(len(groupby_cols), -1, -1):
+        group_cols = groupby_cols[:depth]
+        n_all = len(groupby_cols) - depth
+
+        if not n_all:
+            level_counts = leaf_counts
+            group_counts = level_counts.groupby(level=group_cols).sum()
+        else:
+            if depth:
+                # the groups of the summarized levels may be NA
+                is_selected = counts.index.get_level_values(column).notna()
+                for col in group_cols:
+                    is_selected &= counts.index.get_level_values(col).notna()
+                level_counts = (
+                    counts[is_selected]
+                    .groupby(level=[*group_cols, column], sort=False)
+                    .sum()
+                )
+                group_counts = level_counts.groupby(level=group_cols).sum()
+                leaf_keys = leaf_counts.index.droplevel(groupby_cols[depth:])
+            else:
+                level_counts = count_series
+                group_counts = pd.Series([count_series.sum()])
+                leaf_keys = leaf_counts.index.get_level_values(column)
+
+            # the statistics of a level are added to a new group called
+            # '_all', but only for the subgroups that occur within the groups
+            # of the deepest level
+            level_counts = level_counts[level_counts.index.isin(leaf_keys)]
+
+        group_levels = [
+            level_counts.index.get_level_values(col) for col in group_cols
+        ]
+        if depth:
+            group_totals = group_counts.reindex(
+                pd.MultiIndex.from_arrays(group_levels)
+                if depth > 1
+                else group_levels[0]
+            ).to_numpy()
+        else:
+            group_totals = group_counts.iloc[0]
+
+        subgroup_summaries.append(
+            pd.DataFrame(
+                {
+                    "subgroup_ratio": level_counts.to_numpy() / group_totals,
+                    "count": level_counts.to_numpy(),
+                },
+                index=get_summary_index(
+                    group_levels,
+                    n_all,
+                    level_counts.index.get_level_values(column),
+                    names,
+                ),
+            )
+        )
+
+        # the '_total' subgroups contain the statistics of the whole group
+        total_summaries.append(
+            pd.DataFrame(
+                {
+                    "subgroup_ratio": 1.0,  # the ratio of a whole group is 1
+                    "count": group_counts.to_numpy(),
+                },
+                index=get_summary_index(
+                    [
+                        group_counts.index.get_level_values(col)
+                        for col in group_cols
+                    ],
+                    n_all,
+                    ["_total"] * len(group_counts),
+                    names,
+                ),
+            )
+        )
+
+    # concatenate the grouped, '_all' and '_total' statistics at once
+    return pd.concat(subgroup_summaries + total_summaries)
+
+
+def get_summary_index(
+    group_levels: List[pd.Index],
+    n_all: int,
+    subgroups: Sequence,
+    names: List[str],
+) -> pd.MultiIndex:
+    """Gets the index of summary statistics, with the group '_all' for the
+    levels that are summarized
+
+    Args:
+        group_levels (List[pd.Index]): the groups of the levels that are not
+        summarized
+        n_all (int): the amount of summarized levels
+        subgroups (Sequence): the subgroups
+        names (List[str]): the names of the groupby columns and the column
+
+    Returns:
+        pd.MultiIndex: the index
+    """
+    all_levels = [["_all"] * len(subgroups)] * n_all
+    return pd.MultiIndex.from_arrays(
+        [*group_levels, *all_levels, subgroups], names=names
     )
-    if groupby_col:
-
-        # add the statistics of the ungrouped value counts, and add them to a
-        # new group called '_all'
-        for index in set(value_counts_df.index.get_level_values(column)):
-            value_counts_df.loc[
-                ("_all", index), "subgroup_ratio"
-            ] = rel_series[index]
-            value_counts_df.loc[("_all", index), "count"] = count_series[index]
-
-        # add the statistics of the whole dataframe
-        value_counts_df.loc[
-            ("_all", "_total"), "subgroup_ratio"
-        ] = 1  # ratio of all data = 1
-        value_counts_df.loc[
-            ("_all", "_total"), "count"
-        ] = count_series.sum()  # total count
-
-        # loop through the zero-level index, which defines the groups of the
-        # groupby column
-        for groupby_index in set(
-            value_counts_df.index.get_level_values(groupby_col)
-        ):
-
-            # make sure the '_all' index, created above, isn't used
-            if groupby_index != "_all":
-
-                # total of a subgroup is always 1
-                value_counts_df.loc[
-                    (groupby_index, "_total"), "subgroup_ratio"
-                ] = 1
-
-                # add the absolute count for each group
-                value_counts_df.loc[
-                    (groupby_index, "_total"), "count"
-                ] = value_counts_df.loc[groupby_index, "count"].sum()
-
-    return value_counts_df
 
 
 def group_uncommon_values(
@@ -249,9 +897,11 @@ def group_uncommon_values(
     column: str,
     max_groups: int = None,
     min_ratio: float = 0,
-    min_count: int = 1,
+    min_count: int = None,
     dropna: bool = False,
     uncommon_group_name: str = "_other",
+    categorical: bool = False,
+    weight_col: str = None,
 ):
 
     """Changes column values to a specified string (from uncommon_group_name)
@@ -270,54 +920,382 @@ def group_uncommon_values(
         Defaults to 0.
 
         min_count (int, optional): the minimal count a value must have.
-        Defaults to 1.
+        Defaults to None, which only selects values with a count of 0.
 
         uncommon_group_name (str, optional): value to change the uncommon
         group names to. Defaults to '_other'
 
+        categorical (bool, optional): if true, the values are counted and
+        changed through integer codes instead of through the values
+        themselves, which is faster for large columns. Defaults to False.
+
+        weight_col (str, optional): the name of the column with the weight
+        of each row. The counts and ratios of the values are then of their
+        summed weights. Defaults to None.
+
     Returns:
         pd.Series: the pd.Series of the column of the df, with possibly some
-        values changed to the value of uncommon_group_name
+        values changed to the value of uncommon_group_name. A pd.Categorical
+        if categorical is true.
     """
 
-    # get the value counts of the column
-    value_counts = df[column].value_counts(dropna=dropna)
-    value_counts.index = value_counts.index.fillna("_na")
+    if categorical:
+        return group_uncommon_codes(
+            df[column],
+            max_groups,
+            min_ratio,
+            min_count,
+            dropna,
+            uncommon_group_name,
+            get_weights(df, weight_col),
+        )
+
+    # get the value counts of the column, or the summed weights
+    if weight_col is None:
+        value_counts = df[column].value_counts(dropna=dropna)
+    else:
+        value_counts = (
+            df.groupby(column, dropna=dropna, sort=False)[weight_col]
+            .sum()
+            .sort_values(ascending=False, kind="mergesort")
+        )
+    uncommon_values = get_uncommon_values(
+        value_counts, max_groups, min_ratio, min_count, dropna
+    )
+
+    # replace labels with uncommon_group_name if the count (ratio) is les
+    # than the minimal count (ratio)
+    return np.where(
+        df[column].isin(uncommon_values),
+        uncommon_group_name,
+        df[column],
+    )
+
 
-    # make sure _na won't be dropped if dropna == False
-    groups = [] if dropna else ["_na"]
+def group_uncommon_codes(
+    values: pd.Series,
+    max_groups: int = None,
+    min_ratio: float = 0,
+    min_count: int = None,
+    dropna: bool = False,
+    uncommon_group_name: str = "_other",
+    weights: np.ndarray = None,
+) -> pd.Categorical:
+    """Changes uncommon values to uncommon_group_name like
+    group_uncommon_values, but through integer codes: the values are
+    factorized once (or the codes of a categorical are used), counted with
+    np.bincount and the codes of uncommon values are changed through a
+    lookup table.
+
+    Args:
+        values (pd.Series): the values to change
+        max_groups (int, optional): the maximum amount of different values
+        that are allowed. Defaults to None.
+        min_ratio (float, optional): the minimal ratio a value must have.
+        Defaults to 0.
+        min_count (int, optional): the minimal count a value must have.
+        Defaults to None, which only selects values with a count of 0.
+        dropna (bool, optional): if true, NA is not taken into account.
+        Defaults to False.
+        uncommon_group_name (str, optional): value to change the uncommon
+        values to. Defaults to '_other'
+        weights (np.ndarray, optional): the weight of each value, which are
+        summed instead of counting the values. Defaults to None.
 
-    # make sure max_groups is not affected by _na, by increasing
-    # max_groups by 1 if _na is in the n biggest groups with
-    # n = max_groups
-    if max_groups:
-        max_groups = (
-            max_groups
-            if "_na" not in value_counts.head(max_groups).index
-            else max_groups + 1
+    Returns:
+        pd.Categorical: the values, with possibly some values changed to
+        uncommon_group_name
+    """
+    codes, uniques = factorize_values(values)
+    counts = count_weights(codes, weights, len(uniques))
+    value_counts = select_counted(counts, uniques).sort_values(
+        ascending=False, kind="mergesort"
+    )
+    uncommon_values = get_uncommon_values(
+        value_counts, max_groups, min_ratio, min_count, dropna
+    )
+
+    # the common values keep their category, uncommon values get the
+    # category of uncommon_group_name and NA gets code -1
+    is_uncommon = uniques.isin(uncommon_values)
+    if weights is not None:
+        # values of which the weights sum to 0 aren't counted, but are as
+        # uncommon as they are in group_uncommon_values
+        is_uncommon |= (
+            (counts == 0)
+            & (np.bincount(codes[codes >= 0], minlength=len(uniques)) > 0)
+            & uniques.notna()
         )
+    is_common = ~is_uncommon & uniques.notna()
+    categories = uniques[is_common]
+    lookup_table = np.full(len(uniques), -1)
+    lookup_table[is_common] = np.arange(len(categories))
+    if is_uncommon.any():
+        if uncommon_group_name not in categories:
+            categories = categories.append(pd.Index([uncommon_group_name]))
+        lookup_table[is_uncommon] = categories.get_loc(uncommon_group_name)
+
+    return pd.Categorical.from_codes(lookup_table[codes], categories)
+
+
+def get_uncommon_values(
+    value_counts: pd.Series,
+    max_groups: int = None,
+    min_ratio: float = 0,
+    min_count: int = None,
+    dropna: bool = False,
+    approximate: bool = False,
+) -> pd.Index:
+    """Selects the values which should be changed to an uncommon group name
+    based on minimal conditions of their counts and maxium condition of
+    amount of unique values. NA is never selected.
+
+    Args:
+        value_counts (pd.Series): the counts of the values, sorted by count
+        in descending order
+
+        max_groups (int, optional): the maximum amount of different values
+        that are allowed. Defaults to None.
+
+        min_ratio (float, optional): the minimal ratio a value must have.
+        Defaults to 0.
+
+        min_count (int, optional): the minimal count a value must have.
+        Defaults to None, which only selects values with a count of 0.
+
+        dropna (bool, optional): if true, NA is not taken into account.
+        Defaults to False.
+
+        approximate (bool, optional): if true, the counts are of a
+        SpaceSaving sketch, of which '_other' contains the values that
+        aren't counted, so '_other' doesn't take one of the max_groups.
+        Defaults to False.
+
+    Returns:
+        pd.Index: the uncommon values
+    """
+    if dropna:
+        value_counts = value_counts[value_counts.index.notna()]
+    is_na = value_counts.index.isna()
+
+    # make sure max_groups is not affected by NA, and by the values an
+    # approximate count didn't count, by selecting the n biggest other groups
+    # with n = max_groups
+    is_counted = ~is_na
+    if approximate:
+        is_counted &= value_counts.index != "_other"
+
     # determine the names of the groups that are allowed, based on if
     # max_groups is set or not
-    groups += (
-        value_counts.head(max_groups).index.tolist()
+    groups = (
+        value_counts.index[is_counted][:max_groups]
         if max_groups is not None
-        else value_counts.index.tolist()
+        else value_counts.index
     )
     # get a truth value for when a value count is less than the minimal ratio
     # or less than the minimal count
     conditions = (
         (value_counts / value_counts.sum()).lt(min_ratio)
-        | value_counts.lt(min_count)
+        | is_below_min_count(value_counts, min_count)
         | ~value_counts.index.isin(groups)
     )
+    return value_counts.index[conditions & ~is_na]
 
-    # replace labels with uncommon_group_name if the count (ratio) is les
-    # than the minimal count (ratio)
-    return np.where(
-        df[column].isin(value_counts[conditions].index),
-        uncommon_group_name,
-        df[column],
+
+def is_below_min_count(
+    counts: pd.Series, min_count: float = None
+) -> pd.Series:
+    """Checks which counts are below the minimal count. Without a minimal
+    count only counts of 0 or less are selected, which is the same as a
+    minimal count of 1 for counts of rows, but keeps values of which the
+    weights sum to less than 1.
+
+    Args:
+        counts (pd.Series): the counts, or summed weights
+        min_count (float, optional): the minimal count a value must have.
+        Defaults to None.
+
+    Returns:
+        pd.Series: per count if it is below the minimal count
+    """
+    if min_count is None:
+        return counts.le(0)
+    return counts.lt(min_count)
+
+
+def level_value_counts(
+    counts: pd.Series, level: str, dropna: bool = False
+) -> pd.Series:
+    """Sums the counts of get_raw_counts per value of one of its levels
+
+    Args:
+        counts (pd.Series): the counts as returned by get_raw_counts
+        level (str): the name of the level to sum the counts of
+        dropna (bool, optional): if true, NA is left out. Defaults to False.
+
+    Returns:
+        pd.Series: the counts of the values of the level, sorted by count
+        in descending order
+    """
+    value_counts = counts.groupby(level=level, dropna=dropna, sort=False).sum()
+
+    # break ties by value, so the order doesn't depend on the order in which
+    # the values were counted
+    order = np.lexsort(
+        (value_counts.index.astype(str), -value_counts.to_numpy())
+    )
+    return value_counts.iloc[order]
+
+
+def relabel_values(
+    values: pd.Index,
+    uncommon_values: pd.Index,
+    dropna: bool = False,
+    uncommon_group_name: str = "_other",
+) -> pd.Index:
+    """Changes uncommon values to uncommon_group_name, and NA values to
+    '_na' if dropna is false
+
+    Args:
+        values (pd.Index): the values to relabel
+        uncommon_values (pd.Index): the values to change to
+        uncommon_group_name
+        dropna (bool, optional): if true, NA values are kept as they are.
+        Defaults to False.
+        uncommon_group_name (str, optional): value to change the uncommon
+        values to. Defaults to '_other'
+
+    Returns:
+        pd.Index: the relabeled values
+    """
+    return relabel_uncommon(
+        values, values.isin(uncommon_values), dropna, uncommon_group_name
+    )
+
+
+def relabel_uncommon(
+    values: pd.Index,
+    is_uncommon: np.ndarray,
+    dropna: bool = False,
+    uncommon_group_name: str = "_other",
+) -> pd.Index:
+    """Changes the values for which is_uncommon is true to
+    uncommon_group_name, and NA values to '_na' if dropna is false
+
+    Args:
+        values (pd.Index): the values to relabel
+        is_uncommon (np.ndarray): per value if it is uncommon
+        dropna (bool, optional): if true, NA values are kept as they are.
+        Defaults to False.
+        uncommon_group_name (str, optional): value to change the uncommon
+        values to. Defaults to '_other'
+
+    Returns:
+        pd.Index: the relabeled values
+    """
+    labels = pd.Index(
+        np.where(is_uncommon, uncommon_group_name, values),
+        name=values.name,
+    )
+
+    # np.where converts NA of numeric values to a string, so restore NA
+    labels = labels.where(~values.isna())
+    return labels if dropna else labels.fillna("_na")
+
+
+def get_uncommon_subvalues(
+    counts: pd.Series,
+    parents: List[pd.Index],
+    values: pd.Index,
+    max_groups: int = None,
+    min_ratio: float = 0,
+    min_count: int = None,
+    dropna: bool = False,
+) -> np.ndarray:
+    """Selects the values which should be changed to an uncommon group name
+    like get_uncommon_values, but compares each value only with the values
+    that have the same parent groups. NA is never selected.
+
+    Args:
+        counts (pd.Series): the counts as returned by get_raw_counts
+
+        parents (List[pd.Index]): per parent level the (relabeled) parent
+        group of each count
+
+        values (pd.Index): the value of each count
+
+        max_groups (int, optional): the maximum amount of different values
+        per parent group that are allowed. Defaults to None.
+
+        min_ratio (float, optional): the minimal ratio a value must have
+        within its parent group. Defaults to 0.
+
+        min_count (int, optional): the minimal count a value must have.
+        Defaults to None, which only selects values with a count of 0.
+
+        dropna (bool, optional): if true, NA is not taken into account.
+        Defaults to False.
+
+    Returns:
+        np.ndarray: per count if its value is uncommon within its parent group
+    """
+    # sum the counts per combination of parent groups and value
+    parent_codes = get_group_codes(parents)
+    pair_codes = get_group_codes([parent_codes, values])
+    pair_counts = np.bincount(pair_codes, weights=counts.to_numpy())
+    first_rows = np.unique(pair_codes, return_index=True)[1]
+    pair_parents = parent_codes[first_rows]
+    pair_values = values[first_rows]
+
+    # sort the values per parent group by count in descending order, with
+    # ties broken by value
+    is_na = pair_values.isna()
+    is_counted = ~is_na if dropna else np.ones(len(is_na), dtype=bool)
+    order = np.lexsort(
+        (pair_values.astype(str), -pair_counts, pair_parents)
     )
+    order = order[is_counted[order]]
+    pairs = pd.DataFrame(
+        {"parent": pair_parents[order], "count": pair_counts[order]},
+        index=order,
+    )
+    by_parent = pairs.groupby("parent", sort=False)["count"]
+    ranks = by_parent.cumcount().to_numpy()
+
+    conditions = (
+        (pairs["count"] / by_parent.transform("sum")).lt(min_ratio)
+        | is_below_min_count(pairs["count"], min_count)
+    ).to_numpy()
+    if max_groups is not None:
+        # make sure max_groups is not affected by NA, by increasing
+        # max_groups by 1 if NA is in the n biggest groups of the parent
+        # group with n = max_groups
+        na_ranks = np.full(len(pair_counts), max_groups)
+        is_na_pair = is_na[order]
+        na_ranks[pair_parents[order][is_na_pair]] = ranks[is_na_pair]
+        limits = max_groups + (na_ranks[pairs["parent"]] < max_groups)
+        conditions |= ranks >= limits
+
+    is_uncommon = np.zeros(len(pair_counts), dtype=bool)
+    is_uncommon[order] = conditions & ~is_na[order]
+    return is_uncommon[pair_codes]
+
+
+def get_group_codes(keys: List[Sequence]) -> np.ndarray:
+    """Gets an integer code per unique combination of the keys, NA included
+
+    Args:
+        keys (List[Sequence]): the keys, all of the same length
+
+    Returns:
+        np.ndarray: the codes, from 0 to the amount of combinations
+    """
+    codes = np.zeros(len(keys[0]), dtype=np.intp)
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(key)
+        codes = codes * (len(key_uniques) + 1) + key_codes + 1
+        codes = pd.factorize(codes)[0]
+    return codes
 
 
 def group_uncommon_subgroups(
@@ -325,8 +1303,9 @@ def group_uncommon_subgroups(
     column: str,
     max_subgroups: int = None,
     min_subgroup_ratio: float = 0,
-    min_subgroup_count: int = 1,
+    min_subgroup_count: int = None,
     min_subgroup_ratio_vs_total: float = 0,
+    approximate: bool = False,
 ):
     """Changes column values of uncommon subgroups of a grouped-by DataFrame
     based on the parameters to '_other'
@@ -345,11 +1324,17 @@ def group_uncommon_subgroups(
         subgroup within a group. Defaults to 0.
 
         min_subgroup_count (int, optional): minimal amount of counts for a
-        subgroup within a group. Defaults to 1.
+        subgroup within a group. Defaults to None, which only changes
+        subgroups with a count of 0.
 
         min_subgroup_ratio_vs_total (float, optional): minimal ratio for a
         subgroup compared to the entire DataFrame. Defaults to 0.
 
+        approximate (bool, optional): if true, the counts are of a
+        SpaceSaving sketch, of which '_other' contains the subgroups that
+        aren't counted, so '_other' doesn't take one of the max_subgroups.
+        Defaults to False.
+
     Returns:
         pd.Series: the pd.Series of the column of the df, with possibly some
         values changed to '_other'
@@ -364,19 +1349,26 @@ def group_uncommon_subgroups(
     # reset the subgroup index column to easier change values
     value_counts_df.reset_index(level=column, inplace=True)
 
+    # the depth of a row is the amount of groupby columns it is not
+    # summarized over, so rows with the depth of all groupby columns contain
+    # the subgroups within the groups and rows with depth 0 the whole column
+    depths = get_summary_depths(value_counts_df.index)
+    max_depth = value_counts_df.index.nlevels
+
     # select allowed subgroups based on max_subgroups
     if max_subgroups:
+        # select the column and count column of the _all group, '_other'
+        # of an approximate count doesn't count as one of the subgroups
+        all_df = value_counts_df.loc[depths == 0, [column, "count"]]
+        excluded = ["_total", "_other"] if approximate else ["_total"]
         subgroups = (
-            value_counts_df.loc[
-                "_all", [column, "count"]
-            ]  # select the column and count column of the _all group
+            all_df[~all_df[column].isin(excluded)]
             .sort_values(
-                by="count", ascending=False
+                by="count", ascending=False, kind="mergesort"
             )  # sort by count, descending
-            .iloc[1 : max_subgroups + 1][column]
+            .head(max_subgroups)[column]
             .values
-        )  # select the top columns, [1:max_subgroups+1] is due to the
-        # _total subgroup
+        )  # select the top columns
 
     # if max_subgroups is not set, all subgroups are allowed based
     # on max_subgroups
@@ -384,25 +1376,23 @@ def group_uncommon_subgroups(
         subgroups = value_counts_df[column].unique()
 
     # set conditions for which the value should not be changed to '_other'
-    min_subgroup_count_condition = (
-        value_counts_df["count"] < min_subgroup_count
+    min_subgroup_count_condition = is_below_min_count(
+        value_counts_df["count"], min_subgroup_count
     ) | (value_counts_df["subgroup_ratio"] < min_subgroup_ratio)
     total_ratio_condition = (
         value_counts_df["r_vs_total"] < min_subgroup_ratio_vs_total
     )
     special_column_condition = ~value_counts_df[column].isin(["_na", "_total"])
     max_subgroup_condition = ~value_counts_df[column].isin(subgroups)
-    not_index_all_condition = (
-        value_counts_df.index.get_level_values(0) != "_all"
-    )
+    not_index_all_condition = depths == max_depth
 
     # change values to'_other' if the conditions following conditions are met:
     # if (the subgroup count OR the witihin group ratio are below thresholds
     # OR the ratio vs total is smaller than the threshold
     # OR the column is not allowed according to the max amount of subgroups)
     # AND if the column is not a special column
-    # AND the column is not in the _all main group
-    value_counts_df[column] = np.where(
+    # AND the column is not in an _all group
+    subgroup_labels = np.where(
         (
             min_subgroup_count_condition
             | total_ratio_condition
@@ -414,17 +1404,123 @@ def group_uncommon_subgroups(
         value_counts_df[column],
     )
 
-    # select all the subgroups names which are in the main groups
-    # because those need to be retained in the _all main group
-    subgroups_in_groups = set(value_counts_df.drop("_all")[column])
+    # the subgroups of the _all groups need to be retained if they are in
+    # the groups they summarize, so convert the subgroups of an _all group
+    # which are not in its groups to _other
+    is_in_groups = np.ones(len(value_counts_df), dtype=bool)
+    for depth in range(max_depth):
+        keys = get_subgroup_keys(value_counts_df.index, subgroup_labels, depth)
+        is_depth = depths == depth
+        is_in_groups[is_depth] = keys[is_depth].isin(
+            keys[not_index_all_condition]
+        )
+    return np.where(is_in_groups, subgroup_labels, "_other")
+
 
-    # convert subgroups which are not in the main groups in the
-    # _all group to _other
-    return np.where(
-        (value_counts_df.index == "_all")
-        & (~value_counts_df[column].isin(subgroups_in_groups)),
-        "_other",
-        value_counts_df[column],
+def collapse_subgroups(
+    index: pd.MultiIndex, subgroups: np.ndarray, counts: np.ndarray
+) -> pd.DataFrame:
+    """Sums the counts of the rows of summary statistics with the same group
+    and subgroup after the uncommon subgroups are changed to '_other' by
+    group_uncommon_subgroups, and gets the ratios of the summed counts
+
+    Args:
+        index (pd.MultiIndex): the groups and subgroups of the summary
+        statistics, before the subgroups are changed
+        subgroups (np.ndarray): the changed subgroup of each row
+        counts (np.ndarray): the count of each row
+
+    Returns:
+        pd.DataFrame: the counts, 'subgroup_ratio' and 'r_vs_total' per group
+        and subgroup, sorted by the index
+    """
+    # the rows are unique, so only the rows that are changed to '_other' get
+    # the same group and subgroup, and the codes of the index can be used
+    # instead of hashing the labels again. The subgroups keep the type that
+    # group_uncommon_subgroups gave them, which may have made them strings
+    subgroup_level = index.levels[-1].to_numpy().astype(subgroups.dtype)
+    other_code = np.flatnonzero(subgroup_level == "_other")
+    if len(other_code):
+        other_code = other_code[0]
+    else:
+        other_code = len(subgroup_level)
+        subgroup_level = np.append(subgroup_level, "_other")
+    subgroup_codes = np.where(
+        subgroups == "_other", other_code, index.codes[-1]
+    )
+
+    # sum the counts per group and subgroup, NA codes are -1 so all codes
+    # are shifted by one
+    levels = [*index.levels[:-1], pd.Index(subgroup_level)]
+    codes, n_codes, steps = combine_codes(
+        [
+            (level_codes.astype(np.intp) + 1, len(level) + 1)
+            for level_codes, level in zip(
+                [*index.codes[:-1], subgroup_codes], levels
+            )
+        ]
+    )
+    summed_counts = np.bincount(codes, weights=counts, minlength=n_codes)
+    counted = np.flatnonzero(np.bincount(codes, minlength=n_codes))
+    summed_counts = summed_counts[counted].astype(counts.dtype)
+    level_codes = [key_codes - 1 for key_codes in split_codes(counted, steps)]
+
+    # the ratio within a group is taken with the count of its '_total' row
+    group_codes = get_group_codes(level_codes[:-1])
+    is_total = level_codes[-1] == np.flatnonzero(subgroup_level == "_total")
+    group_totals = np.zeros(group_codes.max() + 1, dtype=summed_counts.dtype)
+    group_totals[group_codes[is_total]] = summed_counts[is_total]
+
+    return pd.DataFrame(
+        {
+            "count": summed_counts,
+            "subgroup_ratio": summed_counts / group_totals[group_codes],
+            "r_vs_total": summed_counts / summed_counts.max(),
+        },
+        index=pd.MultiIndex(
+            levels=levels, codes=level_codes, names=index.names
+        ).remove_unused_levels(),
+    ).sort_index()
+
+
+def get_summary_depths(index: pd.Index) -> np.ndarray:
+    """Gets per row of summary statistics the amount of groupby columns which
+    are not summarized, which are the levels before the first '_all' group
+
+    Args:
+        index (pd.Index): the groups of the summary statistics, without the
+        subgroups
+
+    Returns:
+        np.ndarray: the depth of each row
+    """
+    depths = np.full(len(index), index.nlevels)
+    for level in reversed(range(index.nlevels)):
+        depths[index.get_level_values(level) == "_all"] = level
+    return depths
+
+
+def get_subgroup_keys(
+    index: pd.Index, subgroups: np.ndarray, depth: int
+) -> pd.Index:
+    """Combines the groups of the first depth groupby columns with the
+    subgroups
+
+    Args:
+        index (pd.Index): the groups of the summary statistics, without the
+        subgroups
+        subgroups (np.ndarray): the subgroups of each row
+        depth (int): the amount of groupby columns to combine
+
+    Returns:
+        pd.Index: the subgroups when depth is 0, else a MultiIndex of the
+        groups and subgroups
+    """
+    if not depth:
+        return pd.Index(subgroups)
+    return pd.MultiIndex.from_arrays(
+        [index.get_level_values(level) for level in range(depth)]
+        + [subgroups]
     )
 
 
@@ -443,8 +1539,26 @@ def add_subgroup_diff_vs_total(
         pd.DataFrame: a modified copy of the inputted pd.DataFrame
     """
     dfc = df.copy()
-    for index, _ in dfc.drop("_all").iterrows():
-        dfc.loc[index, new_col] = (
-            df.loc[index, col] - df.loc[("_all", index[1]), col]
+
+    # align the statistic of each row with the statistic of its subgroup in
+    # the '_all' group of the level above, subgroups without such a row will
+    # result in NaN
+    group_index = df.index.droplevel(-1)
+    depths = get_summary_depths(group_index)
+    parent_levels = [
+        np.where(
+            depths > level + 1,
+            group_index.get_level_values(level).to_numpy(dtype=object),
+            "_all",
         )
+        for level in range(group_index.nlevels)
+    ]
+    parent_index = pd.MultiIndex.from_arrays(
+        parent_levels + [df.index.get_level_values(-1)]
+    )
+    parent_values = df[col].reindex(parent_index)
+    diff = df[col].values - parent_values.values
+
+    # the '_all' group of the whole column itself has no difference
+    dfc[new_col] = np.where(depths == 0, np.nan, diff)
     return dfc
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import uuid
+from typing import Any, List, Optional
+from warnings import warn
+
+import pandas as pd
+
+from .backends import arrow_counts_to_series
+from .df_mutations import GroupbyCol, get_groupby_cols
+from .fingerprint import get_fingerprint
+
+
+class CountCache:
+    def __init__(self, directory: str, max_bytes: int = 1_000_000_000):
+        """Stores the counts of get_raw_counts as parquet files in a
+        directory, so other runs and processes over the same data don't
+        have to count it again. The counts are keyed by the get_fingerprint
+        of the counted columns, and the least recently used files are
+        removed when the files take up more than max_bytes. Requires
+        pyarrow.
+
+        Args:
+            directory (str): the directory to store the counts in, which is
+            created if it doesn't exist
+
+            max_bytes (int, optional): the maximum size of all files in the
+            directory. Defaults to 1_000_000_000.
+
+        Raises:
+            ImportError: if pyarrow is not installed
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "A CountCache requires pyarrow, install it with "
+                "pip install advanced-value-counts[parquet]"
+            ) from e
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get_key(
+        self,
+        df: Any,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        weight_col: str = None,
+        capacity: int = None,
+    ) -> str:
+        """Gets the key of the counts of a DataFrame, which only changes
+        when the values of column, groupby_col or weight_col change, or when
+        they are counted with another capacity
+
+        Args:
+            df (Any): the pd.DataFrame, pyarrow.Table or polars.DataFrame to
+            count
+            column (str): the name of the column where the values to count
+            are in
+            groupby_col (GroupbyCol, optional): the name of the column, or
+            the names of the columns, to group the values by. Defaults to
+            None.
+            weight_col (str, optional): the name of the column with the
+            weight of each row. Defaults to None.
+            capacity (int, optional): the capacity of the approximate
+            counts. Defaults to None, for exact counts.
+
+        Returns:
+            str: the key
+        """
+        groupby_cols = get_groupby_cols(groupby_col)
+        names = [*groupby_cols, column]
+        if weight_col is not None:
+            names.append(weight_col)
+
+        # the role of each column is part of the key as well, as the same
+        # columns can be counted in different ways
+        key = (
+            groupby_cols,
+            column,
+            weight_col,
+            capacity,
+            get_fingerprint(df, names),
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[pd.Series]:
+        """Reads the counts of a key and marks them as recently used
+
+        Args:
+            key (str): the key of get_key
+
+        Returns:
+            Optional[pd.Series]: the counts, like get_raw_counts, or None if
+            they aren't stored
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self._get_path(key)
+        try:
+            os.utime(path)
+            table = pq.read_table(path, memory_map=True)
+        except (OSError, pa.ArrowInvalid):
+            # the file may be removed by another process in the meantime
+            return None
+        names = json.loads(table.schema.metadata[b"names"])
+        levels = [f"level_{i}" for i in range(len(names))]
+        return arrow_counts_to_series(table, levels).rename_axis(names)
+
+    def put(self, key: str, counts: pd.Series):
+        """Stores the counts of a key, and removes the least recently used
+        counts if the directory gets too large
+
+        Args:
+            key (str): the key of get_key
+            counts (pd.Series): the counts of get_raw_counts
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # the levels get positional names, so they can't clash with 'count'
+        names = list(counts.index.names)
+        levels = [f"level_{i}" for i in range(len(names))]
+        try:
+            table = pa.Table.from_pandas(
+                counts.rename("count").rename_axis(levels).reset_index(),
+                preserve_index=False,
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            warn("The counts have mixed types, so they aren't cached")
+            return
+        table = table.replace_schema_metadata(
+            {"names": json.dumps(names)}
+        )
+
+        # write to a temporary file first, so other processes never read a
+        # partly written file
+        path = self._get_path(key)
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, temporary_path)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used counts until all files take up at
+        most max_bytes"""
+        files = []
+        for path in self._get_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+
+    def clear(self):
+        """Removes all stored counts"""
+        for path in self._get_paths():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def _get_paths(self) -> List[str]:
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".parquet")
+        ]
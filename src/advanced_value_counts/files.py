@@ -0,0 +1,245 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .df_mutations import (
+    GroupbyCol,
+    get_groupby_cols,
+    get_raw_counts,
+    merge_raw_counts,
+)
+
+FILE_FORMATS = ("parquet", "feather")
+
+
+def get_raw_counts_from_files(
+    path: str,
+    column: str,
+    groupby_col: GroupbyCol = None,
+    file_format: str = "parquet",
+    batch_size: int = 1_000_000,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts the values of a parquet or feather file, or of a directory of
+    them, one row group or record batch at a time. The files are memory
+    mapped and only column and groupby_col are read, so the data never has
+    to fit in memory. Requires pyarrow.
+
+    Args:
+        path (str): the path of the file or directory
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, to group the values by. Defaults to None.
+
+        file_format (str, optional): 'parquet' or 'feather'. Defaults to
+        'parquet'.
+
+        batch_size (int, optional): the maximum amount of rows to read of a
+        parquet row group at once. Defaults to 1_000_000.
+
+        weight_col (str, optional): the name of the column with the weight
+        of each row. Defaults to None.
+
+    Raises:
+        ValueError: if file_format is unknown or there are no rows
+
+    Returns:
+        pd.Series: the counts of all files, like get_raw_counts
+    """
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError(
+            "Reading parquet or feather files requires pyarrow, install it "
+            "with pip install advanced-value-counts[parquet]"
+        ) from e
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}")
+
+    names = [*get_groupby_cols(groupby_col), column]
+    iter_counts = {
+        "parquet": iter_parquet_counts,
+        "feather": iter_feather_counts,
+    }[file_format]
+    counts = None
+    for file in ds.dataset(path, format=file_format).files:
+        for chunk_counts in iter_counts(file, names, batch_size, weight_col):
+            counts = (
+                chunk_counts
+                if counts is None
+                else merge_raw_counts([counts, chunk_counts])
+            )
+    if counts is None:
+        raise ValueError("No rows to count the values of")
+    return counts
+
+
+def iter_parquet_counts(
+    path: str,
+    names: List[str],
+    batch_size: int = 1_000_000,
+    weight_col: str = None,
+) -> Iterator[pd.Series]:
+    """Counts the values of a memory mapped parquet file per row group.
+    String columns are read dictionary encoded, so they are grouped by their
+    indices instead of their strings, and a row group with a single value
+    per column is counted from its statistics without reading it.
+
+    Args:
+        path (str): the path of the parquet file
+        names (List[str]): the names of the groupby columns and the column
+        to count, in that order
+        batch_size (int, optional): the maximum amount of rows to read at
+        once. Defaults to 1_000_000.
+        weight_col (str, optional): the name of the column with the weight
+        of each row, which makes the statistics unusable. Defaults to None.
+
+    Yields:
+        Iterator[pd.Series]: the counts of each row group, like
+        get_raw_counts
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path, memory_map=True)
+    file = pq.ParquetFile(
+        path,
+        memory_map=True,
+        read_dictionary=[
+            name
+            for name in names
+            if pa.types.is_string(schema.field(name).type)
+            or pa.types.is_large_string(schema.field(name).type)
+        ],
+    )
+    column_indices = {
+        file.metadata.schema.column(i).path: i
+        for i in range(file.metadata.num_columns)
+    }
+    for i in range(file.num_row_groups):
+        row_group = file.metadata.row_group(i)
+        if not row_group.num_rows:
+            continue
+
+        values = None
+        if weight_col is None:
+            values = get_single_values(
+                row_group, names, column_indices, schema
+            )
+        if values is not None:
+            index = pd.MultiIndex.from_tuples([tuple(values)], names=names)
+            yield pd.Series(
+                [row_group.num_rows],
+                index=index if len(names) > 1 else index.get_level_values(0),
+            )
+            continue
+
+        for batch in file.iter_batches(
+            batch_size=batch_size,
+            row_groups=[i],
+            columns=[*names, weight_col] if weight_col else names,
+        ):
+            yield get_raw_counts(
+                pa.Table.from_batches([batch]),
+                names[-1],
+                names[:-1],
+                weight_col,
+            )
+
+
+def get_single_values(
+    row_group: Any,
+    names: List[str],
+    column_indices: Dict[str, int],
+    schema: Any,
+) -> Optional[list]:
+    """Gets the value of each column of a parquet row group from its
+    statistics, if each column has a single value and no nulls. Only string,
+    integer and boolean columns are used, as the statistics of other types
+    may leave out NaN or differ in type from the values.
+
+    Args:
+        row_group (Any): the pyarrow.parquet.RowGroupMetaData
+        names (List[str]): the names of the columns
+        column_indices (Dict[str, int]): the index in the row group of each
+        column
+        schema (Any): the pyarrow.Schema of the file
+
+    Returns:
+        Optional[list]: the value of each column, or None if a column has
+        more than one value or its statistics can't be used
+    """
+    import pyarrow as pa
+
+    values = []
+    for name in names:
+        arrow_type = schema.field(name).type
+        statistics = row_group.column(column_indices[name]).statistics
+        if (
+            not (
+                pa.types.is_string(arrow_type)
+                or pa.types.is_large_string(arrow_type)
+                or pa.types.is_integer(arrow_type)
+                or pa.types.is_boolean(arrow_type)
+            )
+            or statistics is None
+            or not statistics.has_min_max
+            or not statistics.has_null_count
+            or statistics.null_count
+            or statistics.min != statistics.max
+        ):
+            return None
+        values.append(statistics.min)
+    return values
+
+
+def iter_feather_counts(
+    path: str,
+    names: List[str],
+    batch_size: int = None,
+    weight_col: str = None,
+) -> Iterator[pd.Series]:
+    """Counts the values of a memory mapped feather file per record batch,
+    reading only the columns to count. Dictionary encoded columns, e.g.
+    written from a pd.Categorical, are grouped by their indices instead of
+    their values.
+
+    Args:
+        path (str): the path of the feather file
+        names (List[str]): the names of the groupby columns and the column
+        to count, in that order
+        batch_size (int, optional): unused, the record batches are counted
+        as written. Defaults to None.
+        weight_col (str, optional): the name of the column with the weight
+        of each row. Defaults to None.
+
+    Yields:
+        Iterator[pd.Series]: the counts of each record batch, like
+        get_raw_counts
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        # only the fields to count are read, so the other columns of a
+        # compressed file are not decompressed
+        schema = pa.ipc.open_file(source).schema
+        fields = [*names, weight_col] if weight_col else names
+        reader = pa.ipc.open_file(
+            source,
+            options=pa.ipc.IpcReadOptions(
+                included_fields=[
+                    schema.get_field_index(name) for name in fields
+                ]
+            ),
+        )
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if batch.num_rows:
+                yield get_raw_counts(
+                    pa.Table.from_batches([batch]),
+                    names[-1],
+                    names[:-1],
+                    weight_col,
+                )
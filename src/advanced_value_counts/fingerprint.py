@@ -0,0 +1,123 @@
+import hashlib
+import struct
+from typing import Any, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from .backends import get_backend
+
+
+def get_fingerprint(df: Any, names: List[str]) -> str:
+    """Hashes the names, types and values of columns of a DataFrame, to
+    tell whether they changed since an earlier run. The buffers the values
+    are stored in are hashed as they are, without converting the values to
+    Python objects: numpy arrays, the codes and categories of categoricals,
+    and the buffers of Arrow arrays. Only columns of Python objects are
+    hashed through pd.util.hash_pandas_object, together with the type of
+    each object.
+
+    Equal fingerprints mean equal values, but equal values can have
+    different fingerprints, e.g. a sliced Arrow array and its copy, or 0.0
+    and -0.0.
+
+    Args:
+        df (Any): a pd.DataFrame, pyarrow.Table or polars.DataFrame
+        names (List[str]): the names of the columns to hash
+
+    Returns:
+        str: the hexadecimal fingerprint
+    """
+    backend = get_backend(df)
+    fingerprint = hashlib.sha256()
+    update_fingerprint(fingerprint, repr((names, len(df))).encode())
+    for name in names:
+        if backend == "pandas":
+            buffers = iter_pandas_buffers(df[name])
+        elif backend == "polars":
+            buffers = iter_arrow_buffers(df[name].to_arrow())
+        else:
+            buffers = iter_arrow_buffers(df.column(name))
+        for buffer in buffers:
+            update_fingerprint(fingerprint, buffer)
+    return fingerprint.hexdigest()
+
+
+def update_fingerprint(fingerprint: Any, buffer: Any):
+    """Adds a buffer and its size to a hash, so the boundaries between the
+    buffers are part of the fingerprint
+
+    Args:
+        fingerprint (Any): the hashlib hash
+        buffer (Any): an object that supports the buffer protocol
+    """
+    buffer = memoryview(buffer)
+    fingerprint.update(struct.pack("<q", buffer.nbytes))
+    fingerprint.update(buffer)
+
+
+def iter_pandas_buffers(values: pd.Series) -> Iterator[Any]:
+    """Gets the buffers of the values of a pd.Series, without copying them
+    where possible
+
+    Args:
+        values (pd.Series): the values
+
+    Yields:
+        Iterator[Any]: the dtype, followed by the buffers of the values
+    """
+    yield str(values.dtype).encode()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        yield from iter_numpy_buffers(values.cat.codes.to_numpy())
+        yield from iter_pandas_buffers(values.cat.categories.to_series())
+    elif isinstance(values.dtype, np.dtype) and values.dtype != object:
+        yield from iter_numpy_buffers(values.to_numpy())
+    elif hasattr(values.array, "__arrow_array__"):
+        # Arrow backed arrays are used as they are, and the data of masked
+        # arrays (e.g. Int64) only gets a validity bitmap
+        yield from iter_arrow_buffers(values.array.__arrow_array__())
+    else:
+        # objects that are not strings are hashed through their str, so the
+        # type of each object is hashed as well, e.g. to tell 1.5 and '1.5'
+        # apart
+        yield pd.api.types.infer_dtype(values, skipna=False).encode()
+        yield pd.util.hash_pandas_object(values, index=False).to_numpy()
+        types = values.map(type).astype(str)
+        yield pd.util.hash_pandas_object(types, index=False).to_numpy()
+
+
+def iter_numpy_buffers(values: np.ndarray) -> Iterator[np.ndarray]:
+    """Gets the bytes of a numpy array of a fixed size dtype
+
+    Args:
+        values (np.ndarray): the values
+
+    Yields:
+        Iterator[np.ndarray]: the bytes of the values as a uint8 array
+    """
+    yield np.ascontiguousarray(values).view(np.uint8)
+
+
+def iter_arrow_buffers(values: Any) -> Iterator[Any]:
+    """Gets the buffers of an Arrow array, without copying them. As the
+    buffers of a sliced array are those of the whole array, the offset is
+    part of the fingerprint too.
+
+    Args:
+        values (Any): a pyarrow.Array or pyarrow.ChunkedArray
+
+    Yields:
+        Iterator[Any]: the type of each chunk, followed by its buffers
+    """
+    import pyarrow as pa
+
+    chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+    for chunk in chunks:
+        yield repr((str(chunk.type), chunk.offset, len(chunk))).encode()
+        if pa.types.is_dictionary(chunk.type):
+            yield from iter_arrow_buffers(chunk.indices)
+            yield from iter_arrow_buffers(chunk.dictionary)
+            continue
+        for buffer in chunk.buffers():
+            # a missing validity bitmap means there are no nulls
+            yield b"" if buffer is None else buffer
@@ -0,0 +1,232 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .df_mutations import (
+    GroupbyCol,
+    count_codes,
+    factorize_values,
+    get_groupby_cols,
+    get_raw_counts,
+    get_weights,
+    merge_raw_counts,
+)
+
+# (name of the shared memory block, shape, dtype) of a shared array
+SharedArray = Tuple[str, Tuple[int], str]
+
+
+def get_n_jobs(n_jobs: int = None) -> int:
+    """Gets the amount of processes to use, -1 meaning all CPUs
+
+    Args:
+        n_jobs (int, optional): the amount of processes. Defaults to None,
+        which means 1.
+
+    Raises:
+        ValueError: if n_jobs is 0 or below -1
+
+    Returns:
+        int: the amount of processes
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive number or -1")
+    return n_jobs
+
+
+def get_raw_counts_parallel(
+    df: pd.DataFrame,
+    column: str,
+    groupby_col: GroupbyCol = None,
+    n_jobs: int = -1,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts the values like get_raw_counts, but splits the rows into
+    partitions which are counted in a pool of processes. The columns are
+    shared with the processes through shared memory instead of pickling
+    them: numeric columns as they are, which each process factorizes for
+    its own partition, and other columns as their codes, which the
+    processes count as they are. Those codes are factorized once in the
+    current process, so n_jobs doesn't speed up hashing the values of
+    string and object columns, only counting them.
+
+    Args:
+        df (pd.DataFrame): the DataFrame to count the values of
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column to group
+        the values by, or a list of names. Defaults to None.
+
+        n_jobs (int, optional): the amount of processes, -1 meaning all CPUs.
+        Defaults to -1.
+
+        weight_col (str, optional): the name of the column with the weight
+        of each row, which is shared as it is. Defaults to None.
+
+    Returns:
+        pd.Series: the counts, like get_raw_counts
+    """
+    n_jobs = get_n_jobs(n_jobs)
+    if n_jobs == 1:
+        return get_raw_counts(df, column, groupby_col, weight_col)
+
+    names = [*get_groupby_cols(groupby_col), column]
+    arrays, decoders = zip(*(get_shareable_array(df[name]) for name in names))
+    n_codes = [
+        None if decoder is None else len(decoder) for decoder in decoders
+    ]
+    if weight_col is not None:
+        arrays += (get_weights(df, weight_col),)
+
+    blocks = []
+    try:
+        shared_arrays = []
+        for array in arrays:
+            block, shared_array = share_array(array)
+            blocks.append(block)
+            shared_arrays.append(shared_array)
+
+        # split the rows into one partition per process
+        bounds = np.linspace(0, len(df), n_jobs + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            partial_counts = list(
+                executor.map(
+                    count_shared_partition,
+                    [shared_arrays] * n_jobs,
+                    [names] * n_jobs,
+                    [n_codes] * n_jobs,
+                    bounds[:-1],
+                    bounds[1:],
+                    [weight_col] * n_jobs,
+                )
+            )
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    counts = merge_raw_counts(partial_counts)
+    return decode_counts(counts, decoders)
+
+
+def get_shareable_array(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Converts values to a numpy array which can be put in shared memory
+
+    Args:
+        values (pd.Series): the values of a column
+
+    Returns:
+        Tuple[np.ndarray, pd.Index]: the numeric values of a numpy dtype and
+        None, or the codes of the values, from 0, and the unique values the
+        codes refer to
+    """
+    # masked extension dtypes like Int64 are numeric as well, but their
+    # to_numpy is an array of Python objects, so they are factorized
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "iufb":
+        return values.to_numpy(), None
+
+    # the codes are shared in the smallest integer dtype that fits them
+    codes, uniques = factorize_values(values)
+    return codes.astype(np.min_scalar_type(-max(len(uniques), 1))), uniques
+
+
+def share_array(array: np.ndarray) -> Tuple[SharedMemory, SharedArray]:
+    """Copies an array to a new block of shared memory
+
+    Args:
+        array (np.ndarray): the array to share
+
+    Returns:
+        Tuple[SharedMemory, SharedArray]: the block of shared memory, which
+        must be closed and unlinked after use, and the description of the
+        shared array to attach to it from another process
+    """
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def count_shared_partition(
+    shared_arrays: List[SharedArray],
+    names: List[str],
+    n_codes: List[Optional[int]],
+    start: int,
+    stop: int,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts the rows start to stop of shared arrays, runs in a process of
+    the pool. The codes of get_shareable_array are counted as they are, and
+    numeric values are factorized first.
+
+    Args:
+        shared_arrays (List[SharedArray]): the shared arrays of the groupby
+        columns (if any) and column, followed by the weights if weight_col
+        is given
+        names (List[str]): the names of the columns
+        n_codes (List[Optional[int]]): per column the amount of codes, or
+        None if the column contains the values themselves
+        start (int): the first row of the partition
+        stop (int): the row after the last row of the partition
+        weight_col (str, optional): the name of the column with the weights.
+        Defaults to None.
+
+    Returns:
+        pd.Series: the counts of the partition, like get_raw_counts, but
+        indexed by the codes of the columns with codes
+    """
+    blocks = [SharedMemory(name=name) for name, _, _ in shared_arrays]
+    try:
+        arrays = [
+            np.ndarray(shape, dtype=dtype, buffer=block.buf)[start:stop]
+            for block, (_, shape, dtype) in zip(blocks, shared_arrays)
+        ]
+        keys = []
+        for name, array, n_name_codes in zip(names, arrays, n_codes):
+            if n_name_codes is None:
+                keys.append(factorize_values(pd.Series(array, name=name)))
+            else:
+                # the codes index the counts, until they are decoded
+                uniques = pd.RangeIndex(n_name_codes, name=name)
+                keys.append((array.astype(np.intp), uniques))
+        weights = arrays[-1] if weight_col is not None else None
+        counts = count_codes(keys[-1], *keys[:-1], weights=weights)
+
+        # the arrays refer to the shared memory, so they must be deleted
+        # before the shared memory can be closed
+        del arrays, weights
+        return counts
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def decode_counts(counts: pd.Series, decoders: List[pd.Index]) -> pd.Series:
+    """Replaces the codes in the index of counts by the values they refer to
+
+    Args:
+        counts (pd.Series): the counts of the shared arrays
+        decoders (List[pd.Index]): per level the unique values the codes
+        refer to, or None if the level contains the values themselves
+
+    Returns:
+        pd.Series: the counts indexed by the values
+    """
+    levels = []
+    for level, decoder in enumerate(decoders):
+        values = counts.index.get_level_values(level)
+        if decoder is not None:
+            values = decoder.take(values)
+        levels.append(values.rename(counts.index.names[level]))
+
+    index = pd.MultiIndex.from_arrays(levels) if len(levels) > 1 else levels[0]
+    return pd.Series(counts.to_numpy(), index=index)
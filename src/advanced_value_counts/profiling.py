@@ -0,0 +1,110 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List
+
+import pandas as pd
+
+
+class Stage:
+    """The measurements of one stage of getting an avc_df"""
+
+    __slots__ = ("name", "seconds", "rows_in", "rows_out", "memory_delta")
+
+    def __init__(self, name: str, rows_in: int = None):
+        self.name = name
+        self.seconds = None
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.memory_delta = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# the stage that is yielded when profiling is disabled, so the stages can set
+# their output rows without checking whether they are profiled
+DISABLED_STAGE = Stage("disabled")
+
+
+class StageProfiler:
+    def __init__(
+        self,
+        callback: Callable[[Stage], Any] = None,
+        trace_memory: bool = True,
+    ):
+        """Records the wall time, the amount of rows in and out, and the
+        change in allocated memory of each stage of getting an avc_df
+
+        Args:
+            callback (Callable[[Stage], Any], optional): a function that is
+            called with each measured stage. Defaults to None.
+
+            trace_memory (bool, optional): if true, the memory is traced with
+            tracemalloc, which slows the stages down. Defaults to True.
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.stages: List[Stage] = []
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None) -> Iterator[Stage]:
+        """Measures the code in the with block as a stage, the block can set
+        rows_out of the yielded Stage
+
+        Args:
+            name (str): the name of the stage
+            rows_in (int, optional): the amount of rows the stage starts
+            with. Defaults to None.
+
+        Yields:
+            Iterator[Stage]: the measurements of the stage
+        """
+        stage = Stage(name, rows_in)
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                memory = tracemalloc.get_traced_memory()[0] - memory
+                stage.memory_delta = memory
+            if started_tracing:
+                tracemalloc.stop()
+            self.stages.append(stage)
+            if self.callback is not None:
+                self.callback(stage)
+
+    @property
+    def report(self) -> pd.DataFrame:
+        """Gets the measurements of the stages, one row per stage"""
+        return pd.DataFrame(
+            [stage.to_dict() for stage in self.stages],
+            columns=list(Stage.__slots__),
+        ).set_index("name")
+
+
+def profile_stage(
+    profiler: StageProfiler, name: str, rows_in: int = None
+) -> ContextManager[Stage]:
+    """Measures a stage with the profiler, or does nothing if profiler is
+    None
+
+    Args:
+        profiler (StageProfiler): the profiler, or None if profiling is
+        disabled
+        name (str): the name of the stage
+        rows_in (int, optional): the amount of rows the stage starts with.
+        Defaults to None.
+
+    Returns:
+        ContextManager[Stage]: the context manager to run the stage in
+    """
+    if profiler is None:
+        return nullcontext(DISABLED_STAGE)
+    return profiler.stage(name, rows_in)
@@ -0,0 +1,341 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .df_mutations import (
+    GroupbyCol,
+    get_groupby_cols,
+    get_raw_counts,
+    merge_raw_counts,
+)
+
+
+class SpaceSaving:
+    def __init__(
+        self,
+        capacity: int,
+        column: str,
+        groupby_col: GroupbyCol = None,
+        weight_col: str = None,
+    ):
+        """A Space-Saving sketch of the most common values of column, per
+        group of the groupby columns if given. At most capacity values (or
+        combinations of groups and values) are counted, so the memory is
+        bounded regardless of the amount of distinct values.
+
+        The counts of the counted values are estimates that are never lower
+        than the true counts, and at most total / capacity higher, with total
+        the amount of counted rows. Every value with a true count above
+        total / capacity is guaranteed to be counted. The counts of the groups
+        themselves are exact.
+
+        Args:
+            capacity (int): the maximum amount of values to count
+
+            column (str): the name of the column where the values to count are
+            in.
+
+            groupby_col (GroupbyCol, optional): the name of the column, or
+            the names of the columns, to group the values by. Defaults to
+            None.
+
+            weight_col (str, optional): the name of a column with the
+            integer weight of each row, which are summed instead of counting
+            the rows. Defaults to None.
+
+        Raises:
+            ValueError: if capacity is not a positive number
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be a positive number")
+        self.capacity = capacity
+        self.column = column
+        self.groupby_col = groupby_col
+        self.weight_col = weight_col
+        self.total = 0
+        self.counts: Optional[pd.Series] = None
+        self.errors: Optional[pd.Series] = None
+        self.group_counts: Optional[pd.Series] = None
+
+    @property
+    def min_count(self) -> int:
+        """The upper bound of the count of a value that is not counted"""
+        if self.counts is None or len(self.counts) < self.capacity:
+            return 0
+        return int(self.counts.min())
+
+    @property
+    def error_bound(self) -> float:
+        """The maximum amount the count of a counted value can be higher than
+        its true count"""
+        return self.total / self.capacity
+
+    def update(self, df: pd.DataFrame) -> "SpaceSaving":
+        """Counts the values of (a chunk of) a DataFrame. The chunk is counted
+        exactly, after which only the capacity most common values are kept.
+
+        Args:
+            df (pd.DataFrame): the chunk to count the values of
+
+        Raises:
+            TypeError: if the weights are not integers
+
+        Returns:
+            SpaceSaving: the sketch itself
+        """
+        return self.update_counts(
+            get_raw_counts(df, self.column, self.groupby_col, self.weight_col)
+        )
+
+    def update_counts(self, counts: pd.Series) -> "SpaceSaving":
+        """Adds the exact counts of (a chunk of) a DataFrame, e.g. counted in
+        another thread or process, after which only the capacity most common
+        values are kept.
+
+        Args:
+            counts (pd.Series): the counts of get_raw_counts of the chunk
+
+        Raises:
+            TypeError: if the counts are not integers
+
+        Returns:
+            SpaceSaving: the sketch itself
+        """
+        if counts.dtype.kind == "f":
+            raise TypeError("The weights of a sketch must be integers")
+        self._merge(counts, pd.Series(0, index=counts.index), 0)
+        if get_groupby_cols(self.groupby_col):
+            group_counts = counts.groupby(
+                level=list(range(counts.index.nlevels - 1)),
+                dropna=False,
+                sort=False,
+            ).sum()
+            self.group_counts = (
+                group_counts
+                if self.group_counts is None
+                else merge_raw_counts([self.group_counts, group_counts])
+            )
+        self.total += int(counts.sum())
+        return self
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Adds the counts of another sketch of the same columns, e.g. of
+        another part of the data. The error bound of the merged sketch is
+        the total of both sketches divided by the capacity.
+
+        Args:
+            other (SpaceSaving): the sketch to merge with
+
+        Raises:
+            ValueError: if the sketches are of different columns or have a
+            different capacity
+
+        Returns:
+            SpaceSaving: a new sketch with the counts of both sketches
+        """
+        settings = (
+            self.capacity,
+            self.column,
+            get_groupby_cols(self.groupby_col),
+            self.weight_col,
+        )
+        if settings != (
+            other.capacity,
+            other.column,
+            get_groupby_cols(other.groupby_col),
+            other.weight_col,
+        ):
+            raise ValueError(
+                "Can't merge sketches of different columns or capacities"
+            )
+        merged = SpaceSaving(
+            self.capacity, self.column, self.groupby_col, self.weight_col
+        )
+        for sketch in (self, other):
+            if sketch.counts is not None:
+                merged._merge(sketch.counts, sketch.errors, sketch.min_count)
+        merged.total = self.total + other.total
+        group_counts = [
+            sketch.group_counts
+            for sketch in (self, other)
+            if sketch.group_counts is not None
+        ]
+        if group_counts:
+            merged.group_counts = merge_raw_counts(group_counts)
+        return merged
+
+    def __add__(self, other: "SpaceSaving") -> "SpaceSaving":
+        return self.merge(other)
+
+    def _merge(self, counts: pd.Series, errors: pd.Series, min_count: int):
+        """Adds counts to the sketch, and keeps the capacity values with the
+        highest counts. A value that is missing from one of both gets the
+        minimum count of the other as count and error, which is the upper
+        bound of its true count.
+
+        Args:
+            counts (pd.Series): the (estimated) counts to add
+            errors (pd.Series): the maximum error of each count
+            min_count (int): the upper bound of the count of a value that is
+            not in counts
+        """
+        if self.counts is None:
+            merged = pd.DataFrame({"count": counts, "error": errors})
+        else:
+            own_min_count = self.min_count
+            frame = pd.concat(
+                [
+                    pd.DataFrame(
+                        {
+                            "count": self.counts,
+                            "error": self.errors,
+                            "in_own": 1,
+                            "in_other": 0,
+                        }
+                    ),
+                    pd.DataFrame(
+                        {
+                            "count": counts,
+                            "error": errors,
+                            "in_own": 0,
+                            "in_other": 1,
+                        }
+                    ),
+                ]
+            )
+            merged = frame.groupby(
+                level=list(range(frame.index.nlevels)),
+                dropna=False,
+                sort=False,
+            ).sum()
+            missing = (1 - merged["in_own"]) * own_min_count + (
+                1 - merged["in_other"]
+            ) * min_count
+            merged = merged[["count", "error"]].add(missing, axis=0)
+
+        merged = merged.sort_values(
+            "count", ascending=False, kind="mergesort"
+        ).head(self.capacity)
+        self.counts = merged["count"].astype(np.int64)
+        self.errors = merged["error"].astype(np.int64)
+
+    def get_counts(self) -> pd.Series:
+        """Gets the counts in the format of get_raw_counts, with the rows of
+        the values that are not counted under the value '_other' of each
+        group
+
+        Raises:
+            ValueError: if nothing has been counted
+
+        Returns:
+            pd.Series: the estimated counts
+        """
+        if self.counts is None:
+            raise ValueError("No chunks to count the values of")
+
+        if get_groupby_cols(self.groupby_col):
+            group_levels = list(range(self.counts.index.nlevels - 1))
+            counted = self.counts.groupby(
+                level=group_levels, dropna=False, sort=False
+            ).sum()
+            remaining = merge_raw_counts([self.group_counts, -counted])
+            remaining.index = pd.MultiIndex.from_arrays(
+                [
+                    *(
+                        remaining.index.get_level_values(level)
+                        for level in group_levels
+                    ),
+                    ["_other"] * len(remaining),
+                ]
+            )
+        else:
+            remaining = pd.Series(
+                [self.total - self.counts.sum()], index=["_other"]
+            )
+
+        # the counts are overestimated, so the remaining count is clipped
+        remaining = remaining[remaining > 0].astype(np.int64)
+        counts = merge_raw_counts([self.counts, remaining])
+        counts.index.names = self.counts.index.names
+        return counts
+
+
+def get_approx_counts_from_chunks(
+    chunks: Iterable[pd.DataFrame],
+    column: str,
+    groupby_col: GroupbyCol = None,
+    capacity: int = 1_000,
+    weight_col: str = None,
+) -> pd.Series:
+    """Counts the most common values of DataFrames chunk by chunk with a
+    SpaceSaving sketch, so the memory is bounded by the size of a chunk and
+    the capacity instead of the amount of distinct values
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): the chunks of the data
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, to group the values by. Defaults to None.
+
+        capacity (int, optional): the maximum amount of values to count.
+        Defaults to 1_000.
+
+        weight_col (str, optional): the name of the column with the integer
+        weight of each row. Defaults to None.
+
+    Returns:
+        pd.Series: the estimated counts, like get_raw_counts but with the
+        rows of the values that are not counted under the value '_other'
+    """
+    sketch = SpaceSaving(capacity, column, groupby_col, weight_col)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch.get_counts()
+
+
+def get_approx_counts(
+    df: pd.DataFrame,
+    column: str,
+    groupby_col: GroupbyCol = None,
+    capacity: int = 1_000,
+    weight_col: str = None,
+    chunk_size: int = 100_000,
+) -> pd.Series:
+    """Counts the most common values of a DataFrame with a SpaceSaving
+    sketch, like get_approx_counts_from_chunks, with slices of chunk_size
+    rows as chunks. Only the counts of a slice are exact, so the memory of
+    the counts is bounded by chunk_size and capacity instead of the amount
+    of distinct values.
+
+    Args:
+        df (pd.DataFrame): the DataFrame to count the values of, or a
+        pyarrow.Table or polars.DataFrame
+
+        column (str): the name of the column where the values to count are in
+
+        groupby_col (GroupbyCol, optional): the name of the column, or the
+        names of the columns, to group the values by. Defaults to None.
+
+        capacity (int, optional): the maximum amount of values to count.
+        Defaults to 1_000.
+
+        weight_col (str, optional): the name of the column with the integer
+        weight of each row. Defaults to None.
+
+        chunk_size (int, optional): the amount of rows to count exactly at
+        once. Defaults to 100_000.
+
+    Returns:
+        pd.Series: the estimated counts, like get_approx_counts_from_chunks
+    """
+    # an empty DataFrame is a single empty chunk
+    chunks = (
+        df[start : start + chunk_size]
+        for start in range(0, max(len(df), 1), chunk_size)
+    )
+    return get_approx_counts_from_chunks(
+        chunks, column, groupby_col, capacity, weight_col
+    )
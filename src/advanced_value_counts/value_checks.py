@@ -75,11 +75,41 @@ def check_if_ratio(value: Any):
         raise ValueError("Value cannot be < 0 or > 1.")
 
 
+def reset_cache(obj: Any, name: str):
+    """Resets the cached results of an object after one of its settings
+    has been (re)assigned, if the object caches its results
+
+    Args:
+        obj (Any): the object of which a setting was assigned
+        name (str): the name of the setting
+    """
+    reset = getattr(obj, "_reset_cache", None)
+    if reset is not None:
+        reset(name)
+
+
+class Setting:
+    """Descriptor for settings which have no restrictions on their value,
+    but which do invalidate cached results when (re)assigned"""
+
+    def __set_name__(self, owner, name):
+        self.public_name = name
+        self.private_name = "_" + name  # e.g. "_number"
+
+    def __get__(self, obj, objtype=None):
+        return getattr(obj, self.private_name)
+
+    def __set__(self, obj, value):
+        setattr(obj, self.private_name, value)
+        reset_cache(obj, self.public_name)
+
+
 class PositiveNumber:
     """Source: https://stackoverflow.com/questions/69570761/check-a-type-
     attribute-with-a-descriptor-and-a-decorator-get-takes-2-po"""
 
     def __set_name__(self, owner, name):
+        self.public_name = name
         self.private_name = "_" + name  # e.g. "_number"
 
     def __get__(self, obj, objtype=None):
@@ -89,10 +119,12 @@ class PositiveNumber:
         not_below_zero(value)
         not_inf(value)
         setattr(obj, self.private_name, value)
+        reset_cache(obj, self.public_name)
 
 
 class PositiveNumberOrNone:
     def __set_name__(self, owner, name):
+        self.public_name = name
         self.private_name = "_" + name  # e.g. "_number"
 
     def __get__(self, obj, objtype=None):
@@ -104,10 +136,12 @@ class PositiveNumberOrNone:
         if value is not None:
             not_below_zero(value)
         setattr(obj, self.private_name, value)
+        reset_cache(obj, self.public_name)
 
 
 class Ratio:
     def __set_name__(self, owner, name):
+        self.public_name = name
         self.private_name = "_" + name  # e.g. "_number"
 
     def __get__(self, obj, objtype=None):
@@ -116,6 +150,19 @@ class Ratio:
     def __set__(self, obj, value):
         check_if_ratio(value)
         setattr(obj, self.private_name, value)
+        reset_cache(obj, self.public_name)
+
+
+def setting_dec(*attributes):
+    """Makes sure (re)assigning attributes invalidates cached results"""
+
+    def decorator(cls):
+        attribute_dict = dict()
+        for attr in attributes:
+            attribute_dict[attr] = Setting()
+        return type(cls.__name__, (cls,), attribute_dict)
+
+    return decorator
 
 
 def positive_number_dec(*attributes):
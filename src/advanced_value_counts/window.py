@@ -0,0 +1,240 @@
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .avc import AdvancedValueCounts
+from .df_mutations import (
+    GroupbyCol,
+    drop_empty_counts,
+    get_raw_counts,
+    merge_raw_counts,
+    round_empty_counts,
+)
+
+# the start of a bucket and the raw counts of its rows
+Bucket = Tuple[pd.Timestamp, pd.Series]
+
+# NA can't be looked up reliably in a pd.MultiIndex, so it is replaced by
+# this object, which can't occur in the data
+NA_KEY = object()
+
+
+class WindowedValueCounts:
+    def __init__(
+        self,
+        column: str,
+        timestamp_col: str,
+        window: Union[str, pd.Timedelta],
+        step: Union[str, pd.Timedelta],
+        groupby_col: GroupbyCol = None,
+        **kwargs,
+    ):
+        """Keeps the value counts of the rows of the last window of time,
+        e.g. of an event stream. The rows are counted per bucket of step
+        time, and the counts of the buckets of the window are kept in a ring
+        buffer. Moving the window only adds the counts of the new bucket and
+        subtracts the counts of the buckets that fall out of the window,
+        instead of counting all rows of the window again.
+
+        Args:
+            column (str): the name of the column where the values to count are
+            in.
+
+            timestamp_col (str): the name of the column with the time of each
+            row
+
+            window (Union[str, pd.Timedelta]): the length of the window, e.g.
+            '3h', must be a multiple of step
+
+            step (Union[str, pd.Timedelta]): the length of a bucket, e.g.
+            '5min'. The window moves with steps of this length.
+
+            groupby_col (GroupbyCol, optional): the name of the column to
+            apply the pd.DataFrame.groupby method to, or a list of names to
+            group by multiple columns. Defaults to None.
+
+            **kwargs: the other parameters of AdvancedValueCounts, which
+            can be changed afterwards through the avc attribute
+
+        Raises:
+            ValueError: if step is not positive or window is not a multiple
+            of step
+        """
+        self.window = pd.Timedelta(window)
+        self.step = pd.Timedelta(step)
+        if self.step <= pd.Timedelta(0):
+            raise ValueError("step must be a positive amount of time")
+        if self.window < self.step or self.window % self.step:
+            raise ValueError("window must be a multiple of step")
+
+        self.timestamp_col = timestamp_col
+        self.newest_bucket: Optional[pd.Timestamp] = None
+        self.buckets: List[Optional[Bucket]] = [None] * (
+            self.window // self.step
+        )
+        self.avc = AdvancedValueCounts._from_raw_counts(
+            None, column, groupby_col, **kwargs
+        )
+        # the index of the counts of the window and its get_lookup_index
+        self._lookup: Optional[Tuple[pd.Index, pd.Index]] = None
+
+    @property
+    def window_start(self) -> Optional[pd.Timestamp]:
+        """The time of the first moment of the current window"""
+        if self.newest_bucket is None:
+            return None
+        return self.newest_bucket + self.step - self.window
+
+    @property
+    def window_end(self) -> Optional[pd.Timestamp]:
+        """The time right after the last moment of the current window"""
+        if self.newest_bucket is None:
+            return None
+        return self.newest_bucket + self.step
+
+    @property
+    def avc_df(self) -> pd.DataFrame:
+        """Gets the avc_df of the rows in the current window
+
+        Raises:
+            ValueError: if there are no rows in the window
+
+        Returns:
+            pd.DataFrame: a DataFrame with advanced value count statistics
+        """
+        counts = self.avc._counts_cache
+        if counts is None or not len(counts):
+            raise ValueError("There are no rows in the window")
+        return self.avc.avc_df
+
+    def add(self, df: pd.DataFrame) -> "WindowedValueCounts":
+        """Counts new rows. The window moves to the newest row, and rows that
+        are older than the window are ignored.
+
+        Args:
+            df (pd.DataFrame): the new rows
+
+        Returns:
+            WindowedValueCounts: the WindowedValueCounts itself
+        """
+        bucket_starts = pd.to_datetime(df[self.timestamp_col]).dt.floor(
+            self.step
+        )
+        if not len(bucket_starts.dropna()):
+            return self
+        self.advance(bucket_starts.max())
+
+        in_window = bucket_starts >= self.window_start
+        for start, rows in df[in_window].groupby(bucket_starts[in_window]):
+            counts = get_raw_counts(
+                rows,
+                self.avc.column,
+                self.avc.groupby_col,
+                self.avc.weight_col,
+            )
+            slot = self._get_slot(start)
+            bucket = self.buckets[slot]
+            self.buckets[slot] = (
+                start,
+                counts
+                if bucket is None
+                else merge_raw_counts([bucket[1], counts]),
+            )
+            self._add_counts(counts)
+        return self
+
+    def advance(
+        self, timestamp: Union[str, pd.Timestamp]
+    ) -> "WindowedValueCounts":
+        """Moves the window so it ends with the bucket of timestamp, e.g.
+        when there are no new rows for a while. The counts of the buckets
+        that fall out of the window are subtracted.
+
+        Args:
+            timestamp (Union[str, pd.Timestamp]): the time to move to, the
+            window doesn't move back in time
+
+        Returns:
+            WindowedValueCounts: the WindowedValueCounts itself
+        """
+        start = pd.Timestamp(timestamp).floor(self.step)
+        if self.newest_bucket is not None and start <= self.newest_bucket:
+            return self
+
+        self.newest_bucket = start
+        for slot, bucket in enumerate(self.buckets):
+            if bucket is not None and bucket[0] < self.window_start:
+                self.buckets[slot] = None
+                self._add_counts(-bucket[1])
+        return self
+
+    def _get_slot(self, start: pd.Timestamp) -> int:
+        """Gets the position of a bucket in the ring buffer"""
+        return (start.value // self.step.value) % len(self.buckets)
+
+    def _get_lookup(self, index: pd.Index) -> pd.Index:
+        """Gets the get_lookup_index of the index of the counts of the
+        window, which is kept until the index changes"""
+        if self._lookup is None or self._lookup[0] is not index:
+            self._lookup = (index, get_lookup_index(index))
+        return self._lookup[1]
+
+    def _add_counts(self, counts: pd.Series):
+        """Adds counts to the counts of the window, negative counts to
+        subtract them. Only the values of counts are looked up and updated,
+        through the hash table of the index of the counts of the window, so
+        a step costs O(values of the bucket) as long as no values enter or
+        leave the window. Adding new values, or removing values of which the
+        count drops to 0, copies the counts of the window, which costs
+        O(values of the window), and the hash table is rebuilt at the next
+        step."""
+        total = self.avc._counts_cache
+        if total is None:
+            self.avc._set_counts(drop_empty_counts(counts))
+            return
+
+        positions = self._get_lookup(total.index).get_indexer(
+            get_lookup_index(counts.index)
+        )
+        is_new = positions < 0
+        dtype = np.result_type(total.dtype, counts.dtype)
+        if total.dtype != dtype:
+            total = total.astype(dtype)
+
+        # the counts of the window are updated in place, so their index
+        # and its hash table are kept
+        existing = positions[~is_new]
+        updated = round_empty_counts(
+            total.iloc[existing] + counts[~is_new].to_numpy()
+        ).to_numpy()
+        total.iloc[existing] = updated
+        if (updated <= 0).any():
+            keep = np.ones(len(total), dtype=bool)
+            keep[existing[updated <= 0]] = False
+            total = total[keep]
+        if is_new.any():
+            total = pd.concat([total, drop_empty_counts(counts[is_new])])
+        self.avc._set_counts(total)
+
+
+def get_lookup_index(index: pd.Index) -> pd.Index:
+    """Converts the index of raw counts to an index of Python objects with
+    NA replaced by NA_KEY, as pd.MultiIndex.get_indexer can match a key
+    with NA to another key with NA
+
+    Args:
+        index (pd.Index): the index of raw counts
+
+    Returns:
+        pd.Index: the index to look up the keys of raw counts in
+    """
+    levels = []
+    for level in range(index.nlevels):
+        values = index.get_level_values(level)
+        objects = values.to_numpy(dtype=object, copy=True)
+        objects[values.isna()] = NA_KEY
+        levels.append(objects)
+    if len(levels) > 1:
+        return pd.MultiIndex.from_arrays(levels)
+    return pd.Index(levels[0], dtype=object)
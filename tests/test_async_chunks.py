@@ -0,0 +1,143 @@
+import asyncio
+import gc
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from advanced_value_counts.async_chunks import aget_raw_counts_from_chunks
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.df_mutations import get_raw_counts
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+async def get_chunks(df: pd.DataFrame, chunksize: int, delay: float = 0):
+    """Yields chunks of chunksize rows, like pages of object storage"""
+    for start in range(0, len(df), chunksize):
+        await asyncio.sleep(delay)
+        yield df.iloc[start : start + chunksize]
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+@pytest.mark.parametrize("chunksize", [7, 100, 5000])
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_afrom_chunks_happy(arguments, chunksize, groupby_col):
+    """Test whether counting chunks asynchronously gives the same avc_df as
+    counting the data at once, with the avc_df already cached"""
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    avc = asyncio.run(
+        AVC.afrom_chunks(
+            get_chunks(DF, chunksize), COLUMN, groupby_col, **arguments
+        )
+    )
+    assert avc.cache_info.misses == 1
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+    assert avc.cache_info.misses == 1
+
+
+@pytest.mark.parametrize(
+    "executor",
+    [
+        lambda: ThreadPoolExecutor(4),
+        lambda: ProcessPoolExecutor(2),
+    ],
+)
+@pytest.mark.parametrize("capacity", [None, 5])
+def test_afrom_chunks_executor_happy(executor, capacity):
+    """Test whether the chunks can be counted in a thread or process pool,
+    in the order of the chunks, exactly or with a sketch"""
+    expected = AVC.from_chunks(
+        (DF.iloc[start : start + 50] for start in range(0, len(DF), 50)),
+        COLUMN,
+        GROUPBY_COL,
+        capacity,
+    ).avc_df
+    with executor() as pool:
+        avc = asyncio.run(
+            AVC.afrom_chunks(
+                get_chunks(DF, 50),
+                COLUMN,
+                GROUPBY_COL,
+                capacity,
+                executor=pool,
+                max_pending=3,
+            )
+        )
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+def test_afrom_chunks_event_loop_happy(monkeypatch):
+    """Test whether the chunks are counted outside of the thread of the
+    event loop"""
+    threads = []
+
+    def count_in_thread(*args):
+        threads.append(threading.get_ident())
+        return get_raw_counts(*args)
+
+    monkeypatch.setattr(
+        "advanced_value_counts.async_chunks.get_raw_counts", count_in_thread
+    )
+    asyncio.run(AVC.afrom_chunks(get_chunks(DF, 100), COLUMN, GROUPBY_COL))
+    assert len(threads) == 9
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.parametrize(
+    "max_pending, error", [(0, "max_pending"), (2, "No chunks")]
+)
+def test_aget_raw_counts_from_chunks_sad(max_pending, error):
+    """Test whether no chunks or an invalid max_pending raise"""
+    with pytest.raises(ValueError, match=error):
+        asyncio.run(
+            aget_raw_counts_from_chunks(
+                get_chunks(DF.iloc[:0], 10),
+                COLUMN,
+                max_pending=max_pending,
+            )
+        )
+
+
+async def get_failing_chunks(n_chunks: int):
+    """Yields n_chunks chunks and then fails, like a broken connection"""
+    async for chunk in get_chunks(DF, 100):
+        if not n_chunks:
+            raise ConnectionError("lost connection")
+        n_chunks -= 1
+        yield chunk
+
+
+@pytest.mark.parametrize(
+    "chunks, column, error",
+    [
+        (lambda: get_chunks(DF, 100), "missing", KeyError),
+        (lambda: get_failing_chunks(5), COLUMN, ConnectionError),
+        (lambda: get_failing_chunks(0), COLUMN, ConnectionError),
+    ],
+)
+@pytest.mark.parametrize("capacity", [None, 5])
+def test_afrom_chunks_error_sad(chunks, column, error, capacity):
+    """Test whether an error of counting a chunk or of the chunks is raised,
+    without leaving pending chunks of which the error is never retrieved"""
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda loop, context: unhandled.append(1))
+        with pytest.raises(error):
+            await AVC.afrom_chunks(
+                chunks(), column, GROUPBY_COL, capacity, max_pending=5
+            )
+        await asyncio.sleep(0.1)
+        gc.collect()
+        return unhandled
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.backends import get_backend
+from advanced_value_counts.df_mutations import get_avc_df
+
+from .config import COLUMN, GROUPBY_COL
+
+DF = pd.read_csv(
+    "tests/data/titanic.csv", usecols=[COLUMN, GROUPBY_COL, "Embarked", "Sex"]
+)
+
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+def to_arrow(df: pd.DataFrame):
+    """Converts a DataFrame to a pyarrow.Table"""
+    pa = pytest.importorskip("pyarrow")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def to_polars(df: pd.DataFrame):
+    """Converts a DataFrame to a polars.DataFrame"""
+    pl = pytest.importorskip("polars")
+    return pl.from_pandas(df)
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, ["Embarked", "Sex"]])
+@pytest.mark.parametrize("convert", [to_arrow, to_polars])
+@pytest.mark.parametrize("categorical", [False, True])
+def test_native_backend_grouped_happy(
+    arguments, groupby_col, convert, categorical
+):
+    """Test whether counting a pyarrow.Table or polars.DataFrame gives the
+    same avc_df as counting the pandas DataFrame"""
+    df = DF.astype("category") if categorical else DF
+    expected = AVC(df, COLUMN, groupby_col, **arguments).avc_df
+    avc = AVC(convert(df), COLUMN, groupby_col, **arguments)
+    pd.testing.assert_frame_equal(avc.avc_df, expected, check_index_type=False)
+
+
+@pytest.mark.parametrize("arguments", [{}, {"dropna": True}])
+@pytest.mark.parametrize("convert", [to_arrow, to_polars])
+def test_native_backend_ungrouped_happy(arguments, convert):
+    """Test whether counting a pyarrow.Table or polars.DataFrame without
+    groupby_col gives the same avc_df as counting the pandas DataFrame,
+    apart from the order of values with the same count"""
+    expected = get_avc_df(DF, COLUMN, **arguments)
+    avc_df = get_avc_df(convert(DF), COLUMN, **arguments)
+    pd.testing.assert_frame_equal(avc_df.sort_index(), expected.sort_index())
+
+
+@pytest.mark.parametrize("df", [DF.to_dict(), DF.to_numpy(), None])
+def test_get_backend_unhappy(df):
+    """Test whether other objects than DataFrames raise a TypeError"""
+    with pytest.raises(TypeError):
+        get_backend(df)
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.batch import get_avc_dfs
+
+TITANIC = pd.read_csv("tests/data/titanic.csv")
+SPECS = [
+    {"column": "Title"},
+    {"column": "Title", "groupby_col": "CabinArea"},
+    {"column": "Title", "groupby_col": "CabinArea", "name": "top_3",
+     "max_groups": 3, "max_subgroups": 3},
+    {"column": "CabinArea", "groupby_col": "Title", "dropna": True},
+    {"column": "Age", "groupby_col": "Pclass", "min_subgroup_count": 5},
+]
+
+
+def test_get_avc_dfs_happy():
+    """Test whether the batch gives the same avc_dfs as separate
+    AdvancedValueCounts"""
+    avc_dfs = get_avc_dfs(TITANIC, SPECS)
+    assert list(avc_dfs) == [
+        ("Title", None),
+        ("Title", "CabinArea"),
+        "top_3",
+        ("CabinArea", "Title"),
+        ("Age", "Pclass"),
+    ]
+    for spec, avc_df in zip(SPECS, avc_dfs.values()):
+        spec = {key: value for key, value in spec.items() if key != "name"}
+        pd.testing.assert_frame_equal(avc_df, AVC(TITANIC, **spec).avc_df)
+
+
+def test_get_avc_dfs_duplicate_names_unhappy():
+    """Test whether specs with the same name raise a ValueError"""
+    with pytest.raises(ValueError):
+        get_avc_dfs(TITANIC, [{"column": "Title"}, {"column": "Title"}])
+
+
+def test_get_avc_dfs_unhappy_types():
+    """Test whether the parameters of the specs are validated"""
+    with pytest.raises(TypeError):
+        get_avc_dfs(TITANIC, [{"column": "Title", "max_groups": "1"}])
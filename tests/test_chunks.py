@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+CSV_PATH = "tests/data/titanic.csv"
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+def get_chunks(df: pd.DataFrame, chunksize: int):
+    """Splits a DataFrame in chunks of chunksize rows"""
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+@pytest.mark.parametrize("chunksize", [3, 7, 100, 891, 5000])
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_from_chunks_happy(arguments, chunksize, groupby_col):
+    """Test whether counting the data in chunks gives the same avc_df as
+    counting the data at once"""
+    if not groupby_col:
+        arguments = {
+            key: value
+            for key, value in arguments.items()
+            if "subgroup" not in key and key != "round_ratio"
+        }
+    avc = AVC.from_chunks(
+        get_chunks(DF, chunksize), COLUMN, groupby_col, **arguments
+    )
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+@pytest.mark.parametrize("chunksize", [50, 1000])
+def test_from_csv_happy(chunksize):
+    """Test whether reading a csv in chunks gives the same avc_df as
+    reading it at once"""
+    avc = AVC.from_csv(CSV_PATH, COLUMN, GROUPBY_COL, chunksize=chunksize)
+    expected = AVC(DF, COLUMN, GROUPBY_COL).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+@pytest.mark.parametrize("batch_size", [50, 1000])
+def test_from_parquet_happy(tmp_path, batch_size):
+    """Test whether reading a parquet file in batches gives the same avc_df
+    as reading it at once"""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "titanic.parquet"
+    DF.to_parquet(path)
+    avc = AVC.from_parquet(path, COLUMN, GROUPBY_COL, batch_size=batch_size)
+    expected = AVC(DF, COLUMN, GROUPBY_COL).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+def test_from_chunks_set_threshold_happy():
+    """Test whether thresholds can still be changed without the data"""
+    avc = AVC.from_chunks(get_chunks(DF, 100), COLUMN, GROUPBY_COL)
+    avc.max_groups = 2
+    expected = AVC(DF, COLUMN, GROUPBY_COL, max_groups=2).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+def test_from_chunks_set_column_unhappy():
+    """Test whether counting another column without the data raises a
+    ValueError"""
+    avc = AVC.from_chunks(get_chunks(DF, 100), COLUMN, GROUPBY_COL)
+    avc.column = GROUPBY_COL
+    with pytest.raises(ValueError):
+        avc.avc_df
+
+
+def test_from_chunks_no_chunks_unhappy():
+    """Test whether no chunks at all raises a ValueError"""
+    with pytest.raises(ValueError):
+        AVC.from_chunks(iter([]), COLUMN, GROUPBY_COL)
@@ -0,0 +1,80 @@
+import json
+import pickle
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.count_state import CountState
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+
+def get_partition_states(groupby_col, n_partitions=4):
+    """Counts the titanic data in separate partitions"""
+    size = -(-len(DF) // n_partitions)
+    return [
+        CountState.from_df(DF.iloc[start : start + size], COLUMN, groupby_col)
+        for start in range(0, len(DF), size)
+    ]
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {},
+        {"dropna": True},
+        {"max_groups": 3, "min_group_count": 20},
+    ],
+)
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_merged_states_happy(arguments, groupby_col):
+    """Test whether merging the counts of partitions gives the same avc_df
+    as counting all the data at once"""
+    states = get_partition_states(groupby_col)
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(sum(states).finalize(**arguments), expected)
+    pd.testing.assert_frame_equal(
+        reduce(CountState.merge, states).finalize(**arguments), expected
+    )
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_serialized_states_happy(groupby_col):
+    """Test whether states can be pickled and converted to JSON and back"""
+    states = get_partition_states(groupby_col)
+    pickled = [pickle.loads(pickle.dumps(state)) for state in states]
+    jsoned = [
+        CountState.from_dict(json.loads(json.dumps(state.to_dict())))
+        for state in states
+    ]
+    expected = AVC(DF, COLUMN, groupby_col).avc_df
+    pd.testing.assert_frame_equal(sum(pickled).finalize(), expected)
+    pd.testing.assert_frame_equal(sum(jsoned).finalize(), expected)
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_serialized_weighted_states_happy(groupby_col):
+    """Test whether summed float weights keep their fractions in JSON"""
+    df = DF.assign(weight=np.resize([0.5, 0.25, 1.5, 2.0, 0.75], len(DF)))
+    state = CountState.from_df(df, COLUMN, groupby_col, "weight")
+    jsoned = CountState.from_dict(json.loads(json.dumps(state.to_dict())))
+    expected = AVC(df, COLUMN, groupby_col, weight_col="weight").avc_df
+    pd.testing.assert_series_equal(jsoned.counts, state.counts)
+    pd.testing.assert_frame_equal(jsoned.finalize(), expected)
+
+
+def test_merge_different_columns_unhappy():
+    """Test whether merging the counts of different columns raises a
+    ValueError"""
+    with pytest.raises(ValueError):
+        CountState.from_df(DF, COLUMN, GROUPBY_COL) + CountState.from_df(
+            DF, COLUMN
+        )
+
+
+def test_finalize_unhappy_types():
+    """Test whether the thresholds are validated when finalizing"""
+    with pytest.raises(TypeError):
+        CountState.from_df(DF, COLUMN).finalize(max_groups="1")
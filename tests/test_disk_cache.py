@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts import avc as avc_module
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.df_mutations import get_raw_counts
+from advanced_value_counts.disk_cache import CountCache
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+pytest.importorskip("pyarrow")
+
+MIXED_DF = pd.DataFrame(
+    {
+        "value": [1.5, np.nan, 1.5, 3.0] * 5,
+        "flag": [True, False, None, True] * 5,
+        "when": pd.to_datetime(["2023-01-01", None, "2023-01-02", None] * 5),
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "df, column, groupby_col",
+    [
+        (DF, COLUMN, GROUPBY_COL),
+        (DF, COLUMN, None),
+        (MIXED_DF, "value", "flag"),
+        (MIXED_DF, "flag", None),
+    ],
+)
+def test_count_cache_happy(tmp_path, monkeypatch, df, column, groupby_col):
+    """Test whether counts read from the cache give the same counts and
+    avc_df, without counting again"""
+    expected = AVC(df, column, groupby_col).avc_df
+    avc_df = AVC(
+        df, column, groupby_col, count_cache=CountCache(tmp_path)
+    ).avc_df
+    pd.testing.assert_frame_equal(avc_df, expected)
+    assert len(os.listdir(tmp_path)) == 1
+
+    def count(*args, **kwargs):
+        raise AssertionError("counted again")
+
+    monkeypatch.setattr(avc_module, "get_raw_counts", count)
+    cache = CountCache(tmp_path)
+    avc = AVC(df, column, groupby_col, count_cache=cache)
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+    key = cache.get_key(df, column, groupby_col)
+    pd.testing.assert_series_equal(
+        cache.get(key),
+        get_raw_counts(df, column, groupby_col),
+        check_index_type=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "column, groupby_col",
+    [("when", None), ("value", ["flag", "when"]), ("flag", "value")],
+)
+def test_count_cache_round_trip_happy(tmp_path, column, groupby_col):
+    """Test whether the counts keep their values, NA and dtypes on disk"""
+    cache = CountCache(tmp_path)
+    counts = get_raw_counts(MIXED_DF, column, groupby_col)
+    cache.put("key", counts)
+    pd.testing.assert_series_equal(cache.get("key"), counts)
+
+
+def test_count_cache_key_happy():
+    """Test whether the key changes with the data, the counted columns and
+    the capacity, but not with other columns or the index"""
+    cache_key = CountCache.get_key
+    key = cache_key(None, DF, COLUMN, GROUPBY_COL)
+    assert key == cache_key(
+        None, DF.assign(other=1).set_index(DF.index + 1), COLUMN, GROUPBY_COL
+    )
+
+    changed_df = DF.copy()
+    changed_df.loc[0, COLUMN] = "changed"
+    assert key != cache_key(None, changed_df, COLUMN, GROUPBY_COL)
+    assert key != cache_key(None, DF, GROUPBY_COL, COLUMN)
+    assert key != cache_key(None, DF, COLUMN)
+    assert key != cache_key(None, DF.astype("category"), COLUMN, GROUPBY_COL)
+    assert cache_key(
+        None, DF.assign(w=1), COLUMN, [GROUPBY_COL, "w"]
+    ) != cache_key(None, DF.assign(w=1), "w", [GROUPBY_COL, COLUMN])
+    assert cache_key(
+        None, DF.assign(w=1), COLUMN, [GROUPBY_COL, "w"]
+    ) != cache_key(None, DF.assign(w=1), COLUMN, GROUPBY_COL, "w")
+    assert key != cache_key(None, DF, COLUMN, GROUPBY_COL, capacity=10)
+
+
+def test_count_cache_eviction_happy(tmp_path):
+    """Test whether the least recently used counts are removed when the
+    cache gets too large"""
+    cache = CountCache(tmp_path)
+    counts = get_raw_counts(DF, COLUMN, GROUPBY_COL)
+    cache.put("a", counts)
+    size = os.path.getsize(tmp_path / "a.parquet")
+    cache.max_bytes = 2 * size
+
+    cache.put("b", counts)
+    os.utime(tmp_path / "a.parquet", (0, 0))
+    os.utime(tmp_path / "b.parquet", (1, 1))
+    assert cache.get("a") is not None
+    cache.put("c", counts)
+    assert sorted(os.listdir(tmp_path)) == ["a.parquet", "c.parquet"]
+    assert cache.get("b") is None
+
+    cache.clear()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts import files
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.df_mutations import get_raw_counts
+from advanced_value_counts.files import (
+    get_raw_counts_from_files,
+    get_single_values,
+)
+
+from .config import COLUMN, GROUPBY_COL
+
+pytest.importorskip("pyarrow")
+
+DF = pd.read_csv(
+    "tests/data/titanic.csv",
+    usecols=[COLUMN, GROUPBY_COL, "Embarked", "Pclass"],
+)
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+]
+
+
+def write_files(df: pd.DataFrame, path, file_format: str, n_files: int):
+    """Writes a DataFrame as n_files files in the directory path, with
+    row groups or record batches of 100 rows"""
+    path.mkdir()
+    for i, part in enumerate(np.array_split(df, n_files)):
+        part = part.reset_index(drop=True)
+        if file_format == "parquet":
+            part.to_parquet(path / f"part_{i}.parquet", row_group_size=100)
+        else:
+            part.to_feather(path / f"part_{i}.feather", chunksize=100)
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+@pytest.mark.parametrize(
+    "groupby_col", [GROUPBY_COL, ["Embarked", GROUPBY_COL], "Pclass"]
+)
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+@pytest.mark.parametrize("n_files", [1, 3])
+def test_from_files_happy(
+    tmp_path, arguments, groupby_col, file_format, n_files
+):
+    """Test whether counting a directory of parquet or feather files gives
+    the same avc_df as counting the DataFrame"""
+    write_files(DF, tmp_path / "data", file_format, n_files)
+    from_file = getattr(AVC, f"from_{file_format}")
+    avc = from_file(tmp_path / "data", COLUMN, groupby_col, **arguments)
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+@pytest.mark.parametrize("n_files", [1, 3])
+def test_from_parquet_capacity_happy(tmp_path, n_files):
+    """Test whether a directory of parquet files, or a single file, can be
+    counted with a sketch"""
+    write_files(DF, tmp_path / "data", "parquet", n_files)
+    expected = AVC(DF, COLUMN, GROUPBY_COL).avc_df
+    for path in [tmp_path / "data", tmp_path / "data" / "part_0.parquet"]:
+        avc = AVC.from_parquet(path, COLUMN, GROUPBY_COL, capacity=1_000)
+        if n_files == 1:
+            pd.testing.assert_frame_equal(avc.avc_df, expected)
+        else:
+            assert avc.avc_df.loc[("_all", "_total"), "count"] == len(
+                pd.read_parquet(path)
+            )
+
+
+@pytest.mark.parametrize("compression", ["lz4", "uncompressed"])
+@pytest.mark.parametrize("weight_col", [None, "Pclass"])
+def test_feather_columns_happy(tmp_path, monkeypatch, compression, weight_col):
+    """Test whether only the columns to count are read of a feather file"""
+    path = tmp_path / "data.feather"
+    DF.to_feather(path, compression=compression, chunksize=100)
+    read_columns = set()
+
+    def read_table(table, *args):
+        read_columns.update(table.column_names)
+        return get_raw_counts(table, *args)
+
+    monkeypatch.setattr(files, "get_raw_counts", read_table)
+    counts = get_raw_counts_from_files(
+        path, COLUMN, GROUPBY_COL, "feather", weight_col=weight_col
+    )
+    assert read_columns == {GROUPBY_COL, COLUMN, weight_col} - {None}
+    assert counts.sum() == (DF[weight_col].sum() if weight_col else len(DF))
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_from_files_ungrouped_happy(tmp_path, file_format):
+    """Test whether counting a file without groupby_col gives the same avc_df
+    as counting the DataFrame, apart from the order of values with the same
+    count"""
+    write_files(DF, tmp_path / "data", file_format, 1)
+    counts = get_raw_counts_from_files(
+        tmp_path / "data", COLUMN, file_format=file_format
+    )
+    pd.testing.assert_series_equal(
+        counts.sort_index(),
+        DF[COLUMN].value_counts(dropna=False).sort_index(),
+        check_names=False,
+    )
+
+
+def test_from_parquet_statistics_happy(tmp_path):
+    """Test whether the row groups with a single value per column are counted
+    from their statistics, and give the same counts as reading them"""
+    df = DF.sort_values([GROUPBY_COL, COLUMN]).reset_index(drop=True)
+    path = tmp_path / "sorted.parquet"
+    df.to_parquet(path, row_group_size=5)
+
+    import pyarrow.parquet as pq
+
+    file = pq.ParquetFile(path)
+    names = [GROUPBY_COL, COLUMN]
+    column_indices = {name: i for i, name in enumerate(df.columns)}
+    for i in range(file.num_row_groups):
+        rows = df.loc[i * 5 : i * 5 + 4, names]
+        is_single = rows.notna().all(axis=None) and (rows.nunique() == 1).all()
+        values = get_single_values(
+            file.metadata.row_group(i),
+            names,
+            column_indices,
+            file.schema_arrow,
+        )
+        assert values == (list(rows.iloc[0]) if is_single else None)
+
+    avc = AVC.from_parquet(path, COLUMN, GROUPBY_COL)
+    expected = AVC(DF, COLUMN, GROUPBY_COL).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+def test_from_files_unhappy(tmp_path):
+    """Test whether an unknown file format or files without rows raise a
+    ValueError"""
+    DF.to_parquet(tmp_path / "titanic.parquet")
+    with pytest.raises(ValueError):
+        get_raw_counts_from_files(tmp_path, COLUMN, file_format="csv")
+
+    DF.head(0).to_parquet(tmp_path / "empty.parquet")
+    with pytest.raises(ValueError):
+        get_raw_counts_from_files(tmp_path / "empty.parquet", COLUMN)
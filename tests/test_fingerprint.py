@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.fingerprint import get_fingerprint
+
+VALUES = {
+    "int": pd.Series([1, 2, 3, 4]),
+    "float": pd.Series([1.5, np.nan, 3.0, 4.0]),
+    "bool": pd.Series([True, False, True, False]),
+    "datetime": pd.Series(pd.to_datetime(["2023-01-01", None] * 2)),
+    "object": pd.Series(["a", None, "c", "d"]),
+    "category": pd.Series(["a", None, "c", "d"], dtype="category"),
+    "Int64": pd.Series([1, None, 3, 4], dtype="Int64"),
+    "string": pd.Series(["a", None, "c", "d"], dtype="string[pyarrow]"),
+    "datetimetz": pd.Series(
+        pd.to_datetime(["2023-01-01", None] * 2).tz_localize("UTC")
+    ),
+}
+DF = pd.DataFrame(VALUES)
+
+
+def change(values: pd.Series) -> pd.Series:
+    """Changes the first value to the last value"""
+    values = values.copy()
+    values.iloc[0] = values.iloc[-1]
+    return values
+
+
+@pytest.mark.parametrize("name", list(VALUES))
+def test_get_fingerprint_happy(name):
+    """Test whether equal values give the same fingerprint, also when they
+    are copied or other columns and the index change, and whether changed
+    values give another fingerprint"""
+    fingerprint = get_fingerprint(DF, [name])
+    assert len(fingerprint) == 64
+    assert fingerprint == get_fingerprint(DF.copy(), [name])
+    assert fingerprint == get_fingerprint(
+        DF.assign(other=1).set_index(DF.index + 1), [name]
+    )
+    assert fingerprint != get_fingerprint(
+        DF.assign(**{name: change(DF[name])}), [name]
+    )
+    assert fingerprint != get_fingerprint(DF.iloc[:3], [name])
+
+
+def test_get_fingerprint_columns_happy():
+    """Test whether the names, order and dtypes of the columns are part of
+    the fingerprint"""
+    fingerprint = get_fingerprint(DF, ["int", "float"])
+    assert fingerprint != get_fingerprint(DF, ["float", "int"])
+    assert fingerprint != get_fingerprint(DF, ["int"])
+    assert fingerprint != get_fingerprint(
+        DF.rename(columns={"int": "other"}), ["other", "float"]
+    )
+    assert get_fingerprint(DF, ["int"]) != get_fingerprint(
+        DF.astype({"int": "int32"}), ["int"]
+    )
+    assert get_fingerprint(DF, ["object"]) != get_fingerprint(
+        DF.astype({"object": "category"}), ["object"]
+    )
+
+
+def test_get_fingerprint_categories_happy():
+    """Test whether categoricals with the same codes but other categories
+    get another fingerprint"""
+    df = pd.DataFrame({"values": pd.Categorical(["a", "b"])})
+    other_df = pd.DataFrame({"values": pd.Categorical(["a", "c"])})
+    assert get_fingerprint(df, ["values"]) != get_fingerprint(
+        other_df, ["values"]
+    )
+
+
+@pytest.mark.parametrize(
+    "values, other_values",
+    [([1.5, "x", "x"], ["1.5", "x", "x"]), ([1, "x"], ["1", "x"])],
+)
+def test_get_fingerprint_object_types_happy(values, other_values):
+    """Test whether objects with the same str but another type get another
+    fingerprint"""
+    df = pd.DataFrame({"values": values})
+    other_df = pd.DataFrame({"values": other_values})
+    assert get_fingerprint(df, ["values"]) != get_fingerprint(
+        other_df, ["values"]
+    )
+
+
+def test_get_fingerprint_arrow_happy():
+    """Test whether pyarrow Tables, including slices of the same buffers,
+    and polars DataFrames are fingerprinted"""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(
+        DF[["int", "object", "category"]], preserve_index=False
+    )
+    names = ["int", "object", "category"]
+    fingerprint = get_fingerprint(table, names)
+    assert fingerprint == get_fingerprint(
+        pa.Table.from_pandas(DF[names], preserve_index=False), names
+    )
+    assert fingerprint != get_fingerprint(table.slice(0, 3), names)
+    assert get_fingerprint(table.slice(0, 3), names) != get_fingerprint(
+        table.slice(1, 3), names
+    )
+
+    pl = pytest.importorskip("polars")
+    df = pl.from_arrow(table)
+    assert get_fingerprint(df, names) == get_fingerprint(df.clone(), names)
+    assert get_fingerprint(df, names) != get_fingerprint(df.head(3), names)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+GROUPED_COUNTS = DF.groupby([GROUPBY_COL, COLUMN], dropna=False).size()
+UNGROUPED_COUNTS = DF[COLUMN].value_counts(dropna=False)
+
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+@pytest.mark.parametrize(
+    "groupby_col, counts",
+    [
+        (GROUPBY_COL, GROUPED_COUNTS),
+        (GROUPBY_COL, GROUPED_COUNTS.reorder_levels([COLUMN, GROUPBY_COL])),
+        (GROUPBY_COL, GROUPED_COUNTS.rename_axis(["a", "b"])),
+        (GROUPBY_COL, GROUPED_COUNTS.reset_index(name="count")),
+        (
+            GROUPBY_COL,
+            pd.concat([GROUPED_COUNTS // 2, (GROUPED_COUNTS + 1) // 2])
+            .sample(frac=1, random_state=0)
+            .reset_index(name="count"),
+        ),
+        (None, UNGROUPED_COUNTS),
+        (None, UNGROUPED_COUNTS.rename_axis(COLUMN).reset_index(name="count")),
+    ],
+)
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+def test_from_counts_happy(groupby_col, counts, arguments):
+    """Test whether counts as a Series or DataFrame, in any order, with
+    duplicate or reordered combinations, give the avc_df of the data"""
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    avc = AVC.from_counts(counts, COLUMN, groupby_col, **arguments)
+    assert avc.df is None
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+def test_from_counts_count_col_happy():
+    """Test whether the counts can be in a column with another name"""
+    counts = GROUPED_COUNTS.reset_index(name="n")
+    avc_df = AVC.from_counts(counts, COLUMN, GROUPBY_COL, count_col="n").avc_df
+    pd.testing.assert_frame_equal(avc_df, AVC(DF, COLUMN, GROUPBY_COL).avc_df)
+
+
+@pytest.mark.parametrize(
+    "counts, groupby_col, error",
+    [
+        (GROUPED_COUNTS, None, ValueError),
+        (UNGROUPED_COUNTS, GROUPBY_COL, ValueError),
+        (GROUPED_COUNTS.reset_index(name="n"), GROUPBY_COL, ValueError),
+        (GROUPED_COUNTS.reset_index(name="count"), "Sex", ValueError),
+        (np.array([1, 2]), None, TypeError),
+    ],
+)
+def test_from_counts_sad(counts, groupby_col, error):
+    """Test whether counts that don't match column and groupby_col raise"""
+    with pytest.raises(error):
+        AVC.from_counts(counts, COLUMN, groupby_col)
@@ -2,8 +2,13 @@ from itertools import groupby
 from typing import Any
 
 import numpy as np
+import pandas as pd
 import pytest
 from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.df_mutations import (
+    add_subgroup_diff_vs_total,
+    add_summary_statistics,
+)
 
 from .config import COLUMN, DF, GROUPBY_COL
 
@@ -258,3 +263,139 @@ def test_grouped_unsummerized_df_happpy():
     df = avc.unsummerized_df
     assert "_all" not in df.index and "_total" not in df.index
 
+
+@pytest.mark.parametrize("dropna", [True, False])
+def test_add_summary_statistics_happy(dropna):
+    """Test whether the '_all' group and the '_total' subgroups contain the
+    ungrouped and the per group counts"""
+    df = DF if dropna else DF.fillna("_na")
+    summary_df = add_summary_statistics(df, COLUMN, GROUPBY_COL)
+    grouped_counts = summary_df.drop("_all").drop("_total", level=COLUMN)
+
+    # the _total subgroups contain the count of the whole group
+    assert summary_df.xs("_total", level=COLUMN)["count"].drop(
+        "_all"
+    ).to_dict() == grouped_counts.groupby(level=0)["count"].sum().to_dict()
+
+    # the _all group contains the ungrouped counts of the subgroups
+    value_counts = df[COLUMN].value_counts()
+    all_counts = summary_df.loc["_all", "count"]
+    assert all_counts["_total"] == value_counts.sum()
+    assert all_counts.drop("_total").to_dict() == value_counts[
+        grouped_counts.index.get_level_values(COLUMN).unique()
+    ].to_dict()
+    total_ratios = summary_df.loc[(slice(None), "_total"), "subgroup_ratio"]
+    assert (total_ratios == 1).all()
+
+
+def iterrows_subgroup_diff_vs_total(df, col, new_col):
+    """Row by row reference implementation of add_subgroup_diff_vs_total"""
+    dfc = df.copy()
+    for index, _ in dfc.drop("_all").iterrows():
+        dfc.loc[index, new_col] = (
+            df.loc[index, col] - df.loc[("_all", index[1]), col]
+        )
+    return dfc
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {},
+        {"dropna": True},
+        {"max_groups": 3, "max_subgroups": 3},
+        {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+    ],
+)
+def test_add_subgroup_diff_vs_total_happy(arguments):
+    """Test whether the vectorized add_subgroup_diff_vs_total is identical
+    to the row by row reference implementation"""
+    avc_df = AVC(
+        df=DF, column=COLUMN, groupby_col=GROUPBY_COL, **arguments
+    ).avc_df.drop(columns="subgr_r_diff_subgr_all")
+    result = add_subgroup_diff_vs_total(
+        avc_df, col="subgroup_ratio", new_col="subgr_r_diff_subgr_all"
+    )
+    expected = iterrows_subgroup_diff_vs_total(
+        avc_df, col="subgroup_ratio", new_col="subgr_r_diff_subgr_all"
+    )
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+@pytest.mark.parametrize("dropna", [True, False])
+def test_categorical_columns_happy(dropna):
+    """Test whether categorical columns give the same avc_df as object
+    columns, including the NA values"""
+    pd.testing.assert_frame_equal(
+        AVC(
+            df=DF.astype("category"),
+            column=COLUMN,
+            groupby_col=GROUPBY_COL,
+            dropna=dropna,
+        ).avc_df,
+        AVC(
+            df=DF, column=COLUMN, groupby_col=GROUPBY_COL, dropna=dropna
+        ).avc_df,
+    )
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"min_subgroup_ratio": 0.1},
+        {"max_groups": 3, "max_subgroups": 3},
+        {"min_subgroup_count": 5, "dropna": True},
+    ],
+)
+@pytest.mark.parametrize("round_ratio", [1, 3])
+def test_round_ratio_happy(arguments, round_ratio):
+    """Test whether the ratios of the subgroups that are summed to '_other'
+    are rounded after summing, instead of summing the rounded ratios"""
+    expected = AVC(
+        df=DF, column=COLUMN, groupby_col=GROUPBY_COL, **arguments
+    ).avc_df
+    avc_df = AVC(
+        df=DF,
+        column=COLUMN,
+        groupby_col=GROUPBY_COL,
+        round_ratio=round_ratio,
+        **arguments,
+    ).avc_df
+    for col in ["subgroup_ratio", "r_vs_total"]:
+        pd.testing.assert_series_equal(
+            avc_df[col], expected[col].round(round_ratio)
+        )
+
+    # the unrounded ratios are the counts divided by the count of the group
+    totals = expected.xs("_total", level=COLUMN)["count"]
+    group_totals = totals.reindex(expected.index.droplevel(COLUMN))
+    np.testing.assert_allclose(
+        expected["subgroup_ratio"], expected["count"] / group_totals.values
+    )
+
+
+def test_max_subgroups_other_happy():
+    """Test whether the '_other' of subgroups below min_subgroup_count takes
+    one of the max_subgroups when the values are counted exactly"""
+    df = pd.DataFrame(
+        {
+            "group": ["a"] * 160 + ["b"] * 40,
+            "value": ["x"] * 50
+            + ["y"] * 10
+            + [f"rare{i}" for i in range(100)]
+            + ["x"] * 20
+            + ["y"] * 20,
+        }
+    )
+    arguments = {"max_subgroups": 2, "min_subgroup_count": 5}
+    for avc in [
+        AVC(df, "value", "group", **arguments),
+        AVC.from_chunks([df], "value", "group", **arguments),
+    ]:
+        avc_df = avc.avc_df
+        assert set(avc_df.index.get_level_values("value")) == {
+            "x",
+            "_other",
+            "_total",
+        }
+        assert avc_df.loc[("a", "_other"), "count"] == 110
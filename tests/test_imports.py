@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+# the modules that only plotting or counting polars DataFrames needs, pyarrow
+# is left out as pandas imports it itself if it is installed
+OPTIONAL_MODULES = ["seaborn", "matplotlib", "scipy", "polars"]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "advanced_value_counts",
+        "advanced_value_counts.avc",
+        "advanced_value_counts.window",
+    ],
+)
+def test_import_optional_modules_happy(module):
+    """Test whether importing the package doesn't import the modules of the
+    optional dependencies, in a new interpreter so earlier imports of the
+    tests don't count"""
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; "
+            f"print(*[m for m in {OPTIONAL_MODULES} if m in sys.modules])",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.split()
+    assert loaded == []
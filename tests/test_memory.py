@@ -0,0 +1,58 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+N_ROWS = 200_000
+
+
+@pytest.fixture(scope="module")
+def wide_df() -> pd.DataFrame:
+    """A DataFrame with many columns which are irrelevant for the counts"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((N_ROWS, 20)))
+    df["column"] = rng.choice(["a", "b", "c", None], N_ROWS)
+    df["groupby_col"] = rng.choice(["x", "y", None], N_ROWS)
+    return df
+
+
+def get_peak_memory(df: pd.DataFrame, **kwargs) -> int:
+    """Gets the peak memory in bytes of getting an avc_df
+
+    Args:
+        df (pd.DataFrame): the DataFrame to get the avc_df of
+
+    Returns:
+        int: the peak memory in bytes
+    """
+    tracemalloc.start()
+    try:
+        AVC(df=df, column="column", groupby_col="groupby_col", **kwargs).avc_df
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_copy_peak_memory(wide_df):
+    """Test whether copying the DataFrame costs at least its own memory"""
+    assert get_peak_memory(wide_df) >= wide_df.memory_usage().sum()
+
+
+def test_no_copy_peak_memory(wide_df):
+    """Test whether not copying the DataFrame only costs a fraction of its
+    memory, because only column and groupby_col are read"""
+    assert get_peak_memory(wide_df, copy=False) < (
+        wide_df.memory_usage().sum() / 2
+    )
+
+
+def test_no_copy_happy(wide_df):
+    """Test whether not copying the DataFrame gives the same avc_df"""
+    pd.testing.assert_frame_equal(
+        AVC(df=wide_df, column="column", groupby_col="groupby_col").avc_df,
+        AVC(
+            df=wide_df, column="column", groupby_col="groupby_col", copy=False
+        ).avc_df,
+    )
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.batch import get_avc_dfs
+from advanced_value_counts.count_state import CountState
+from advanced_value_counts.parallel import get_raw_counts_parallel
+
+TITANIC = pd.read_csv("tests/data/titanic.csv")
+COLUMN = "Title"
+GROUPBY_COLS = ["Embarked", "Sex", "CabinArea"]
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 2, "max_subgroups": 3},
+    {"min_group_ratio": 0.2, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+@pytest.mark.parametrize("dropna", [True, False])
+@pytest.mark.parametrize("n_groupby_cols", [2, 3])
+def test_multi_groupby_counts_happy(dropna, n_groupby_cols):
+    """Test whether the counts of each level of the hierarchy are the counts
+    of grouping by the groupby columns up to that level"""
+    groupby_cols = GROUPBY_COLS[:n_groupby_cols]
+    df = TITANIC[[COLUMN, *groupby_cols]]
+    if not dropna:
+        df = df.fillna("_na")
+    avc_df = AVC(df, COLUMN, groupby_cols, dropna=dropna).avc_df
+    rows = avc_df[avc_df.index.get_level_values(COLUMN) != "_total"]
+
+    for depth in range(n_groupby_cols + 1):
+        expected = (
+            df.dropna(subset=[COLUMN, *groupby_cols[:depth]])
+            .groupby([*groupby_cols[:depth], COLUMN])
+            .size()
+            if depth
+            else df[COLUMN].value_counts()
+        )
+        level = rows
+        for col in groupby_cols[depth:]:
+            level = level.xs("_all", level=col)
+        for col in groupby_cols[:depth]:
+            level = level.drop("_all", level=col, errors="ignore")
+        counts = level["count"]
+        assert counts.sum() <= expected.sum()
+        pd.testing.assert_series_equal(
+            counts,
+            expected.reindex(counts.index),
+            check_names=False,
+            check_dtype=False,
+        )
+
+
+def test_multi_groupby_totals_and_diff_happy():
+    """Test whether the _total rows sum the subgroups of each group, and
+    whether the difference of the subgroup ratio is taken with the group
+    one level up"""
+    avc_df = AVC(TITANIC, COLUMN, GROUPBY_COLS[:2]).avc_df
+    totals = avc_df.xs("_total", level=COLUMN)["count"]
+    sums = (
+        avc_df.drop("_total", level=COLUMN)["count"]
+        .groupby(level=GROUPBY_COLS[:2])
+        .sum()
+    )
+    pd.testing.assert_series_equal(totals, sums)
+
+    ratio = avc_df["subgroup_ratio"]
+    diff = avc_df["subgr_r_diff_subgr_all"]
+    assert diff[("C", "male", "Mr.")] == pytest.approx(
+        ratio[("C", "male", "Mr.")] - ratio[("C", "_all", "Mr.")]
+    )
+    assert diff[("C", "_all", "Mr.")] == pytest.approx(
+        ratio[("C", "_all", "Mr.")] - ratio[("_all", "_all", "Mr.")]
+    )
+    assert np.isnan(diff[("_all", "_all", "Mr.")])
+
+
+@pytest.mark.parametrize("max_groups", [1, 2])
+def test_multi_groupby_max_groups_per_level_happy(max_groups):
+    """Test whether max_groups is applied within each group of the previous
+    groupby column"""
+    avc_df = AVC(
+        TITANIC, COLUMN, ["Pclass", "CabinArea"], max_groups=max_groups
+    ).avc_df
+    groups = avc_df.index.droplevel(COLUMN).unique().to_frame(index=False)
+    groups = groups[~groups.isin(["_all", "_other", "_na"]).any(axis=1)]
+    assert groups["Pclass"].nunique() <= max_groups
+    assert groups.groupby("Pclass").size().max() <= max_groups
+
+
+@pytest.mark.parametrize("groupby_col", [["CabinArea"], ("CabinArea",)])
+def test_single_groupby_col_list_happy(groupby_col):
+    """Test whether a list with one groupby column gives the same avc_df as
+    the name of the groupby column"""
+    pd.testing.assert_frame_equal(
+        AVC(TITANIC, COLUMN, groupby_col, max_groups=3).avc_df,
+        AVC(TITANIC, COLUMN, "CabinArea", max_groups=3).avc_df,
+    )
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+def test_multi_groupby_counting_methods_happy(arguments):
+    """Test whether counting in chunks, in processes and in a batch gives the
+    same avc_df as counting the data at once"""
+    expected = AVC(TITANIC, COLUMN, GROUPBY_COLS, **arguments).avc_df
+    chunks = (TITANIC.iloc[i : i + 100] for i in range(0, len(TITANIC), 100))
+    state = CountState.from_dict(
+        sum(
+            CountState.from_df(chunk, COLUMN, GROUPBY_COLS)
+            for chunk in np.array_split(TITANIC, 3)
+        ).to_dict()
+    )
+    parallel = AVC._from_raw_counts(
+        get_raw_counts_parallel(TITANIC, COLUMN, GROUPBY_COLS, n_jobs=2),
+        COLUMN,
+        GROUPBY_COLS,
+        **arguments,
+    )
+    batch = get_avc_dfs(
+        TITANIC,
+        [{"column": COLUMN, "groupby_col": GROUPBY_COLS, **arguments}],
+    )
+    for avc_df in [
+        AVC.from_chunks(chunks, COLUMN, GROUPBY_COLS, **arguments).avc_df,
+        state.finalize(**arguments),
+        parallel.avc_df,
+        batch[(COLUMN, tuple(GROUPBY_COLS))],
+    ]:
+        pd.testing.assert_frame_equal(avc_df, expected)
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+TITANIC = pd.read_csv("tests/data/titanic.csv")
+NULLABLE = TITANIC.assign(
+    Age=TITANIC["Age"].round().astype("Int64"),
+    Fare=TITANIC["Fare"].astype("Float64"),
+    Survived=TITANIC["Survived"]
+    .astype("boolean")
+    .where(TITANIC["Age"].notna()),
+)
+
+
+@pytest.mark.parametrize(
+    "df, column, groupby_col",
+    [
+        (DF, COLUMN, GROUPBY_COL),
+        (DF, COLUMN, None),
+        (DF.astype("category"), COLUMN, GROUPBY_COL),
+        (TITANIC, "Age", "Pclass"),
+        (TITANIC, "Survived", "Embarked"),
+        (NULLABLE, "Age", "Survived"),
+        (NULLABLE, "Survived", "Pclass"),
+        (NULLABLE, "Fare", None),
+    ],
+)
+@pytest.mark.parametrize("n_jobs", [2, 3])
+def test_n_jobs_happy(df, column, groupby_col, n_jobs):
+    """Test whether counting in multiple processes gives the same avc_df as
+    counting in a single process"""
+    pd.testing.assert_frame_equal(
+        AVC(df, column, groupby_col, n_jobs=n_jobs, max_groups=5).avc_df,
+        AVC(df, column, groupby_col, max_groups=5).avc_df,
+    )
+
+
+def test_n_jobs_all_cpus_happy():
+    """Test whether n_jobs=-1 uses all CPUs without errors"""
+    pd.testing.assert_frame_equal(
+        AVC(DF, COLUMN, GROUPBY_COL, n_jobs=-1).avc_df,
+        AVC(DF, COLUMN, GROUPBY_COL).avc_df,
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [0, -2])
+def test_n_jobs_unhappy_value(n_jobs):
+    """Test whether an invalid amount of processes raises a ValueError"""
+    with pytest.raises(ValueError):
+        AVC(DF, COLUMN, GROUPBY_COL, n_jobs=n_jobs).avc_df
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+GROUPED_STAGES = [
+    "count",
+    "group_uncommon_values",
+    "add_summary_statistics",
+    "group_uncommon_subgroups",
+    "regroup",
+    "add_subgroup_diff_vs_total",
+    "copy",
+]
+UNGROUPED_STAGES = [
+    "count",
+    "group_uncommon_values",
+    "add_summary_statistics",
+    "regroup",
+    "copy",
+]
+
+
+@pytest.mark.parametrize(
+    "groupby_col, stages",
+    [(GROUPBY_COL, GROUPED_STAGES), (None, UNGROUPED_STAGES)],
+)
+@pytest.mark.parametrize("trace_memory", [True, False])
+def test_profile_happy(groupby_col, stages, trace_memory):
+    """Test whether profiling records each stage once with its rows and
+    calls the callback, without changing the avc_df"""
+    expected = AVC(DF, COLUMN, groupby_col).avc_df
+
+    avc = AVC(DF, COLUMN, groupby_col)
+    called = []
+    with avc.profile(called.append, trace_memory) as profiler:
+        avc_df = avc.avc_df
+    pd.testing.assert_frame_equal(avc_df, expected)
+
+    report = avc.profile_report
+    assert list(report.index) == stages
+    assert [stage.name for stage in called] == stages
+    assert profiler.stages == called
+    assert report.loc["count", "rows_in"] == len(DF)
+    assert report.loc["copy", "rows_out"] == len(avc_df)
+    assert (report["seconds"] >= 0).all()
+    assert report["memory_delta"].notna().all() == trace_memory
+
+
+def test_profile_cached_happy():
+    """Test whether a cached avc_df only records the copy stage, and whether
+    nothing is recorded outside of the with block"""
+    avc = AVC(DF, COLUMN, GROUPBY_COL)
+    assert avc.profile_report is None
+    avc.avc_df
+    assert avc.profile_report is None
+
+    with avc.profile():
+        avc.avc_df
+    assert list(avc.profile_report.index) == ["copy"]
+
+    avc.max_groups = 3
+    avc.avc_df
+    assert list(avc.profile_report.index) == ["copy"]
@@ -4,7 +4,7 @@ import numpy as np
 import pytest
 from advanced_value_counts.avc import AdvancedValueCounts as AVC
 
-from .config import COLUMN, DF
+from .config import COLUMN, DF, GROUPBY_COL
 
 
 @pytest.mark.parametrize(
@@ -125,3 +125,77 @@ def test_set_unexisting_attribute(attribute: str, value: Any):
     avc = AVC(df=DF, column=COLUMN)
     with pytest.warns(UserWarning):
         setattr(avc, attribute, value)
+
+
+def test_avc_df_cache_hits():
+    """Test whether avc_df is only calculated once when settings
+    are unchanged"""
+    avc = AVC(df=DF, column=COLUMN, groupby_col=GROUPBY_COL)
+    avc.avc_df
+    avc.unsummerized_df
+    str(avc)
+    assert avc.cache_info == (2, 1)
+
+
+@pytest.mark.parametrize(
+    "attribute, value",
+    [
+        ("max_groups", 3),
+        ("min_group_ratio", 0.1),
+        ("min_group_count", 5),
+        ("max_subgroups", 5),
+        ("min_subgroup_ratio", 0.2),
+        ("min_subgroup_count", 3),
+        ("min_subgroup_ratio_vs_total", 0.02),
+        ("round_ratio", 2),
+        ("dropna", True),
+        ("groupby_col", None),
+    ],
+)
+def test_avc_df_cache_invalidated(attribute: str, value: Any):
+    """Test whether setting an attribute invalidates the cached avc_df
+
+    Args:
+        attribute (str): name of an existing attribute
+        value (Any): any valid value
+    """
+    avc = AVC(df=DF, column=COLUMN, groupby_col=GROUPBY_COL)
+    avc.avc_df
+    setattr(avc, attribute, value)
+    avc_df = avc.avc_df
+    assert avc.cache_info == (0, 2)
+    assert avc_df.equals(avc._get_avc_df())
+
+
+def test_avc_df_cache_not_mutable():
+    """Test whether changing a returned avc_df doesn't change the cache"""
+    avc = AVC(df=DF, column=COLUMN)
+    avc.avc_df.drop("_na", inplace=True)
+    assert "_na" in avc.avc_df.index
+
+
+@pytest.mark.parametrize(
+    "attribute, value, recount",
+    [
+        ("max_groups", 3, False),
+        ("min_subgroup_count", 3, False),
+        ("round_ratio", 2, False),
+        ("dropna", True, False),
+        ("groupby_col", None, True),
+        ("column", GROUPBY_COL, True),
+        ("df", DF.head(100), True),
+    ],
+)
+def test_raw_counts_reused(attribute: str, value: Any, recount: bool):
+    """Test whether the raw data is only counted again when the data or the
+    counted columns change
+
+    Args:
+        attribute (str): name of an existing attribute
+        value (Any): any valid value
+        recount (bool): whether the raw data should be counted again
+    """
+    avc = AVC(df=DF, column=COLUMN, groupby_col=GROUPBY_COL)
+    counts = avc._get_counts()
+    setattr(avc, attribute, value)
+    assert (avc._get_counts() is not counts) == recount
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.sketch import SpaceSaving
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+RNG = np.random.default_rng(0)
+SKEWED = pd.DataFrame(
+    {
+        "value": RNG.zipf(1.5, 100_000).astype(float),
+        "group": RNG.choice(["a", "b", "c"], 100_000),
+    }
+)
+SKEWED.loc[::100, "value"] = np.nan
+
+
+def get_chunks(df: pd.DataFrame, chunksize: int):
+    """Splits a DataFrame in chunks of chunksize rows"""
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
+@pytest.mark.parametrize("chunksize", [1_000, 10_000, 100_000])
+@pytest.mark.parametrize("capacity", [20, 100])
+def test_space_saving_error_bound_happy(chunksize, capacity):
+    """Test whether the counts of the sketch are never too low and at most
+    the error bound too high, and whether all values above the error bound
+    are counted"""
+    sketch = SpaceSaving(capacity, "value")
+    for chunk in get_chunks(SKEWED, chunksize):
+        sketch.update(chunk)
+
+    true_counts = SKEWED["value"].value_counts(dropna=False)
+    errors = sketch.counts - true_counts.reindex(sketch.counts.index)
+    assert len(sketch.counts) <= capacity
+    assert (errors >= 0).all()
+    assert (errors <= sketch.errors).all()
+    assert (errors <= sketch.error_bound).all()
+    frequent = true_counts[true_counts > sketch.error_bound].index
+    assert frequent.isin(sketch.counts.index).all()
+
+
+def test_space_saving_merge_happy():
+    """Test whether merging the sketches of parts of the data keeps the
+    error bound of the whole data"""
+    sketches = [
+        SpaceSaving(50, "value", "group").update(chunk)
+        for chunk in get_chunks(SKEWED, 30_000)
+    ]
+    sketch = sum(sketches[1:], sketches[0])
+    assert sketch.total == len(SKEWED)
+
+    true_counts = SKEWED.groupby(["group", "value"], dropna=False).size()
+    errors = sketch.counts - true_counts.reindex(sketch.counts.index)
+    assert (errors >= 0).all()
+    assert (errors <= sketch.error_bound).all()
+
+
+@pytest.mark.parametrize(
+    "arguments", [{}, {"dropna": True}, {"max_groups": 3}]
+)
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_from_chunks_capacity_exact_happy(arguments, groupby_col):
+    """Test whether the approximate counts are exact if the capacity is at
+    least the amount of distinct values"""
+    avc = AVC.from_chunks(
+        get_chunks(DF, 100), COLUMN, groupby_col, capacity=1_000, **arguments
+    )
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+@pytest.mark.parametrize("groupby_col", ["group", None])
+def test_from_chunks_capacity_top_happy(groupby_col):
+    """Test whether a small capacity finds the same most common values, with
+    the rows of the other values counted as '_other'"""
+    arguments = (
+        {"max_subgroups": 5} if groupby_col else {"max_groups": 5}
+    )
+    avc_df = AVC.from_chunks(
+        get_chunks(SKEWED, 10_000),
+        "value",
+        groupby_col,
+        capacity=50,
+        **arguments,
+    ).avc_df
+    expected = AVC(SKEWED, "value", groupby_col, **arguments).avc_df
+
+    # the numeric values are mixed with '_other' in the approximate counts,
+    # so they are not converted to strings like the values of the column
+    pd.testing.assert_frame_equal(
+        avc_df.index.to_frame(index=False).astype(str),
+        expected.index.to_frame(index=False).astype(str),
+    )
+    assert avc_df["count"].sum() == expected["count"].sum()
+    errors = avc_df["count"].to_numpy() - expected["count"].to_numpy()
+    assert np.abs(errors).max() <= len(SKEWED) / 50
+
+
+@pytest.mark.parametrize("groupby_col", ["group", None])
+def test_capacity_happy(groupby_col):
+    """Test whether the capacity of an in-memory DataFrame counts it like
+    from_chunks with slices of 100_000 rows, and whether changing the
+    capacity counts it again"""
+    arguments = (
+        {"max_subgroups": 5} if groupby_col else {"max_groups": 5}
+    )
+    df = pd.concat([SKEWED, SKEWED.iloc[:50_000]], ignore_index=True)
+    avc = AVC(df, "value", groupby_col, capacity=50, **arguments)
+    expected = AVC.from_chunks(
+        get_chunks(df, 100_000), "value", groupby_col, 50, **arguments
+    )
+    pd.testing.assert_frame_equal(avc.avc_df, expected.avc_df)
+    assert expected.capacity == 50
+
+    avc.capacity = None
+    exact = AVC(df, "value", groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, exact)
+
+
+def test_space_saving_unhappy():
+    """Test whether invalid capacities and merges raise a ValueError"""
+    with pytest.raises(ValueError):
+        SpaceSaving(0, "value")
+    with pytest.raises(ValueError):
+        SpaceSaving(10, "value").merge(SpaceSaving(20, "value"))
+    with pytest.raises(ValueError):
+        SpaceSaving(10, "value").get_counts()
@@ -1,6 +1,8 @@
 import numpy as np
+import pandas as pd
 import pytest
 from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.df_mutations import group_uncommon_values
 
 from .config import COLUMN, DF
 
@@ -87,3 +89,67 @@ def test_get_plot_happy():
     """Test whether a plot can be generated without error"""
     avc = AVC(df=DF, column=COLUMN)
     avc.get_plot()
+
+
+@pytest.mark.parametrize("max_groups", [None, 3])
+def test_numeric_na_happy(max_groups):
+    """Test that NA values of a numeric column are shown as _na"""
+    df = DF.assign(numeric=[np.nan, 1.0, 2.0] * (len(DF) // 3))
+    avc_df = AVC(df=df, column="numeric", max_groups=max_groups).avc_df
+    assert avc_df.loc["_na", "count"] == len(DF) // 3
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {},
+        {"max_groups": 3},
+        {"max_groups": 3, "dropna": True},
+        {"min_count": 5},
+        {"min_ratio": 0.1, "uncommon_group_name": "Mr."},
+    ],
+)
+@pytest.mark.parametrize("dtype", ["object", "category"])
+def test_group_uncommon_values_categorical_happy(arguments, dtype):
+    """Test whether grouping uncommon values through codes gives the same
+    values as grouping them through the values themselves"""
+    df = DF.astype(dtype)
+    expected = group_uncommon_values(DF, COLUMN, **arguments)
+    result = group_uncommon_values(df, COLUMN, categorical=True, **arguments)
+    assert isinstance(result, pd.Categorical)
+    np.testing.assert_array_equal(
+        np.asarray(result, dtype=object)[result.notna()],
+        expected[result.notna()],
+    )
+    assert result.isna().sum() == DF[COLUMN].isna().sum()
+
+
+@pytest.mark.parametrize("max_groups", [None, 3])
+def test_categorical_column_happy(max_groups):
+    """Test whether a categorical column gives the same avc_df as an object
+    column, apart from the order of values with the same count"""
+    pd.testing.assert_frame_equal(
+        AVC(
+            df=DF.astype("category"), column=COLUMN, max_groups=max_groups
+        ).avc_df.sort_index(),
+        AVC(df=DF, column=COLUMN, max_groups=max_groups).avc_df.sort_index(),
+    )
+
+
+@pytest.mark.parametrize("round_ratio", [1, 3])
+def test_round_ratio_happy(round_ratio):
+    """Test whether round_ratio rounds the ratios of the value counts"""
+    expected = AVC(df=DF, column=COLUMN).avc_df
+    avc_df = AVC(df=DF, column=COLUMN, round_ratio=round_ratio).avc_df
+    pd.testing.assert_series_equal(
+        avc_df["ratio"], expected["ratio"].round(round_ratio)
+    )
+
+
+def test_max_groups_other_value_happy():
+    """Test whether a value called '_other' takes one of the max_groups when
+    the values are counted exactly"""
+    df = pd.DataFrame({"value": ["_other"] * 30 + ["x"] * 20 + ["y"] * 10})
+    avc_df = AVC(df, "value", max_groups=2).avc_df
+    assert list(avc_df.index) == ["_other", "x"]
+    assert list(avc_df["count"]) == [40, 20]
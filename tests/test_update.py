@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5, "round_ratio": 3},
+]
+
+
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_update_happy(arguments, groupby_col):
+    """Test whether updating with new rows gives the same avc_df as counting
+    all rows at once"""
+    if not groupby_col:
+        arguments = {
+            key: value
+            for key, value in arguments.items()
+            if "subgroup" not in key and key != "round_ratio"
+        }
+    first, *others = np.array_split(DF, 4)
+    avc = AVC(first, COLUMN, groupby_col, **arguments)
+    avc.avc_df
+    for part in others:
+        avc.update(part)
+    expected = AVC(DF, COLUMN, groupby_col, **arguments).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+    # the thresholds can still be changed after an update
+    avc.max_groups = 2
+    expected = AVC(DF, COLUMN, groupby_col, **{**arguments, "max_groups": 2})
+    pd.testing.assert_frame_equal(avc.avc_df, expected.avc_df)
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_retract_happy(groupby_col):
+    """Test whether retracting rows gives the same avc_df as counting the
+    remaining rows"""
+    avc = AVC(DF, COLUMN, groupby_col)
+    avc.retract(DF.iloc[:300]).update(DF.iloc[:100])
+    expected = AVC(
+        pd.concat([DF.iloc[300:], DF.iloc[:100]]), COLUMN, groupby_col
+    ).avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_weighted_retract_happy(groupby_col):
+    """Test whether retracting rows with float weights removes their values,
+    although the summed weights don't cancel out exactly"""
+    first = DF.iloc[:100].assign(weight=0.1)
+    second = DF.iloc[:100].assign(weight=0.2)
+    third = DF.iloc[100:].assign(weight=0.7)
+    avc = AVC(third, COLUMN, groupby_col, weight_col="weight")
+    avc.update(first).update(second).retract(first).retract(second)
+    expected = AVC(third, COLUMN, groupby_col, weight_col="weight").avc_df
+    pd.testing.assert_frame_equal(avc.avc_df, expected)
+
+    avc.retract(third)
+    assert not len(avc._get_counts())
+
+
+def test_update_unhappy():
+    """Test whether retracting rows that are not part of the data, and
+    changing column after an update, raise a ValueError"""
+    avc = AVC(DF.iloc[:100], COLUMN, GROUPBY_COL)
+    with pytest.raises(ValueError):
+        avc.retract(DF.iloc[100:200])
+    avc.update(DF.iloc[100:200])
+    with pytest.raises(ValueError):
+        avc.column = GROUPBY_COL
+        avc.avc_df
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.batch import get_avc_dfs
+from advanced_value_counts.df_mutations import group_uncommon_values
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+WEIGHTED_DF = DF.assign(
+    weight=np.random.default_rng(0).integers(0, 4, size=len(DF))
+)
+EXPLODED_DF = WEIGHTED_DF.loc[
+    WEIGHTED_DF.index.repeat(WEIGHTED_DF["weight"])
+].reset_index(drop=True)
+
+ARGUMENTS = [
+    {},
+    {"dropna": True},
+    {"max_groups": 3, "max_subgroups": 3},
+    {"min_group_ratio": 0.05, "min_subgroup_count": 5},
+]
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+@pytest.mark.parametrize("arguments", ARGUMENTS)
+def test_weight_col_happy(groupby_col, arguments):
+    """Test whether weighting the rows gives the avc_df of the rows repeated
+    by their weight"""
+    expected = AVC(EXPLODED_DF, COLUMN, groupby_col, **arguments).avc_df
+    avc_df = AVC(
+        WEIGHTED_DF, COLUMN, groupby_col, weight_col="weight", **arguments
+    ).avc_df
+    pd.testing.assert_frame_equal(avc_df, expected)
+
+
+@pytest.mark.parametrize("categorical", [True, False])
+def test_group_uncommon_values_weight_col_happy(categorical):
+    """Test whether uncommon values are decided by their summed weight"""
+    expected = group_uncommon_values(
+        EXPLODED_DF, COLUMN, max_groups=3, categorical=categorical
+    )
+    values = group_uncommon_values(
+        WEIGHTED_DF,
+        COLUMN,
+        max_groups=3,
+        categorical=categorical,
+        weight_col="weight",
+    )
+    assert set(pd.Series(values).dropna()) == set(
+        pd.Series(expected).dropna()
+    )
+
+
+@pytest.mark.parametrize(
+    "backend", ["n_jobs", "batch", "pyarrow", "polars"]
+)
+def test_weight_col_paths_happy(backend):
+    """Test whether the other ways of counting sum the weights too"""
+    expected = AVC(WEIGHTED_DF, COLUMN, GROUPBY_COL, weight_col="weight")
+    if backend == "n_jobs":
+        avc_df = AVC(
+            WEIGHTED_DF, COLUMN, GROUPBY_COL, weight_col="weight", n_jobs=2
+        ).avc_df
+    elif backend == "batch":
+        avc_df = get_avc_dfs(
+            WEIGHTED_DF,
+            [
+                {
+                    "name": "weighted",
+                    "column": COLUMN,
+                    "groupby_col": GROUPBY_COL,
+                    "weight_col": "weight",
+                }
+            ],
+        )["weighted"]
+    elif backend == "pyarrow":
+        pa = pytest.importorskip("pyarrow")
+        avc_df = AVC(
+            pa.Table.from_pandas(WEIGHTED_DF, preserve_index=False),
+            COLUMN,
+            GROUPBY_COL,
+            weight_col="weight",
+        ).avc_df
+    else:
+        pl = pytest.importorskip("polars")
+        avc_df = AVC(
+            pl.from_pandas(WEIGHTED_DF),
+            COLUMN,
+            GROUPBY_COL,
+            weight_col="weight",
+        ).avc_df
+    pd.testing.assert_frame_equal(avc_df, expected.avc_df)
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+@pytest.mark.parametrize("weight", [0.5, 0.001])
+def test_float_weight_col_happy(groupby_col, weight):
+    """Test whether the same fractional weight for each row gives the avc_df
+    of the rows with the counts scaled by the weight, so the default
+    min_group_count and min_subgroup_count don't group fractional counts"""
+    expected = AVC(DF, COLUMN, groupby_col).avc_df
+    avc_df = AVC(
+        DF.assign(weight=weight), COLUMN, groupby_col, weight_col="weight"
+    ).avc_df
+    assert avc_df["count"].dtype.kind == "f"
+    pd.testing.assert_index_equal(avc_df.index, expected.index)
+    pd.testing.assert_series_equal(
+        avc_df["count"], expected["count"] * weight, check_dtype=False
+    )
+    ratio_cols = avc_df.columns.drop("count")
+    pd.testing.assert_frame_equal(avc_df[ratio_cols], expected[ratio_cols])
+
+
+@pytest.mark.parametrize(
+    "arguments", [{"min_group_count": 1}, {"min_subgroup_count": 1}]
+)
+def test_float_weight_col_min_count_happy(arguments):
+    """Test whether an explicit minimum count of 1 groups the values of
+    which the weights sum to less than 1, unlike the default of None"""
+    df = DF.assign(weight=0.01)
+    avc = AVC(df, COLUMN, GROUPBY_COL, weight_col="weight", **arguments)
+    expected = AVC(
+        df.assign(weight=1),
+        COLUMN,
+        GROUPBY_COL,
+        weight_col="weight",
+        **{key: 100 for key in arguments},
+    )
+    pd.testing.assert_index_equal(avc.avc_df.index, expected.avc_df.index)
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_nullable_weight_col_happy(groupby_col, n_jobs):
+    """Test whether masked Int64 weights are summed like int64 weights, with
+    NA as a weight of 0"""
+    weights = WEIGHTED_DF["weight"].astype("Int64")
+    weights[weights == 0] = pd.NA
+    expected = AVC(WEIGHTED_DF, COLUMN, groupby_col, weight_col="weight")
+    avc_df = AVC(
+        WEIGHTED_DF.assign(weight=weights),
+        COLUMN,
+        groupby_col,
+        weight_col="weight",
+        n_jobs=n_jobs,
+    ).avc_df
+    pd.testing.assert_frame_equal(avc_df, expected.avc_df)
+
+
+def test_weight_col_unhappy():
+    """Test whether weights which are not numeric raise a TypeError"""
+    avc = AVC(DF, COLUMN, weight_col=GROUPBY_COL)
+    with pytest.raises(TypeError):
+        avc.avc_df
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from advanced_value_counts.avc import AdvancedValueCounts as AVC
+from advanced_value_counts.window import WindowedValueCounts
+
+from .config import COLUMN, DF, GROUPBY_COL
+
+# the titanic passengers as events, spread over ten hours
+EVENTS = DF.assign(
+    time=pd.Timestamp("2022-01-01")
+    + pd.to_timedelta(np.linspace(0, 10 * 3600, len(DF)), unit="s")
+)
+
+
+@pytest.mark.parametrize(
+    "arguments", [{}, {"dropna": True}, {"max_groups": 3, "max_subgroups": 3}]
+)
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+@pytest.mark.parametrize("window, step", [("3h", "1h"), ("2h", "30min")])
+def test_windowed_value_counts_happy(arguments, groupby_col, window, step):
+    """Test whether the avc_df of each window is the avc_df of the rows in
+    that window"""
+    if not groupby_col:
+        arguments = {
+            key: value
+            for key, value in arguments.items()
+            if "subgroup" not in key
+        }
+    windowed = WindowedValueCounts(
+        COLUMN, "time", window, step, groupby_col, **arguments
+    )
+    for chunk in np.array_split(EVENTS, 13):
+        windowed.add(chunk)
+        seen = EVENTS.loc[: chunk.index[-1]]
+        rows = seen[
+            (seen["time"] >= windowed.window_start)
+            & (seen["time"] < windowed.window_end)
+        ]
+        expected = AVC(rows, COLUMN, groupby_col, **arguments).avc_df
+        pd.testing.assert_frame_equal(windowed.avc_df, expected)
+
+
+def test_windowed_value_counts_late_rows_happy():
+    """Test whether late rows are added to their bucket, rows older than the
+    window are ignored, and whether advance empties the window"""
+    windowed = WindowedValueCounts(COLUMN, "time", "3h", "1h")
+    windowed.add(EVENTS.iloc[400:])
+    windowed.add(EVENTS.iloc[:400])
+    rows = EVENTS[EVENTS["time"] >= windowed.window_start]
+    expected = AVC(rows, COLUMN).avc_df
+    pd.testing.assert_frame_equal(windowed.avc_df, expected)
+
+    windowed.advance("2022-01-02")
+    with pytest.raises(ValueError):
+        windowed.avc_df
+
+
+@pytest.mark.parametrize("groupby_col", [GROUPBY_COL, None])
+def test_windowed_value_counts_weight_col_happy(groupby_col):
+    """Test whether the float weights of expired buckets are subtracted
+    without leaving rounding errors of values that left the window"""
+    events = EVENTS.assign(
+        weight=np.resize([0.1, 0.2, 0.7, 0.3], len(EVENTS))
+    )
+    windowed = WindowedValueCounts(
+        COLUMN, "time", "2h", "30min", groupby_col, weight_col="weight"
+    )
+    for chunk in np.array_split(events, 13):
+        windowed.add(chunk)
+        seen = events.loc[: chunk.index[-1]]
+        rows = seen[seen["time"] >= windowed.window_start]
+        expected = AVC(rows, COLUMN, groupby_col, weight_col="weight")
+        # values with the same summed weight may be in another order
+        pd.testing.assert_frame_equal(
+            windowed.avc_df, expected.avc_df, check_like=True
+        )
+
+    windowed.advance("2022-01-02")
+    assert not len(windowed.avc._counts_cache)
+
+
+@pytest.mark.parametrize(
+    "window, step", [("3h", "0h"), ("3h", "2h"), ("1h", "2h")]
+)
+def test_windowed_value_counts_unhappy(window, step):
+    """Test whether a window that is not a multiple of step raises a
+    ValueError"""
+    with pytest.raises(ValueError):
+        WindowedValueCounts(COLUMN, "time", window, step)